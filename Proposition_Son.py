@@ -1,11 +1,14 @@
 import os
 import time
 import json
+import logging
 import pygame
 import paho.mqtt.client as mqtt
 from queue import Queue, Empty
 from threading import Thread
 
+journal = logging.getLogger(__name__)
+
 class Son:
     def __init__(self, broker="10.0.200.9", port=1883, topic="Tapis/sequence", difficulty_topic="site/difficulte"):
         # Initialiser pygame.mixer pour l'audio
@@ -35,11 +38,11 @@ class Son:
                 sound_path = os.path.join(sounds_dir, f"son{i}.mp3")
                 if os.path.exists(sound_path):
                     self.sounds[i] = pygame.mixer.Sound(sound_path)
-                    print(f"Son {i} chargé avec succès")
+                    journal.debug("Son %s chargé avec succès", i)
                 else:
-                    print(f"Attention: Fichier son{i}.mp3 non trouvé dans {sound_path}")
+                    journal.warning("Fichier son%s.mp3 non trouvé dans %s", i, sound_path)
             except Exception as e:
-                print(f"Erreur lors du chargement du son {i}: {e}")
+                journal.error("Erreur lors du chargement du son %s : %s", i, e)
         
         # Variables pour la difficulté
         self.difficulty_level = 0  # 0=normal, 1=progressive, 2=accelerating
@@ -48,9 +51,9 @@ class Son:
         # Connexion au broker MQTT
         try:
             self.client.connect(broker, port, 60)
-            print(f"Connexion réussie au broker MQTT: {broker}:{port}")
+            journal.info("Connexion réussie au broker MQTT : %s:%s", broker, port)
         except Exception as e:
-            print(f"Erreur de connexion au broker MQTT: {e}")
+            journal.error("Erreur de connexion au broker MQTT : %s", e)
         
         # Démarrer le thread MQTT
         self.client.loop_start()
@@ -69,7 +72,7 @@ class Son:
             except Empty:
                 continue
             except Exception as e:
-                print(f"Erreur dans le worker de son: {e}")
+                journal.error("Erreur dans le worker de son : %s", e)
 
     def _play_sounds(self, sequence):
         """Joue une séquence de sons"""
@@ -84,19 +87,19 @@ class Son:
             animation_speed_factor = 1.0 / (1 + (len(sequence) * 0.1))  # Réduction de 10% par son dans la séquence
             current_display_time = self.base_display_time * animation_speed_factor
 
-        print(f"Délai constant pour cette séquence: {current_display_time:.2f} secondes")
+        journal.debug("Délai constant pour cette séquence : %.2f secondes", current_display_time)
 
         for number in sequence:
             if number in self.sounds:
                 try:
-                    print(f"Lecture du son {number}")
+                    journal.debug("Lecture du son %s", number)
                     pygame.mixer.stop()
                     self.sounds[number].play()
                     time.sleep(current_display_time)
                 except Exception as e:
-                    print(f"Erreur lors de la lecture du son {number}: {e}")
+                    journal.error("Erreur lors de la lecture du son %s : %s", number, e)
             else:
-                print(f"Son {number} non trouvé dans la bibliothèque")
+                journal.warning("Son %s non trouvé dans la bibliothèque", number)
 
     def play_sequence(self, sequence):
         """Ajoute une séquence de sons à la queue"""
@@ -106,7 +109,7 @@ class Son:
         """Callback appelé lors de la réception d'un message MQTT"""
         try:
             payload = msg.payload.decode()
-            print(f"Message reçu sur le topic {msg.topic}: {payload}")
+            journal.debug("Message reçu sur le topic %s : %s", msg.topic, payload)
             data = json.loads(payload)
             
             if msg.topic == self.difficulty_topic:
@@ -115,9 +118,9 @@ class Son:
                     new_difficulty = data["dif"]
                     if 0 <= new_difficulty <= 2:
                         self.difficulty_level = new_difficulty
-                        print(f"Niveau de difficulté mis à jour: {self.difficulty_level}")
+                        journal.info("Niveau de difficulté mis à jour : %s", self.difficulty_level)
                     else:
-                        print("Valeur de difficulté invalide")
+                        journal.warning("Valeur de difficulté invalide : %s", new_difficulty)
             elif msg.topic == self.topic:
                 # Gestion des messages de séquence
                 if "couleur" in data and "pas" in data:
@@ -127,17 +130,17 @@ class Son:
                         sequence.append(5)
                     self.play_sequence(sequence)
                 else:
-                    print("Format du message incorrect")
+                    journal.warning("Format du message incorrect : %s", payload)
         except Exception as e:
-            print(f"Erreur lors du traitement du message: {e}")
+            journal.error("Erreur lors du traitement du message : %s", e)
 
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
-            print(f"Connecté aux topics: {self.topic}, {self.difficulty_topic}")
+            journal.info("Connecté aux topics : %s, %s", self.topic, self.difficulty_topic)
             client.subscribe(self.topic)
             client.subscribe(self.difficulty_topic)
         else:
-            print(f"Échec de connexion, code retour = {rc}")
+            journal.error("Échec de connexion, code retour = %s", rc)
 
     def stop(self):
         """Arrête proprement le lecteur"""
@@ -148,4 +151,4 @@ class Son:
         pygame.mixer.quit()
         self.client.loop_stop()
         self.client.disconnect()
-        print("Déconnexion du broker MQTT")
\ No newline at end of file
+        journal.info("Déconnexion du broker MQTT")
\ No newline at end of file
@@ -2,8 +2,13 @@ import paho.mqtt.client as mqtt
 import pygame.mixer
 import time
 import json
+import logging
 import os
 
+from journal import arreter_journal, configurer_journal
+
+journal = logging.getLogger(__name__)
+
 class Son:
     def __init__(self, broker="192.168.1.102", port=1883, topic="Tapis/sequence"):
         """
@@ -32,34 +37,34 @@ class Son:
                 sound_path = os.path.join(sounds_dir, f"son{i}.mp3")
                 if os.path.exists(sound_path):
                     self.sounds[i] = pygame.mixer.Sound(sound_path)
-                    print(f"Son {i} chargé avec succès")
+                    journal.debug("Son %s chargé avec succès", i)
                 else:
-                    print(f"Attention: Fichier son{i}.mp3 non trouvé dans {sound_path}")
+                    journal.warning("Fichier son%s.mp3 non trouvé dans %s", i, sound_path)
             except Exception as e:
-                print(f"Erreur lors du chargement du son {i}: {e}")
+                journal.error("Erreur lors du chargement du son %s : %s", i, e)
         
         # Connexion au broker MQTT
         try:
             self.client.connect(broker, port, 60)
-            print(f"Connexion réussie au broker MQTT: {broker}:{port}")
+            journal.info("Connexion réussie au broker MQTT : %s:%s", broker, port)
         except Exception as e:
-            print(f"Erreur de connexion au broker MQTT: {e}")
+            journal.error("Erreur de connexion au broker MQTT : %s", e)
             
         self.client.loop_start()
 
     def on_connect(self, client, userdata, flags, rc):
         """Callback appelé lors de la connexion au broker MQTT"""
         if rc == 0:
-            print(f"Connecté au topic: {self.topic}")
+            journal.info("Connecté au topic : %s", self.topic)
             client.subscribe(self.topic)
         else:
-            print(f"Échec de connexion, code retour = {rc}")
+            journal.error("Échec de connexion, code retour = %s", rc)
 
     def on_message(self, client, userdata, msg):
         """Callback appelé lors de la réception d'un message MQTT"""
         try:
             payload = msg.payload.decode()
-            print(f"Message reçu: {payload}")
+            journal.debug("Message reçu : %s", payload)
             data = json.loads(payload)
             
             if "couleur" in data and "pas" in data:
@@ -68,18 +73,18 @@ class Son:
                     sequence.append(5)
                 self.play_sequence(sequence)
             else:
-                print("Format du message incorrect")
+                journal.warning("Format du message incorrect : %s", payload)
             
         except Exception as e:
-            print(f"Erreur lors du traitement du message: {e}")
+            journal.error("Erreur lors du traitement du message : %s", e)
 
     def play_sequence(self, sequence):
         """Joue une séquence de sons"""
-        print(f"Lecture de la séquence: {sequence}")
+        journal.debug("Lecture de la séquence : %s", sequence)
         for number in sequence:
             if number in self.sounds:
                 try:
-                    print(f"Lecture du son {number}")
+                    journal.debug("Lecture du son %s", number)
                     # Arrêter tous les sons en cours
                     pygame.mixer.stop()
                     # Jouer le nouveau son
@@ -89,9 +94,9 @@ class Son:
                     if (number == 5):
                         time.sleep(2)
                 except Exception as e:
-                    print(f"Erreur lors de la lecture du son {number}: {e}")
+                    journal.error("Erreur lors de la lecture du son %s : %s", number, e)
             else:
-                print(f"Son {number} non trouvé dans la bibliothèque")
+                journal.warning("Son %s non trouvé dans la bibliothèque", number)
             
     
 
@@ -101,19 +106,21 @@ class Son:
         pygame.mixer.quit()  # Ferme le système audio
         self.client.loop_stop()
         self.client.disconnect()
-        print("Déconnexion du broker MQTT")
+        journal.info("Déconnexion du broker MQTT")
 
 if __name__ == "__main__":
     mqtt_broker = "192.168.1.102"
     mqtt_port = 1883
     mqtt_topic = "Tapis/sequence"
 
+    configurer_journal()
     player = Son(broker=mqtt_broker, port=mqtt_port, topic=mqtt_topic)
     
     try:
-        print("En attente de séquences... (Ctrl+C pour quitter)")
+        journal.info("En attente de séquences... (Ctrl+C pour quitter)")
         while True:
             time.sleep(1.7)
     except KeyboardInterrupt:
         player.stop()
-        print("Programme terminé")
\ No newline at end of file
+        journal.info("Programme terminé")
+        arreter_journal()
\ No newline at end of file
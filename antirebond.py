@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Anti-rebond des pas par zone du tapis.
+
+Chaque zone suit une petite machine à états avec des durées de maintien
+distinctes à l'entrée et à la sortie (hystérésis) :
+
+    LIBRE --présence--> ENTREE --maintien >= duree_entree--> OCCUPEE (pas validé)
+    ENTREE --absence--> LIBRE (contact trop bref, ignoré)
+    OCCUPEE --absence--> SORTIE --absence >= duree_sortie--> LIBRE (zone réarmée)
+    SORTIE --présence--> OCCUPEE (rebond du même appui, ignoré)
+
+Une zone réarmée peut de nouveau valider un pas : un joueur peut donc rejouer
+la même couleur, et enchaîner des pas à 200-300 ms d'intervalle, sans que
+les rebonds d'un même appui soient comptés deux fois. Chaque événement coûte
+O(1) ; les zones sont indépendantes les unes des autres.
+
+Deux sources d'événements sont prises en charge :
+    - pas() pour les événements ponctuels 'step' du SensFloor (un pas est
+      une présence instantanée suivie d'une absence implicite) ;
+    - presence() et actualiser() pour l'occupation calculée à partir des
+      trames 'objects-update'.
+"""
+
+LIBRE = 0
+ENTREE = 1
+OCCUPEE = 2
+SORTIE = 3
+
+
+class AntiRebond:
+    """
+    Machine à états d'anti-rebond, une instance d'état par zone.
+    """
+
+    def __init__(self, nb_zones, duree_entree=0.05, duree_sortie=0.15):
+        """
+        Initialise l'anti-rebond.
+
+        Args:
+            nb_zones (int): Nombre de zones du tapis
+            duree_entree (float): Présence continue requise avant de valider un pas
+                                  issu des trames d'occupation (en secondes). Défaut: 0.05
+            duree_sortie (float): Absence requise avant de réarmer une zone (en secondes).
+                                  Défaut: 0.15
+        """
+        self.nb_zones = nb_zones
+        self.duree_entree = duree_entree
+        self.duree_sortie = duree_sortie
+        self.etats = [LIBRE] * nb_zones
+        self.instants = [0.0] * nb_zones  # Début de l'état ENTREE/SORTIE ou dernier contact
+        self._en_attente = set()  # Zones en état ENTREE
+
+    def pas(self, zone, instant):
+        """
+        Traite un événement de pas ponctuel sur une zone.
+
+        Un pas valide immédiatement une zone réarmée. Les pas suivants sur la même
+        zone prolongent l'appui tant qu'ils arrivent moins de duree_sortie après
+        le précédent.
+
+        Args:
+            zone (int): Indice de la zone foulée
+            instant (float): Horodatage monotone de l'événement (en secondes)
+
+        Returns:
+            bool: True si le pas doit être compté
+        """
+        dernier_contact = self.instants[zone]
+        self.instants[zone] = instant
+        if self.etats[zone] == OCCUPEE and instant - dernier_contact < self.duree_sortie:
+            return False
+        self.etats[zone] = OCCUPEE
+        self._en_attente.discard(zone)
+        return True
+
+    def presence(self, zone, instant, occupee):
+        """
+        Traite un changement d'occupation d'une zone.
+
+        Args:
+            zone (int): Indice de la zone
+            instant (float): Horodatage monotone du changement (en secondes)
+            occupee (bool): True si au moins un objet est présent sur la zone
+
+        Returns:
+            bool: True si un pas doit être compté sur cette zone
+        """
+        etat = self.etats[zone]
+        if occupee:
+            if etat == SORTIE:
+                if instant - self.instants[zone] < self.duree_sortie:
+                    self.etats[zone] = OCCUPEE
+                    return False
+                etat = LIBRE
+            if etat == LIBRE:
+                self.etats[zone] = ENTREE
+                self.instants[zone] = instant
+                self._en_attente.add(zone)
+                return self._valider_entree(zone, instant)
+            return False
+        if etat == ENTREE:
+            self.etats[zone] = LIBRE
+            self._en_attente.discard(zone)
+        elif etat == OCCUPEE:
+            self.etats[zone] = SORTIE
+            self.instants[zone] = instant
+        return False
+
+    def actualiser(self, instant):
+        """
+        Valide les zones dont la présence a duré au moins duree_entree.
+
+        À appeler à chaque trame d'occupation, même sans changement.
+
+        Args:
+            instant (float): Horodatage monotone courant (en secondes)
+
+        Returns:
+            list: Indices des zones sur lesquelles un pas doit être compté
+        """
+        if not self._en_attente:
+            return []
+        return [zone for zone in list(self._en_attente) if self._valider_entree(zone, instant)]
+
+    def _valider_entree(self, zone, instant):
+        """
+        Passe une zone de ENTREE à OCCUPEE si la durée de maintien est atteinte.
+
+        Args:
+            zone (int): Indice de la zone
+            instant (float): Horodatage monotone courant
+
+        Returns:
+            bool: True si la zone vient d'être validée
+        """
+        if instant - self.instants[zone] >= self.duree_entree:
+            self.etats[zone] = OCCUPEE
+            self._en_attente.discard(zone)
+            return True
+        return False
+
+    def reinitialiser(self):
+        """
+        Réarme toutes les zones.
+        """
+        self.etats = [LIBRE] * self.nb_zones
+        self.instants = [0.0] * self.nb_zones
+        self._en_attente.clear()
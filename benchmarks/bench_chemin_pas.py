@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks du chemin critique d'un pas.
+
+Mesure le coût par appel des fonctions traversées par chaque pas ou chaque
+publication : detecter_couleur, traiter_pas, EtatJeu.ajouter_couleur,
+publier_sequence_mqtt, la construction des charges JSON et
+convertir_sequence_en_chiffres, pour des séquences de 1 à 1000 couleurs.
+
+Les résultats sont écrits dans un fichier JSON. Le mode comparaison signale
+les cas dont le temps par appel a augmenté au-delà d'un seuil entre deux
+exécutions (code de sortie 1 en cas de régression).
+
+Usage:
+    python benchmarks/bench_chemin_pas.py --sortie avant.json
+    python benchmarks/bench_chemin_pas.py --sortie apres.json
+    python benchmarks/bench_chemin_pas.py --comparer avant.json apres.json [--seuil 0.10]
+"""
+
+from datetime import datetime
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+from outils import creer_jeu_hors_ligne
+
+from simon import EtatJeu
+
+LONGUEURS = (1, 10, 100, 1000)
+COULEURS = ('vert', 'rouge', 'bleu', 'jaune')
+
+
+def sequence_aleatoire(longueur):
+    """Séquence de couleurs reproductible d'une longueur donnée."""
+    generateur = random.Random(longueur)
+    return [generateur.choice(COULEURS) for _ in range(longueur)]
+
+
+def construire_cas(jeu):
+    """
+    Construit la liste des cas mesurés.
+
+    Args:
+        jeu (JeuSimon): Jeu hors ligne dont le client MQTT est neutralisé
+
+    Returns:
+        list: Couples (nom du cas, fonction sans argument à mesurer)
+    """
+    cas = []
+    instants = itertools.count(step=1.0)
+
+    cas.append(("detecter_couleur", lambda: jeu.detecter_couleur(0.2, 1.2)))
+    cas.append(("traiter_pas[valide]", lambda: jeu.traiter_pas(0.2, 1.2, instant=next(instants))))
+    cas.append(("traiter_pas[rebond]", lambda: jeu.traiter_pas(0.2, 1.2, instant=0.0)))
+    etat = EtatJeu()
+    cas.append(("EtatJeu.ajouter_couleur", lambda: etat.ajouter_couleur('vert')))
+    cas.append(("json.dumps[couleur unique]", lambda: json.dumps({"couleur": [2], "pas": False})))
+
+    for longueur in LONGUEURS:
+        sequence = sequence_aleatoire(longueur)
+        chiffres = jeu.convertir_sequence_en_chiffres(sequence)
+        cas.append((f"convertir_sequence_en_chiffres[n={longueur}]",
+                    lambda s=sequence: jeu.convertir_sequence_en_chiffres(s)))
+        cas.append((f"json.dumps[sequence n={longueur}]",
+                    lambda c=chiffres: json.dumps({"couleur": c, "pas": True})))
+        cas.append((f"publier_sequence_mqtt[n={longueur}]",
+                    lambda s=sequence: jeu.publier_sequence_mqtt(s, 2, 0)))
+    return cas, etat
+
+
+def mesurer(fonction, repetitions=5):
+    """
+    Mesure le temps par appel d'une fonction (meilleur de plusieurs séries).
+
+    Args:
+        fonction (callable): Fonction sans argument
+        repetitions (int): Nombre de séries. Défaut: 5
+
+    Returns:
+        float: Temps par appel en nanosecondes
+    """
+    minuteur = timeit.Timer(fonction)
+    nombre, _ = minuteur.autorange()
+    return min(minuteur.repeat(repeat=repetitions, number=nombre)) / nombre * 1e9
+
+
+def executer(repetitions=5):
+    """
+    Exécute tous les cas et retourne les résultats.
+
+    Args:
+        repetitions (int): Nombre de séries par cas
+
+    Returns:
+        dict: Métadonnées de l'exécution et temps par appel (ns) par cas
+    """
+    jeu = creer_jeu_hors_ligne(mode_test=False)
+    jeu.etat.peut_jouer = True
+    cas, etat = construire_cas(jeu)
+    resultats = {}
+    with open(os.devnull, 'w') as nul, contextlib.redirect_stdout(nul):
+        for nom, fonction in cas:
+            resultats[nom] = mesurer(fonction, repetitions)
+            # Vider les files remplies par la mesure
+            jeu.reinitialiser_queue_couleurs()
+            while not etat.couleurs.empty():
+                etat.couleurs.get()
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "plateforme": platform.platform(),
+        },
+        "resultats": resultats,
+    }
+
+
+def comparer(reference, nouveau, seuil):
+    """
+    Compare deux exécutions et liste les régressions.
+
+    Args:
+        reference (dict): Résultats de référence
+        nouveau (dict): Résultats à évaluer
+        seuil (float): Augmentation relative tolérée (0.10 = +10 %)
+
+    Returns:
+        list: Tuples (cas, temps de référence, nouveau temps, variation relative)
+              pour chaque régression
+    """
+    regressions = []
+    for nom, temps in nouveau["resultats"].items():
+        temps_reference = reference["resultats"].get(nom)
+        if temps_reference is None:
+            continue
+        variation = temps / temps_reference - 1.0
+        print(f"{nom:<45} {temps_reference:12.1f} ns {temps:12.1f} ns {variation:+8.1%}")
+        if variation > seuil:
+            regressions.append((nom, temps_reference, temps, variation))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sortie', default='bench_chemin_pas.json',
+                        help="Fichier JSON des résultats")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--comparer', nargs=2, metavar=('REFERENCE', 'NOUVEAU'),
+                        help="Compare deux fichiers de résultats au lieu de mesurer")
+    parser.add_argument('--seuil', type=float, default=0.10,
+                        help="Augmentation relative considérée comme une régression")
+    args = parser.parse_args()
+
+    if args.comparer:
+        with open(args.comparer[0], encoding='utf-8') as f:
+            reference = json.load(f)
+        with open(args.comparer[1], encoding='utf-8') as f:
+            nouveau = json.load(f)
+        regressions = comparer(reference, nouveau, args.seuil)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.seuil:.0%} :")
+            for nom, _, _, variation in regressions:
+                print(f"- {nom} ({variation:+.1%})")
+            sys.exit(1)
+        print("\nAucune régression.")
+        return
+
+    resultats = executer(args.repetitions)
+    for nom, temps in resultats["resultats"].items():
+        print(f"{nom:<45} {temps:12.1f} ns/appel")
+    with open(args.sortie, 'w', encoding='utf-8') as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"\nRésultats écrits dans {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
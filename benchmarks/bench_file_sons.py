@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc de mesure du délai entre le dépôt d'un son d'erreur et son déclenchement.
+
+Une séquence longue est en cours de lecture et d'autres séquences attendent
+leur tour quand le son d'erreur [4] est déposé. Compare la file à priorités
+actuelle (l'erreur interrompt la séquence en cours) à l'ancienne file FIFO
+(queue.Queue scrutée toutes les 100 ms, l'erreur attend la fin des séquences
+précédentes). Le mixer est simulé : le déclenchement est l'appel à play().
+
+Usage:
+    python benchmarks/bench_file_sons.py [--iterations N] [--duree-note 0.05]
+"""
+
+from queue import Empty, Queue
+from unittest.mock import Mock, patch
+
+import argparse
+import random
+import threading
+import time
+
+from outils import percentiles, silence
+
+from file_sons import PRIORITE_ALERTE
+from simon import CODE_ERREUR, Son
+
+SEQUENCE = [5, 0, 1, 2, 3, 0, 1, 2, 3, 5]
+SEQUENCES_EN_ATTENTE = 2
+
+
+def creer_son(duree_note):
+    """
+    Construit un Son sans carte son ni broker, dont les sons notent leur déclenchement.
+
+    Args:
+        duree_note (float): Durée d'une note (en secondes)
+
+    Returns:
+        tuple: (Son, threading.Event signalé au déclenchement du son d'erreur, dict des instants)
+    """
+    with patch('pygame.mixer.init'), patch('pygame.mixer.Sound'), \
+            patch('pygame.mixer.set_num_channels'), silence():
+        son = Son(mqtt_client=Mock(), demarrer_worker=False)
+    declenche = threading.Event()
+    instants = {}
+
+    def jouer_erreur():
+        instants['erreur'] = time.perf_counter()
+        declenche.set()
+
+    son.sounds = {numero: Mock() for numero in range(6)}
+    son.sounds[CODE_ERREUR].play.side_effect = jouer_erreur
+    son.base_display_time = duree_note
+    return son, declenche, instants
+
+
+def lecteur_fifo(son, file, arret):
+    """
+    Reproduction de l'ancien worker : queue.Queue FIFO scrutée toutes les 100 ms.
+    """
+    while not arret.is_set():
+        try:
+            sequence = file.get(timeout=0.1)
+            son._play_sounds(sequence)
+        except Empty:
+            continue
+
+
+def mesurer(duree_note, iterations, fifo):
+    """
+    Mesure le délai dépôt → déclenchement du son d'erreur.
+
+    Args:
+        duree_note (float): Durée d'une note (en secondes)
+        iterations (int): Nombre de mesures
+        fifo (bool): Si True, utilise l'ancienne file FIFO
+
+    Returns:
+        list: Délais mesurés en secondes
+    """
+    delais = []
+    for _ in range(iterations):
+        son, declenche, instants = creer_son(duree_note)
+        arret = threading.Event()
+        if fifo:
+            file = Queue()
+            deposer = lambda sequence, priorite=None: file.put(sequence)
+            worker = threading.Thread(target=lecteur_fifo, args=(son, file, arret), daemon=True)
+        else:
+            deposer = son.play_sequence
+            worker = threading.Thread(target=son._sound_worker, daemon=True)
+        with patch('pygame.mixer.stop'), silence():
+            worker.start()
+            for _ in range(1 + SEQUENCES_EN_ATTENTE):
+                deposer(list(SEQUENCE))
+            time.sleep(random.uniform(0.1, 0.3) * duree_note * len(SEQUENCE))
+            depot = time.perf_counter()
+            deposer([CODE_ERREUR], PRIORITE_ALERTE)
+            declenche.wait()
+            delais.append(instants['erreur'] - depot)
+            arret.set()
+            son.running = False
+            son.sound_queue.fermer()
+            worker.join()
+    return delais
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--duree-note', type=float, default=0.05,
+                        help="Durée d'une note en secondes (2 s en jeu réel)")
+    args = parser.parse_args()
+
+    resultats = {
+        "file à priorités": mesurer(args.duree_note, args.iterations, fifo=False),
+        "FIFO 100 ms": mesurer(args.duree_note, args.iterations, fifo=True),
+    }
+    print(f"Délai dépôt → déclenchement du son d'erreur ({args.iterations} mesures, "
+          f"{1 + SEQUENCES_EN_ATTENTE} séquences de {len(SEQUENCE)} notes de {args.duree_note} s devant)")
+    for nom, delais in resultats.items():
+        p = percentiles(delais)
+        print(f"- {nom:<17} p50 = {p['p50']:9.3f} ms   p99 = {p['p99']:9.3f} ms   max = {p['max']:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc de mesure du délai entre un pas et son verdict dans lire_sequence_tapis.
+
+Compare la validation événementielle actuelle (attente bloquante sur la queue
+des couleurs) à l'ancienne boucle de scrutation toutes les 100 ms. Un thread
+simule traiter_pas() en déposant une couleur après un délai aléatoire, et on
+mesure le temps écoulé jusqu'au retour de la lecture de séquence.
+
+Usage:
+    python benchmarks/bench_validation.py [--iterations N]
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from outils import creer_jeu_hors_ligne, percentiles, silence
+
+
+def lire_sequence_scrutation(jeu, longueur_sequence, temps_total):
+    """
+    Reproduction de l'ancienne boucle de lire_sequence_tapis (scrutation 100 ms).
+
+    Args:
+        jeu (JeuSimon): Instance de jeu hors ligne
+        longueur_sequence (int): Nombre de couleurs attendues
+        temps_total (float): Temps total alloué (en secondes)
+
+    Returns:
+        list or None: Couleurs lues, None en cas d'échec
+    """
+    sequence_joueur = []
+    jeu.etat.peut_jouer = True
+    position = 0
+    sequence_start_time = time.time()
+    while position < longueur_sequence:
+        temps_restant = temps_total - (time.time() - sequence_start_time)
+        print(f"\rTemps restant : {temps_restant:.1f} secondes", end='', flush=True)
+        if temps_restant <= 0:
+            return None
+        if len(jeu.etat.couleurs.queue) > 0:
+            couleur = jeu.etat.couleurs.get()
+            sequence_joueur.append(couleur)
+            if couleur != jeu.etat.sequence[position]:
+                return None
+            position += 1
+        time.sleep(0.1)
+    return sequence_joueur
+
+
+def mesurer(jeu, lire, iterations):
+    """
+    Mesure le délai pas → verdict pour une fonction de lecture donnée.
+
+    Args:
+        jeu (JeuSimon): Instance de jeu hors ligne
+        lire (callable): Fonction (longueur_sequence, temps_total) -> list or None
+        iterations (int): Nombre de pas simulés
+
+    Returns:
+        list: Délais mesurés en secondes
+    """
+    delais = []
+    jeu.etat.sequence = ['vert']
+    for _ in range(iterations):
+        depot = {}
+
+        def simuler_pas():
+            time.sleep(random.uniform(0.0, 0.2))
+            depot['t0'] = time.perf_counter()
+            jeu.etat.couleurs.put('vert')
+
+        thread = threading.Thread(target=simuler_pas)
+        thread.start()
+        with silence():
+            resultat = lire(1, 5.0)
+        t1 = time.perf_counter()
+        thread.join()
+        if resultat is not None:
+            delais.append(t1 - depot['t0'])
+    return delais
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+
+    jeu = creer_jeu_hors_ligne(mode_test=False)
+    resultats = {
+        "événementiel": mesurer(jeu, jeu.lire_sequence_tapis, args.iterations),
+        "scrutation 100 ms": mesurer(
+            jeu, lambda n, t: lire_sequence_scrutation(jeu, n, t), args.iterations
+        ),
+    }
+    print(f"Délai pas → verdict ({args.iterations} pas)")
+    for nom, delais in resultats.items():
+        p = percentiles(delais)
+        print(f"- {nom:<18} p50 = {p['p50']:8.3f} ms   p99 = {p['p99']:8.3f} ms   max = {p['max']:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Broker MQTT minimal en mémoire, pour les tests hors site.
+
+Implémente le strict nécessaire de MQTT 3.1.1 pour faire tourner le jeu :
+CONNECT, PUBLISH (QoS 0 et 1 en entrée, relayé en QoS 0), SUBSCRIBE avec
+jokers '+' et '#', UNSUBSCRIBE, PINGREQ et DISCONNECT. Aucune persistance,
+aucun message retenu, aucune authentification.
+
+Usage:
+    broker = BrokerMQTTLocal()
+    broker.demarrer()           # port libre choisi automatiquement
+    ... connecter les clients sur 127.0.0.1:broker.port ...
+    broker.arreter()
+"""
+
+from threading import Lock, Thread
+
+import socketserver
+import struct
+
+CONNECT, CONNACK, PUBLISH, PUBACK = 1, 2, 3, 4
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK = 8, 9, 10, 11
+PINGREQ, PINGRESP, DISCONNECT = 12, 13, 14
+
+
+def topic_correspond(filtre, topic):
+    """
+    Teste si un topic correspond à un filtre d'abonnement MQTT.
+
+    Args:
+        filtre (str): Filtre pouvant contenir les jokers '+' et '#'
+        topic (str): Topic d'un message publié
+
+    Returns:
+        bool: True si le topic correspond au filtre
+    """
+    niveaux_filtre = filtre.split('/')
+    niveaux_topic = topic.split('/')
+    for i, niveau in enumerate(niveaux_filtre):
+        if niveau == '#':
+            return True
+        if i >= len(niveaux_topic):
+            return False
+        if niveau != '+' and niveau != niveaux_topic[i]:
+            return False
+    return len(niveaux_filtre) == len(niveaux_topic)
+
+
+def encoder_longueur(longueur):
+    """
+    Encode la longueur restante d'un paquet MQTT (entier à longueur variable).
+
+    Args:
+        longueur (int): Longueur à encoder
+
+    Returns:
+        bytes: Longueur encodée sur 1 à 4 octets
+    """
+    octets = bytearray()
+    while True:
+        octet = longueur % 128
+        longueur //= 128
+        octets.append(octet | 0x80 if longueur else octet)
+        if not longueur:
+            return bytes(octets)
+
+
+def paquet_publish(topic, payload):
+    """
+    Construit un paquet PUBLISH QoS 0.
+
+    Args:
+        topic (str): Topic du message
+        payload (bytes): Contenu du message
+
+    Returns:
+        bytes: Paquet prêt à envoyer
+    """
+    topic_octets = topic.encode('utf-8')
+    corps = struct.pack('!H', len(topic_octets)) + topic_octets + payload
+    return bytes([PUBLISH << 4]) + encoder_longueur(len(corps)) + corps
+
+
+class _ConnexionClient(socketserver.BaseRequestHandler):
+    """Gère une connexion client du broker (un thread par client)."""
+
+    def setup(self):
+        self.abonnements = set()
+        self.verrou_envoi = Lock()
+        self.server.broker._ajouter(self)
+
+    def finish(self):
+        self.server.broker._retirer(self)
+
+    def envoyer(self, donnees):
+        """Envoie des octets au client, en ignorant un client déjà parti."""
+        try:
+            with self.verrou_envoi:
+                self.request.sendall(donnees)
+        except OSError:
+            pass
+
+    def _lire(self, taille):
+        donnees = b""
+        while len(donnees) < taille:
+            morceau = self.request.recv(taille - len(donnees))
+            if not morceau:
+                raise ConnectionError("Client déconnecté")
+            donnees += morceau
+        return donnees
+
+    def _lire_paquet(self):
+        entete = self._lire(1)[0]
+        multiplicateur, longueur = 1, 0
+        while True:
+            octet = self._lire(1)[0]
+            longueur += (octet & 0x7F) * multiplicateur
+            multiplicateur *= 128
+            if not octet & 0x80:
+                break
+        return entete >> 4, entete & 0x0F, self._lire(longueur)
+
+    def handle(self):
+        try:
+            while True:
+                type_paquet, drapeaux, corps = self._lire_paquet()
+                if type_paquet == CONNECT:
+                    self.envoyer(bytes([CONNACK << 4, 2, 0, 0]))
+                elif type_paquet == PUBLISH:
+                    qos = (drapeaux >> 1) & 0x03
+                    (longueur_topic,) = struct.unpack_from('!H', corps)
+                    topic = corps[2:2 + longueur_topic].decode('utf-8')
+                    position = 2 + longueur_topic
+                    if qos:
+                        identifiant = corps[position:position + 2]
+                        position += 2
+                        self.envoyer(bytes([PUBACK << 4, 2]) + identifiant)
+                    self.server.broker.diffuser(topic, corps[position:])
+                elif type_paquet == SUBSCRIBE:
+                    identifiant, position, accordes = corps[:2], 2, bytearray()
+                    while position < len(corps):
+                        (longueur_filtre,) = struct.unpack_from('!H', corps, position)
+                        filtre = corps[position + 2:position + 2 + longueur_filtre].decode('utf-8')
+                        position += 3 + longueur_filtre
+                        self.abonnements.add(filtre)
+                        accordes.append(0)
+                    corps_suback = identifiant + bytes(accordes)
+                    self.envoyer(bytes([SUBACK << 4]) + encoder_longueur(len(corps_suback)) + corps_suback)
+                elif type_paquet == UNSUBSCRIBE:
+                    position = 2
+                    while position < len(corps):
+                        (longueur_filtre,) = struct.unpack_from('!H', corps, position)
+                        self.abonnements.discard(corps[position + 2:position + 2 + longueur_filtre].decode('utf-8'))
+                        position += 2 + longueur_filtre
+                    self.envoyer(bytes([UNSUBACK << 4, 2]) + corps[:2])
+                elif type_paquet == PINGREQ:
+                    self.envoyer(bytes([PINGRESP << 4, 0]))
+                elif type_paquet == DISCONNECT:
+                    return
+        except (ConnectionError, OSError):
+            return
+
+
+class _Serveur(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class BrokerMQTTLocal:
+    """
+    Broker MQTT local relayant les messages entre les clients connectés.
+    """
+
+    def __init__(self, hote="127.0.0.1", port=0):
+        """
+        Prépare le broker.
+
+        Args:
+            hote (str): Adresse d'écoute. Défaut: "127.0.0.1"
+            port (int): Port d'écoute, 0 pour un port libre. Défaut: 0
+        """
+        self._serveur = _Serveur((hote, port), _ConnexionClient)
+        self._serveur.broker = self
+        self.hote, self.port = self._serveur.server_address
+        self._clients = set()
+        self._verrou = Lock()
+        self._thread = None
+
+    def _ajouter(self, client):
+        with self._verrou:
+            self._clients.add(client)
+
+    def _retirer(self, client):
+        with self._verrou:
+            self._clients.discard(client)
+
+    def diffuser(self, topic, payload):
+        """
+        Relaie un message à tous les clients abonnés à un filtre correspondant.
+
+        Args:
+            topic (str): Topic du message
+            payload (bytes): Contenu du message
+        """
+        paquet = paquet_publish(topic, payload)
+        with self._verrou:
+            destinataires = [c for c in self._clients
+                             if any(topic_correspond(f, topic) for f in c.abonnements)]
+        for client in destinataires:
+            client.envoyer(paquet)
+
+    def demarrer(self):
+        """
+        Démarre le broker dans un thread dédié.
+        """
+        self._thread = Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        """
+        Arrête le broker et ferme le socket d'écoute.
+        """
+        self._serveur.shutdown()
+        self._serveur.server_close()
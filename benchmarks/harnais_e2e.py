@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Harnais de bout en bout du jeu Simon, sans tapis ni réseau du site.
+
+Démarre un broker MQTT local et un serveur SensFloor factice, lance un vrai
+JeuSimon connecté à ces deux services, puis joue une partie complète
+(site/start → demarrer → demarrer_jeu) en rejouant correctement chaque
+séquence publiée avant de terminer sur une erreur volontaire. Seule la
+sortie audio est remplacée ; l'acquittement de fin d'affichage des LEDs
+(LED/status) est publié dès la réception de chaque séquence.
+
+Mesures rapportées :
+    - délai entre la publication de site/start et la première publication
+      de séquence sur Tapis/sequence ;
+    - délai entre chaque pas émis par le SensFloor factice et la publication
+      de son écho sur Tapis/sequence.
+
+Usage:
+    python benchmarks/harnais_e2e.py [--tours N]
+"""
+
+from queue import Empty, Queue
+from unittest.mock import patch
+
+import argparse
+import json
+import time
+
+import paho.mqtt.client as mqtt
+
+from outils import percentiles, silence
+from broker_mqtt import BrokerMQTTLocal
+from sensfloor_factice import SensFloorFactice
+
+import simon
+
+
+def point_couleur(carte, couleur):
+    """
+    Retourne un point situé au centre d'une zone de la couleur demandée.
+
+    Args:
+        carte (CarteZones): Carte des zones du jeu
+        couleur (str): Couleur recherchée
+
+    Returns:
+        tuple: Coordonnées (x, y) du point
+    """
+    for zone in carte.zones:
+        if zone.couleur == couleur and zone.rectangles:
+            x_min, y_min, x_max, y_max = zone.rectangles[0]
+            return (x_min + x_max) / 2, (y_min + y_max) / 2
+    raise ValueError(f"Aucune zone rectangulaire pour la couleur {couleur}")
+
+
+class Observateur:
+    """
+    Client MQTT abonné à tous les topics, qui horodate chaque message reçu.
+    """
+
+    def __init__(self, hote, port):
+        self.messages = Queue()
+        self.client = mqtt.Client()
+        self.client.on_message = self._on_message
+        self.client.connect(hote, port)
+        self.client.subscribe('#')
+        self.client.loop_start()
+
+    def _on_message(self, client, userdata, msg):
+        try:
+            contenu = json.loads(msg.payload.decode())
+        except ValueError:
+            contenu = msg.payload.decode()
+        self.messages.put((time.monotonic(), msg.topic, contenu))
+
+    def attendre(self, condition, timeout=60.0):
+        """
+        Attend le premier message satisfaisant une condition.
+
+        Args:
+            condition (callable): Fonction (topic, contenu) -> bool
+            timeout (float): Attente maximale en secondes. Défaut: 60
+
+        Returns:
+            tuple: (instant de réception, topic, contenu)
+        """
+        echeance = time.monotonic() + timeout
+        while True:
+            try:
+                message = self.messages.get(timeout=max(0.0, echeance - time.monotonic()))
+            except Empty:
+                raise TimeoutError("Message attendu non reçu")
+            if condition(message[1], message[2]):
+                return message
+
+    def publier(self, topic, payload):
+        self.client.publish(topic, payload)
+
+    def fermer(self):
+        self.client.loop_stop()
+        self.client.disconnect()
+
+
+def est_sequence(topic, contenu):
+    return topic == "Tapis/sequence" and isinstance(contenu, dict) and contenu.get("pas") is True
+
+
+def acquitter_affichage(observateur):
+    """Publie sur LED/status les messages du firmware des LEDs pour une séquence affichée."""
+    for statut in ("false", "true", "false"):
+        observateur.publier("LED/status", statut)
+
+
+def attendre_saisie(jeu, timeout=60.0):
+    """Attend que le jeu accepte les pas du joueur."""
+    echeance = time.monotonic() + timeout
+    while not jeu.etat.peut_jouer:
+        if time.monotonic() > echeance:
+            raise TimeoutError("Le jeu n'a pas ouvert la saisie")
+        time.sleep(0.001)
+
+
+def jouer_partie(tours):
+    """
+    Joue une partie complète et mesure les latences de bout en bout.
+
+    Args:
+        tours (int): Nombre de tours réussis avant l'erreur volontaire
+
+    Returns:
+        dict: Latence départ → séquence (s), latences pas → écho (s) et score final
+    """
+    broker = BrokerMQTTLocal()
+    sensfloor = SensFloorFactice()
+    broker.demarrer()
+    sensfloor.demarrer()
+    observateur = Observateur(broker.hote, broker.port)
+    jeu = None
+    try:
+        with patch('simon.Son'), \
+                patch.object(simon.JeuSimon, 'mode_switch_monitor', lambda self: None), \
+                silence():
+            jeu = simon.JeuSimon(
+                mode_test=False,
+                sensfloor_url=sensfloor.url,
+                mqtt_broker=broker.hote,
+                mqtt_port=broker.port
+            )
+        jeu.sensfloor_transports = ['polling']
+        jeu.sound_manager.delai_note.return_value = 2.0
+        while not jeu.mqtt_client.is_connected():
+            time.sleep(0.01)
+        time.sleep(0.2)  # Laisser passer les abonnements du jeu
+
+        latences_pas = []
+        with silence():
+            debut = time.monotonic()
+            observateur.publier("site/start", "true")
+            observateur.publier("site/difficulte", json.dumps({"dif": 0}))
+            instant, _, contenu = observateur.attendre(est_sequence)
+            latence_depart = instant - debut
+
+            for tour in range(tours + 1):
+                if tour:
+                    _, _, contenu = observateur.attendre(est_sequence)
+                acquitter_affichage(observateur)
+                attendre_saisie(jeu)
+                sequence = contenu["couleur"]
+                if tour == tours:
+                    # Erreur volontaire pour terminer la partie
+                    erreur = next(c for c in jeu.chiffre_vers_couleur if c != sequence[0])
+                    sensfloor.pas(*point_couleur(jeu.carte_zones, jeu.chiffre_vers_couleur[erreur]))
+                    break
+                for chiffre in sequence:
+                    t0 = time.monotonic()
+                    sensfloor.pas(*point_couleur(jeu.carte_zones, jeu.chiffre_vers_couleur[chiffre]))
+                    instant, _, _ = observateur.attendre(
+                        lambda topic, c: topic == "Tapis/sequence" and c == {"couleur": [chiffre], "pas": False}
+                    )
+                    latences_pas.append(instant - t0)
+                    time.sleep(0.3)
+
+            _, _, score = observateur.attendre(lambda topic, c: topic == "Tapis/score")
+        return {"depart": latence_depart, "pas": latences_pas, "score": score}
+    finally:
+        with silence():
+            if jeu:
+                jeu.stop()
+            observateur.fermer()
+            sensfloor.arreter()
+            broker.arreter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tours', type=int, default=3, help="Nombre de tours réussis avant l'erreur")
+    args = parser.parse_args()
+
+    resultats = jouer_partie(args.tours)
+    print(f"site/start → première séquence : {resultats['depart'] * 1000:.1f} ms")
+    if len(resultats['pas']) >= 2:
+        p = percentiles(resultats['pas'])
+        print(f"pas → écho MQTT ({len(resultats['pas'])} pas) : p50 = {p['p50']:.2f} ms   "
+              f"p99 = {p['p99']:.2f} ms   max = {p['max']:.2f} ms")
+    print(f"Score final : {resultats['score']}")
+
+
+if __name__ == "__main__":
+    main()
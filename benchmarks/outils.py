@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Outils communs aux bancs de mesure du jeu Simon.
+
+Permet de construire un JeuSimon hors ligne (sans broker MQTT, sans SensFloor
+et sans carte son) et de calculer des percentiles sur des séries de mesures.
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+from unittest.mock import patch
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RACINE not in sys.path:
+    sys.path.insert(0, RACINE)
+
+
+class ClientMQTTNul:
+    """
+    Client MQTT sans effet, pour ne mesurer que le code du jeu.
+
+    Contrairement à un Mock, il n'enregistre pas les appels : son coût est
+    négligeable et constant quel que soit le nombre de publications.
+    """
+
+    def __init__(self):
+        self.publications = 0
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.publications += 1
+
+    def subscribe(self, *args, **kwargs):
+        pass
+
+    def unsubscribe(self, *args, **kwargs):
+        pass
+
+
+class SonNul:
+    """Gestionnaire audio sans effet : les sons remis par le jeu sont ignorés."""
+
+    def jouer_local(self, charge, chiffres, pas):
+        pass
+
+    def play_sequence(self, sequence, priorite=None):
+        pass
+
+    def delai_note(self, idx):
+        return 0.0
+
+    def stop(self):
+        pass
+
+
+def creer_jeu_hors_ligne(mode_test=True):
+    """
+    Construit une instance de JeuSimon sans aucune dépendance réseau ou audio.
+
+    Args:
+        mode_test (bool): Mode de jeu transmis au constructeur. Défaut: True
+
+    Returns:
+        JeuSimon: Instance dont le client MQTT et le gestionnaire audio sont sans effet
+    """
+    import simon
+
+    with patch('pygame.mixer.init'), \
+            patch('pygame.mixer.Sound'), \
+            patch('pygame.mixer.set_num_channels'), \
+            patch('paho.mqtt.client.Client'), \
+            patch.object(simon.JeuSimon, 'mode_switch_monitor', lambda self: None), \
+            contextlib.redirect_stdout(io.StringIO()):
+        jeu = simon.JeuSimon(mode_test=mode_test)
+    jeu.mqtt_client = jeu.publieur.mqtt_client = ClientMQTTNul()
+    jeu.sound_manager = SonNul()
+    return jeu
+
+
+def percentiles(valeurs):
+    """
+    Calcule les percentiles usuels d'une série de mesures.
+
+    Args:
+        valeurs (list): Mesures en secondes
+
+    Returns:
+        dict: p50, p99 et max en millisecondes
+    """
+    centiles = statistics.quantiles(valeurs, n=100, method='inclusive')
+    return {
+        "p50": centiles[49] * 1000,
+        "p99": centiles[98] * 1000,
+        "max": max(valeurs) * 1000,
+    }
+
+
+@contextlib.contextmanager
+def silence():
+    """Redirige la sortie standard le temps d'une mesure."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejoue un journal d'événements SensFloor dans un jeu hors ligne.
+
+Le jeu reçoit les événements via traiter_pas() / traiter_objets() comme en
+production ; seuls le broker MQTT et la carte son sont remplacés. Affiche
+le nombre de couleurs validées et le débit obtenu, ce qui permet de tester
+la charge du chemin de détection sans personne sur le tapis.
+
+Usage:
+    python benchmarks/rejouer_session.py session.simonlog [--vitesse 10] [--source step|objects]
+"""
+
+import argparse
+
+from outils import creer_jeu_hors_ligne, silence
+
+from enregistrement import Rejoueur
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('journal', help="Journal produit par JeuSimon.activer_enregistrement()")
+    parser.add_argument('--vitesse', type=float, default=0.0,
+                        help="Facteur d'accélération (1 = temps réel, 0 = aussi vite que possible)")
+    parser.add_argument('--source', choices=['step', 'objects'], default='step',
+                        help="Source des pas utilisée par le jeu")
+    args = parser.parse_args()
+
+    jeu = creer_jeu_hors_ligne(mode_test=False)
+    jeu.source_pas = args.source
+    jeu.etat.peut_jouer = True
+    with silence():
+        stats = Rejoueur(args.journal, jeu, vitesse=args.vitesse).rejouer()
+    jeu.publieur.vider()
+    evenements = stats["pas"] + stats["objets"]
+    print(f"{stats['pas']} pas et {stats['objets']} trames rejoués en {stats['duree']:.3f} s "
+          f"({evenements / max(stats['duree'], 1e-9):.0f} événements/s)")
+    print(f"{jeu.etat.couleurs.qsize()} couleurs validées, "
+          f"{jeu.mqtt_client.publications} publications MQTT "
+          f"({jeu.publieur.perdus} abandonnées, file pleine)")
+
+
+if __name__ == "__main__":
+    main()
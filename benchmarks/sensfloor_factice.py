@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Serveur SensFloor factice pour les tests hors site.
+
+Serveur Socket.IO local (python-socketio en mode threading, servi par wsgiref)
+qui émet des événements 'step' scriptés vers les clients connectés, comme le
+ferait le SensFloor réel à l'adresse http://192.168.5.5:8000.
+
+Le client doit utiliser le transport 'polling' : le serveur WSGI de la
+bibliothèque standard ne gère pas les WebSockets.
+"""
+
+from socketserver import ThreadingMixIn
+from threading import Event, Thread
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import socketio
+
+
+class _ServeurWSGI(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _GestionnaireSilencieux(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SensFloorFactice:
+    """
+    Serveur Socket.IO émettant des pas scriptés.
+    """
+
+    def __init__(self, hote="127.0.0.1", port=0):
+        """
+        Prépare le serveur.
+
+        Args:
+            hote (str): Adresse d'écoute. Défaut: "127.0.0.1"
+            port (int): Port d'écoute, 0 pour un port libre. Défaut: 0
+        """
+        self.sio = socketio.Server(async_mode='threading', logger=False, engineio_logger=False)
+        self.client_connecte = Event()
+
+        @self.sio.event
+        def connect(sid, environ):
+            self.client_connecte.set()
+
+        self._serveur = make_server(
+            hote, port, socketio.WSGIApp(self.sio),
+            server_class=_ServeurWSGI,
+            handler_class=_GestionnaireSilencieux
+        )
+        self.hote, self.port = self._serveur.server_address[:2]
+        self.url = f"http://{self.hote}:{self.port}"
+        self._thread = None
+
+    def pas(self, x, y):
+        """
+        Émet un événement 'step' vers tous les clients.
+
+        Args:
+            x (float): Coordonnée X du pas
+            y (float): Coordonnée Y du pas
+        """
+        self.sio.emit('step', (x, y))
+
+    def objets(self, objets):
+        """
+        Émet une trame 'objects-update' vers tous les clients.
+
+        Args:
+            objets (list): Objets {'x': ..., 'y': ...} présents sur le tapis
+        """
+        self.sio.emit('objects-update', objets)
+
+    def demarrer(self):
+        """
+        Démarre le serveur dans un thread dédié.
+        """
+        self._thread = Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        """
+        Arrête le serveur.
+        """
+        self._serveur.shutdown()
+        self._serveur.server_close()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Cache disque des sons décodés.
+
+Décoder les MP3 du dossier son/ avec pygame.mixer.Sound est lent sur un
+Raspberry Pi au démarrage. Le PCM décodé de chaque son est donc conservé
+tel quel (Sound.get_raw()) dans un fichier dont le nom contient :
+    - l'empreinte SHA-1 du fichier source ;
+    - la fréquence, le format et le nombre de canaux du mixer.
+
+Aux démarrages suivants, le fichier est projeté en mémoire (mmap) et passé
+à pygame.mixer.Sound(buffer=...) : aucun MP3 n'est décodé. Un son modifié
+change d'empreinte, il est alors décodé de nouveau et l'entrée périmée est
+supprimée ; un changement de configuration du mixer produit une autre clé,
+et les entrées des autres configurations sont conservées.
+
+Usage:
+    pygame.mixer.init()
+    son = charger_son("son/son0.mp3")
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+
+import pygame.mixer
+
+journal = logging.getLogger(__name__)
+
+DOSSIER_CACHE = ".cache_pcm"
+EXTENSION = ".pcm"
+
+
+def empreinte_fichier(chemin, taille_bloc=1 << 16):
+    """
+    Calcule l'empreinte SHA-1 d'un fichier.
+
+    Args:
+        chemin (str): Chemin du fichier
+        taille_bloc (int, optional): Taille des lectures (en octets). Défaut: 64 Kio
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    empreinte = hashlib.sha1()
+    with open(chemin, 'rb') as fichier:
+        for bloc in iter(lambda: fichier.read(taille_bloc), b''):
+            empreinte.update(bloc)
+    return empreinte.hexdigest()
+
+
+def chemin_cache(chemin, config_mixer, dossier_cache=None):
+    """
+    Retourne le fichier de cache d'un son pour une configuration du mixer.
+
+    Args:
+        chemin (str): Chemin du fichier son source
+        config_mixer (tuple): (fréquence, format, canaux) retourné par pygame.mixer.get_init()
+        dossier_cache (str, optional): Dossier du cache. Défaut: DOSSIER_CACHE à côté du son
+
+    Returns:
+        str: Chemin du fichier PCM
+    """
+    if dossier_cache is None:
+        dossier_cache = os.path.join(os.path.dirname(os.path.abspath(chemin)), DOSSIER_CACHE)
+    frequence, format_, canaux = config_mixer
+    nom = os.path.splitext(os.path.basename(chemin))[0]
+    return os.path.join(
+        dossier_cache,
+        f"{nom}.{empreinte_fichier(chemin)}.{frequence}.{format_}.{canaux}{EXTENSION}"
+    )
+
+
+def _decouper_nom(entree):
+    """
+    Découpe un nom de fichier du cache.
+
+    Args:
+        entree (str): Nom "<son>.<empreinte>.<fréquence>.<format>.<canaux>.pcm"
+
+    Returns:
+        tuple: (son, empreinte, "<fréquence>.<format>.<canaux>"), champs vides si le nom est incomplet
+    """
+    parties = entree[:-len(EXTENSION)].rsplit('.', 4)
+    if len(parties) < 5:
+        return "", "", ""
+    return parties[0], parties[1], '.'.join(parties[2:])
+
+
+def _lire_cache(fichier_pcm):
+    with open(fichier_pcm, 'rb') as fichier:
+        with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as projection:
+            return pygame.mixer.Sound(buffer=projection)
+
+
+def _ecrire_cache(fichier_pcm, son):
+    dossier = os.path.dirname(fichier_pcm)
+    os.makedirs(dossier, exist_ok=True)
+    # Supprimer les entrées périmées du même son pour la même configuration du
+    # mixer (fichier source modifié) ; les entrées des autres configurations restent
+    nom, empreinte, config = _decouper_nom(os.path.basename(fichier_pcm))
+    for entree in os.listdir(dossier):
+        if not entree.endswith(EXTENSION):
+            continue
+        nom_entree, empreinte_entree, config_entree = _decouper_nom(entree)
+        if nom_entree == nom and config_entree == config and empreinte_entree != empreinte:
+            os.remove(os.path.join(dossier, entree))
+    # Écriture atomique : un démarrage interrompu ne laisse pas d'entrée tronquée
+    temporaire = f"{fichier_pcm}.{os.getpid()}.tmp"
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(son.get_raw())
+    os.replace(temporaire, fichier_pcm)
+
+
+def charger_son(chemin, dossier_cache=None):
+    """
+    Charge un son en passant par le cache PCM.
+
+    Le mixer doit être initialisé. En cas d'échec du cache (mixer non
+    initialisé, dossier non accessible en écriture...), le son est
+    simplement décodé.
+
+    Args:
+        chemin (str): Chemin du fichier son (MP3, WAV, OGG)
+        dossier_cache (str, optional): Dossier du cache. Défaut: DOSSIER_CACHE à côté du son
+
+    Returns:
+        pygame.mixer.Sound: Son chargé
+    """
+    config_mixer = pygame.mixer.get_init()
+    if not config_mixer:
+        return pygame.mixer.Sound(chemin)
+    fichier_pcm = None
+    try:
+        fichier_pcm = chemin_cache(chemin, config_mixer, dossier_cache)
+        if os.path.getsize(fichier_pcm) > 0:
+            return _lire_cache(fichier_pcm)
+    except (OSError, ValueError):
+        pass  # Absent, vide ou illisible : décoder
+    son = pygame.mixer.Sound(chemin)
+    if fichier_pcm is None:
+        return son
+    try:
+        _ecrire_cache(fichier_pcm, son)
+    except OSError as e:
+        journal.warning("Cache PCM non écrit pour %s : %s", chemin, e)
+    return son
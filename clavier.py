@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Lecture du clavier du mode test par un thread unique.
+
+Un seul thread lit l'entrée standard pendant toute la vie du processus :
+le terminal est passé une seule fois en mode caractère par caractère (sans
+écho ni tampon de ligne) et restauré à la sortie. Les touches décodées sont
+déposées dans une file partagée par la saisie du jeu et par la surveillance
+des commandes :
+    - la saisie du jeu réserve les touches le temps d'une séquence (saisie()) ;
+    - les lectures de commande (lire(..., commande=True)) attendent la fin
+      de cette réservation, aucune touche n'est donc détournée.
+
+Le terminal reste en mode cbreak plutôt qu'en mode brut complet : les
+affichages (conversion des fins de ligne) et Ctrl+C fonctionnent normalement.
+
+Usage:
+    clavier = LecteurClavier.obtenir()
+    with clavier.saisie():
+        touche = clavier.lire(timeout=0.5)
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition, Lock, Thread, current_thread
+
+import atexit
+import codecs
+import logging
+import os
+import platform
+import sys
+import time
+
+journal = logging.getLogger(__name__)
+
+IS_WINDOWS = platform.system() == "Windows"
+
+if IS_WINDOWS:
+    import msvcrt
+else:
+    import select
+    import termios
+    import tty
+
+
+class LecteurClavier:
+    """
+    Thread de lecture du clavier et file des touches lues.
+    """
+
+    _instance = None
+    _verrou_instance = Lock()
+
+    @classmethod
+    def obtenir(cls):
+        """
+        Retourne le lecteur partagé du processus, démarré au premier appel.
+
+        Returns:
+            LecteurClavier: Lecteur de l'entrée standard
+        """
+        with cls._verrou_instance:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.demarrer()
+            return cls._instance
+
+    def __init__(self, entree=None):
+        """
+        Initialise un lecteur arrêté.
+
+        Args:
+            entree (optional): Fichier lu. Défaut: sys.stdin
+        """
+        self.entree = entree if entree is not None else sys.stdin
+        self._touches = deque()
+        self._condition = Condition()
+        self._saisies = 0
+        self._config_origine = None
+        self._fd = None
+        self.actif = False
+        self._thread = None
+
+    def demarrer(self):
+        """
+        Passe le terminal en mode caractère et lance le thread de lecture.
+        """
+        if self._thread is not None:
+            return
+        self.actif = True
+        if not IS_WINDOWS:
+            try:
+                self._fd = self.entree.fileno()
+            except (OSError, ValueError) as e:
+                journal.warning("Clavier indisponible : %s", e)
+                self.actif = False
+                return
+            if os.isatty(self._fd):
+                self._config_origine = termios.tcgetattr(self._fd)
+                tty.setcbreak(self._fd)
+                atexit.register(self.restaurer)
+        self._thread = Thread(target=self._boucle, name="clavier", daemon=True)
+        self._thread.start()
+
+    def restaurer(self):
+        """
+        Rétablit la configuration d'origine du terminal.
+        """
+        if self._config_origine is not None:
+            try:
+                termios.tcsetattr(self._fd, termios.TCSADRAIN, self._config_origine)
+            except termios.error:
+                pass
+            self._config_origine = None
+
+    def arreter(self, timeout=1.0):
+        """
+        Arrête la lecture, restaure le terminal et réveille les lecteurs en attente.
+
+        Args:
+            timeout (float, optional): Attente maximale du thread (en secondes). Défaut: 1.0
+        """
+        with self._condition:
+            self.actif = False
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not current_thread():
+            self._thread.join(timeout)
+        self.restaurer()
+
+    def _boucle(self):
+        """
+        Lit l'entrée jusqu'à l'arrêt ou la fin de fichier.
+        """
+        try:
+            if IS_WINDOWS:
+                while self.actif:
+                    self.deposer(msvcrt.getwch())
+            else:
+                decodeur = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                while self.actif:
+                    # Attente bornée : arreter() est pris en compte sans fermer l'entrée
+                    prets, _, _ = select.select([self._fd], [], [], 0.2)
+                    if not prets:
+                        continue
+                    donnees = os.read(self._fd, 64)
+                    if not donnees:
+                        break  # Fin de l'entrée
+                    self.deposer(decodeur.decode(donnees))
+        except (OSError, ValueError) as e:
+            journal.error("Lecture du clavier interrompue : %s", e)
+        finally:
+            with self._condition:
+                self.actif = False
+                self._condition.notify_all()
+
+    def deposer(self, texte):
+        """
+        Ajoute les touches d'un texte lu à la file (en minuscules, "\\r" devenant "\\n").
+
+        Args:
+            texte (str): Caractères lus
+        """
+        if not texte:
+            return
+        with self._condition:
+            for caractere in texte:
+                self._touches.append('\n' if caractere == '\r' else caractere.lower())
+            self._condition.notify_all()
+
+    @contextmanager
+    def saisie(self):
+        """
+        Réserve les touches au bloc with : les lectures de commande attendent sa fin.
+        """
+        with self._condition:
+            self._saisies += 1
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self._saisies -= 1
+                self._condition.notify_all()
+
+    def lire(self, timeout=None, commande=False):
+        """
+        Retire la prochaine touche, en attendant qu'il y en ait une.
+
+        Args:
+            timeout (float, optional): Attente maximale (en secondes). Défaut: None (illimitée)
+            commande (bool, optional): Si True, n'obtient une touche qu'en dehors
+                                       de toute saisie réservée. Défaut: False
+
+        Returns:
+            str or None: Touche lue ; None à l'échéance, ou immédiatement sans
+                         timeout si le clavier n'est plus lu
+        """
+        echeance = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._touches and not (commande and self._saisies):
+                    return self._touches.popleft()
+                if echeance is None:
+                    if not self.actif:
+                        return None
+                    self._condition.wait()
+                else:
+                    restant = echeance - time.monotonic()
+                    if restant <= 0:
+                        return None
+                    self._condition.wait(restant)
+
+    def vider(self):
+        """
+        Abandonne les touches non lues.
+        """
+        with self._condition:
+            self._touches.clear()
+
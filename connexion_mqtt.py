@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Connexion MQTT partagée du jeu Simon.
+
+Un seul client paho et une seule boucle réseau par broker et par processus :
+JeuSimon, Son et les autres composants enregistrent leurs callbacks par
+filtre de topic auprès du GestionnaireMQTT au lieu d'ouvrir chacun leur
+propre connexion. Les abonnements sont renouvelés à chaque (re)connexion.
+Les messages reçus sont distribués par un RouteurMQTT (voir routage_mqtt.py).
+
+Usage:
+    gestionnaire = GestionnaireMQTT.obtenir("10.0.200.7", 1883)
+    gestionnaire.abonner("Tapis/sequence", on_message)
+    gestionnaire.demarrer()
+    ...
+    gestionnaire.desabonner("Tapis/sequence", on_message)
+    gestionnaire.liberer()
+"""
+
+from threading import Lock
+
+import logging
+
+import paho.mqtt.client as mqtt
+
+from routage_mqtt import RouteurMQTT
+
+journal = logging.getLogger(__name__)
+
+
+class GestionnaireMQTT:
+    """
+    Propriétaire unique d'un client paho, partagé par tous les composants.
+    """
+
+    _instances = {}
+    _verrou_instances = Lock()
+
+    @classmethod
+    def obtenir(cls, broker, port=1883):
+        """
+        Retourne le gestionnaire partagé d'un broker, créé au premier appel.
+
+        Chaque appel doit être équilibré par un appel à liberer().
+
+        Args:
+            broker (str): Adresse du broker MQTT
+            port (int): Port du broker MQTT. Défaut: 1883
+
+        Returns:
+            GestionnaireMQTT: Gestionnaire partagé
+        """
+        with cls._verrou_instances:
+            gestionnaire = cls._instances.get((broker, port))
+            if gestionnaire is None:
+                gestionnaire = cls._instances[(broker, port)] = cls(broker, port)
+            gestionnaire.utilisateurs += 1
+            return gestionnaire
+
+    @classmethod
+    def installer(cls, gestionnaire):
+        """
+        Enregistre un gestionnaire déjà construit comme gestionnaire partagé de son broker.
+
+        Les appels suivants à obtenir() pour ce broker le retournent, ce qui permet
+        de substituer la connexion d'un processus avant la création des composants
+        (ex. relais IPC des workers de superviseur.py).
+
+        Args:
+            gestionnaire (GestionnaireMQTT): Gestionnaire à partager
+        """
+        with cls._verrou_instances:
+            cls._instances[(gestionnaire.broker, gestionnaire.port)] = gestionnaire
+
+    def __init__(self, broker, port=1883, keepalive=60, client=None):
+        """
+        Crée le client paho, sans se connecter.
+
+        Args:
+            broker (str): Adresse du broker MQTT
+            port (int): Port du broker MQTT. Défaut: 1883
+            keepalive (int): Intervalle de keepalive MQTT (en secondes). Défaut: 60
+            client (optional): Client à utiliser à la place d'un client paho
+        """
+        self.broker = broker
+        self.port = port
+        self.keepalive = keepalive
+        self.utilisateurs = 0
+        self.demarre = False
+        self.routeur = RouteurMQTT()
+        self._verrou = Lock()
+        self.client = client if client is not None else mqtt.Client()
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+
+    def prendre(self):
+        """
+        Déclare un utilisateur supplémentaire d'un gestionnaire déjà obtenu.
+
+        Chaque appel doit être équilibré par un appel à liberer().
+
+        Returns:
+            GestionnaireMQTT: Ce gestionnaire
+        """
+        with GestionnaireMQTT._verrou_instances:
+            self.utilisateurs += 1
+        return self
+
+    def abonner(self, filtre, callback, lent=False):
+        """
+        Enregistre un callback pour un filtre de topic (jokers '+' et '#' acceptés).
+
+        Args:
+            filtre (str): Filtre d'abonnement MQTT
+            callback (callable): Fonction (client, userdata, message) appelée à chaque message,
+                                 message étant un routage_mqtt.MessageMQTT
+            lent (bool, optional): Si True, le callback est exécuté hors du thread réseau,
+                                   dans le pool du routeur. Défaut: False
+        """
+        nouveau = self.routeur.ajouter(filtre, callback, lent)
+        if nouveau and self.client.is_connected():
+            self.client.subscribe(filtre)
+
+    def desabonner(self, filtre, callback):
+        """
+        Retire un callback ; le filtre est désabonné auprès du broker s'il n'a plus d'utilisateur.
+
+        Args:
+            filtre (str): Filtre d'abonnement MQTT
+            callback (callable): Callback enregistré par abonner()
+        """
+        vide = self.routeur.retirer(filtre, callback)
+        if vide and self.client.is_connected():
+            self.client.unsubscribe(filtre)
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        """
+        Publie un message sur la connexion partagée.
+
+        Args:
+            topic (str): Topic MQTT
+            payload (bytes or str, optional): Contenu du message
+            qos (int, optional): Niveau de QoS. Défaut: 0
+            retain (bool, optional): Message retenu par le broker. Défaut: False
+
+        Returns:
+            MQTTMessageInfo: Résultat de la publication paho
+        """
+        return self.client.publish(topic, payload, qos, retain)
+
+    def demarrer(self):
+        """
+        Connecte le client et démarre la boucle réseau, une seule fois par processus.
+        """
+        with self._verrou:
+            if self.demarre:
+                return
+            self.demarre = True
+        try:
+            self.client.connect(self.broker, self.port, self.keepalive)
+            journal.info("Connexion réussie au broker MQTT : %s:%s", self.broker, self.port)
+        except Exception as e:
+            journal.error("Erreur de connexion MQTT : %s", e)
+        self.client.loop_start()
+
+    def liberer(self):
+        """
+        Rend le gestionnaire ; la connexion est fermée au départ du dernier utilisateur.
+        """
+        cle = (self.broker, self.port)
+        with GestionnaireMQTT._verrou_instances:
+            self.utilisateurs -= 1
+            if self.utilisateurs > 0:
+                return
+            if GestionnaireMQTT._instances.get(cle) is self:
+                del GestionnaireMQTT._instances[cle]
+        self.arreter()
+
+    def arreter(self):
+        """
+        Arrête la boucle réseau et ferme la connexion au broker.
+        """
+        if not self.demarre:
+            return
+        self.demarre = False
+        self.client.loop_stop()
+        self.client.disconnect()
+        self.routeur.arreter()
+        journal.info("Déconnexion du broker MQTT effectuée")
+
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc != 0:
+            journal.error("Échec de connexion MQTT, code=%s", rc)
+            return
+        filtres = [(filtre, 0) for filtre in self.routeur.filtres()]
+        if filtres:
+            client.subscribe(filtres)
+            journal.info("Abonné aux topics : %s", [filtre for filtre, qos in filtres])
+
+    def _on_message(self, client, userdata, message):
+        self.routeur.distribuer(client, userdata, message)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Démarrage rapide du jeu Simon : imports différés et rapport de durées.
+
+Les modules lourds (pygame, socketio) ne sont importés qu'au premier accès
+à l'un de leurs attributs, via ModuleDiffere. Les imports et initialisations
+sont chronométrés par CHRONOMETRE, dont le rapport indique à quel instant
+le jeu est prêt à recevoir site/start après un redémarrage de la borne.
+
+Usage:
+    pygame = ModuleDiffere("pygame")
+    with CHRONOMETRE.mesurer("audio"):
+        pygame.mixer.init()  # pygame est importé ici
+    print(CHRONOMETRE.rapport())
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+
+import importlib
+import time
+
+
+class Chronometre:
+    """
+    Journal des durées des étapes du démarrage, relatives à la création du chronomètre.
+    """
+
+    def __init__(self):
+        """
+        Initialise un journal vide ; l'origine des instants est l'instant présent.
+        """
+        self.origine = time.perf_counter()
+        self.etapes = []
+        self._verrou = Lock()
+
+    @contextmanager
+    def mesurer(self, nom):
+        """
+        Chronomètre le bloc with.
+
+        Args:
+            nom (str): Nom de l'étape (ex. "import socketio")
+        """
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._verrou:
+                self.etapes.append((nom, debut - self.origine, time.perf_counter() - debut))
+
+    def marquer(self, nom):
+        """
+        Enregistre un jalon instantané (ex. "prêt pour site/start").
+
+        Args:
+            nom (str): Nom du jalon
+        """
+        with self._verrou:
+            self.etapes.append((nom, time.perf_counter() - self.origine, None))
+
+    def rapport(self):
+        """
+        Met en forme les étapes enregistrées, par ordre chronologique.
+
+        Returns:
+            str: Une ligne par étape : instant de début, durée, nom
+        """
+        lignes = ["Rapport de démarrage (instant, durée) :"]
+        with self._verrou:
+            etapes = sorted(self.etapes, key=lambda etape: etape[1])
+        for nom, debut, duree in etapes:
+            duree_texte = "   jalon" if duree is None else f"{duree * 1000:7.1f} ms"
+            lignes.append(f"  +{debut * 1000:7.1f} ms  {duree_texte}  {nom}")
+        return "\n".join(lignes)
+
+
+CHRONOMETRE = Chronometre()
+
+
+class ModuleDiffere:
+    """
+    Module importé au premier accès à l'un de ses attributs.
+
+    Les accès suivants sont délégués au module réel : les remplacements
+    faits sur celui-ci (unittest.mock.patch) restent visibles.
+    """
+
+    def __init__(self, nom):
+        """
+        Args:
+            nom (str): Nom du module à importer (ex. "socketio")
+        """
+        self._nom = nom
+        self._module = None
+        self._verrou = Lock()
+
+    def __getattr__(self, attribut):
+        module = self._module
+        if module is None:
+            module = self._charger()
+        return getattr(module, attribut)
+
+    def _charger(self):
+        with self._verrou:
+            if self._module is None:
+                with CHRONOMETRE.mesurer(f"import {self._nom}"):
+                    self._module = importlib.import_module(self._nom)
+            return self._module
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Enregistrement et rejeu des flux d'événements du SensFloor.
+
+L'Enregistreur écrit chaque événement 'step' et 'objects-update' reçu par
+JeuSimon dans un journal binaire compact en ajout seul, avec un horodatage
+monotone. Le Rejoueur relit ce journal et réinjecte les événements dans
+traiter_pas() / traiter_objets() en temps réel, accéléré (x10...) ou aussi vite
+que possible, pour reproduire une session hors ligne ou tester la charge du
+chemin de détection sans personne sur le tapis. Les horodatages d'origine sont
+transmis au jeu : l'anti-rebond se comporte comme pendant la session réelle.
+
+Format du journal (petit-boutiste) :
+    - en-tête : b"SIMONLOG" suivi de la version sur un octet
+    - enregistrement : horodatage (double), type (octet), taille de la charge (uint16)
+        - type 1 (step) : x, y (double, double)
+        - type 2 (objects-update) : nombre d'objets (uint16) puis x, y (float, float) par objet
+
+Usage:
+    jeu.activer_enregistrement("session.simonlog")
+    Rejoueur("session.simonlog", jeu, vitesse=10).rejouer()
+"""
+
+from threading import Lock
+
+import os
+import struct
+import time
+
+ENTETE = b"SIMONLOG"
+VERSION = 1
+
+TYPE_PAS = 1
+TYPE_OBJETS = 2
+
+_ENREGISTREMENT = struct.Struct("<dBH")
+_PAS = struct.Struct("<dd")
+_NB_OBJETS = struct.Struct("<H")
+_POSITION = struct.Struct("<ff")
+
+
+class Enregistreur:
+    """
+    Journal binaire en ajout seul des événements du SensFloor.
+    """
+
+    def __init__(self, chemin):
+        """
+        Ouvre (ou crée) un journal en ajout.
+
+        Args:
+            chemin (str): Chemin du fichier journal
+        """
+        self.chemin = chemin
+        self._verrou = Lock()
+        nouveau = not os.path.exists(chemin) or os.path.getsize(chemin) == 0
+        self._fichier = open(chemin, "ab")
+        if nouveau:
+            self._fichier.write(ENTETE + bytes([VERSION]))
+
+    def _ecrire(self, type_evenement, charge):
+        """
+        Ajoute un enregistrement horodaté au journal.
+
+        Args:
+            type_evenement (int): TYPE_PAS ou TYPE_OBJETS
+            charge (bytes): Charge utile encodée
+        """
+        entete = _ENREGISTREMENT.pack(time.monotonic(), type_evenement, len(charge))
+        with self._verrou:
+            if self._fichier:
+                self._fichier.write(entete + charge)
+
+    def pas(self, x, y):
+        """
+        Enregistre un événement 'step'.
+
+        Args:
+            x (float): Coordonnée X du pas
+            y (float): Coordonnée Y du pas
+        """
+        self._ecrire(TYPE_PAS, _PAS.pack(float(x), float(y)))
+
+    def objets(self, objets):
+        """
+        Enregistre une trame 'objects-update' (positions des objets uniquement).
+
+        Args:
+            objets (list): Objets {'x': ..., 'y': ...} ou séquences [x, y, ...]
+        """
+        objets = objets[:0xFFFF]
+        morceaux = [_NB_OBJETS.pack(len(objets))]
+        for objet in objets:
+            if isinstance(objet, dict):
+                x, y = objet.get('x', float('nan')), objet.get('y', float('nan'))
+            else:
+                x, y = objet[0], objet[1]
+            morceaux.append(_POSITION.pack(float(x), float(y)))
+        self._ecrire(TYPE_OBJETS, b"".join(morceaux))
+
+    def fermer(self):
+        """
+        Vide les tampons et ferme le journal.
+        """
+        with self._verrou:
+            if self._fichier:
+                self._fichier.close()
+                self._fichier = None
+
+
+def lire_evenements(chemin):
+    """
+    Parcourt les événements d'un journal.
+
+    Args:
+        chemin (str): Chemin du fichier journal
+
+    Yields:
+        tuple: (horodatage, type, données) où données vaut (x, y) pour un pas
+               ou une liste de {'x': ..., 'y': ...} pour une trame d'objets
+    """
+    with open(chemin, "rb") as fichier:
+        donnees = fichier.read()
+    if not donnees.startswith(ENTETE):
+        raise ValueError(f"{chemin} n'est pas un journal SensFloor")
+    if donnees[len(ENTETE)] != VERSION:
+        raise ValueError(f"Version de journal non supportée : {donnees[len(ENTETE)]}")
+    position = len(ENTETE) + 1
+    while position + _ENREGISTREMENT.size <= len(donnees):
+        horodatage, type_evenement, taille = _ENREGISTREMENT.unpack_from(donnees, position)
+        position += _ENREGISTREMENT.size
+        if position + taille > len(donnees):
+            break  # Dernier enregistrement tronqué (arrêt brutal pendant l'écriture)
+        charge = donnees[position:position + taille]
+        position += taille
+        if type_evenement == TYPE_PAS:
+            yield horodatage, TYPE_PAS, _PAS.unpack(charge)
+        elif type_evenement == TYPE_OBJETS:
+            (nombre,) = _NB_OBJETS.unpack_from(charge)
+            objets = [
+                {'x': x, 'y': y}
+                for x, y in _POSITION.iter_unpack(charge[_NB_OBJETS.size:_NB_OBJETS.size + nombre * _POSITION.size])
+            ]
+            yield horodatage, TYPE_OBJETS, objets
+
+
+class Rejoueur:
+    """
+    Réinjecte un journal d'événements dans une instance de jeu.
+    """
+
+    def __init__(self, chemin, jeu, vitesse=1.0):
+        """
+        Prépare le rejeu.
+
+        Args:
+            chemin (str): Chemin du fichier journal
+            jeu (JeuSimon): Jeu recevant les événements (traiter_pas / traiter_objets)
+            vitesse (float): Facteur d'accélération (1 = temps réel, 10 = dix fois plus vite).
+                             0 ou None pour rejouer aussi vite que possible. Défaut: 1.0
+        """
+        self.chemin = chemin
+        self.jeu = jeu
+        self.vitesse = vitesse
+        self.arret = False
+
+    def rejouer(self):
+        """
+        Rejoue le journal en respectant les écarts entre événements.
+
+        Les écarts négatifs (journal alimenté par plusieurs sessions ou
+        enregistré de part et d'autre d'un redémarrage) sont ramenés à zéro,
+        pour l'attente comme pour les instants transmis au jeu : ceux-ci
+        partent du premier horodatage et ne reculent jamais.
+
+        Returns:
+            dict: Nombre de pas et de trames rejoués, et durée du rejeu en secondes
+        """
+        stats = {"pas": 0, "objets": 0, "duree": 0.0}
+        debut = time.monotonic()
+        cible = debut
+        precedent = None
+        instant = None
+        for horodatage, type_evenement, donnees in lire_evenements(self.chemin):
+            if self.arret:
+                break
+            if precedent is None:
+                instant = horodatage
+            else:
+                ecart = max(0.0, horodatage - precedent)
+                instant += ecart
+                if self.vitesse:
+                    cible += ecart / self.vitesse
+                    attente = cible - time.monotonic()
+                    if attente > 0:
+                        time.sleep(attente)
+            precedent = horodatage
+            # L'instant d'origine (recalé) est transmis pour que l'anti-rebond
+            # voie le rythme réel des pas, même en rejeu accéléré
+            if type_evenement == TYPE_PAS:
+                self.jeu.traiter_pas(*donnees, instant=instant)
+                stats["pas"] += 1
+            else:
+                self.jeu.traiter_objets(donnees, instant=instant)
+                stats["objets"] += 1
+        stats["duree"] = time.monotonic() - debut
+        return stats
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+File de lecture des sons à priorités, avec préemption et annulation.
+
+Trois niveaux, du plus urgent au moins urgent :
+    - PRIORITE_ALERTE : son d'erreur ;
+    - PRIORITE_RETOUR : retour sonore d'un pas (message sans "pas") ;
+    - PRIORITE_SEQUENCE : séquence complète d'un tour.
+
+Un son urgent passe devant les sons moins urgents en attente et interrompt
+celui en cours de lecture s'il est moins urgent (l'événement interruption
+est surveillé par le lecteur pendant ses attentes). Une nouvelle séquence
+remplace les séquences en attente et interrompt la séquence en cours :
+seule la dernière séquence reçue est jouée. Les alertes et les retours
+sont joués dans leur ordre d'arrivée.
+
+Le lecteur se bloque sur prendre() sans scrutation périodique.
+"""
+
+from collections import deque
+from threading import Condition, Event
+
+PRIORITE_ALERTE = 0
+PRIORITE_RETOUR = 1
+PRIORITE_SEQUENCE = 2
+
+
+class FileSons:
+    """
+    File de séquences de sons à trois niveaux de priorité.
+    """
+
+    def __init__(self):
+        """
+        Initialise une file vide et ouverte.
+        """
+        self._files = {priorite: deque() for priorite in (PRIORITE_ALERTE, PRIORITE_RETOUR, PRIORITE_SEQUENCE)}
+        self._condition = Condition()
+        self.interruption = Event()
+        self.en_cours = None
+        self.remplacees = 0
+        self.fermee = False
+
+    def deposer(self, sequence, priorite=PRIORITE_SEQUENCE):
+        """
+        Ajoute une séquence à jouer.
+
+        Args:
+            sequence (list): Numéros des sons
+            priorite (int, optional): PRIORITE_ALERTE, PRIORITE_RETOUR ou PRIORITE_SEQUENCE.
+                                      Défaut: PRIORITE_SEQUENCE
+        """
+        with self._condition:
+            if priorite == PRIORITE_SEQUENCE:
+                self.remplacees += len(self._files[PRIORITE_SEQUENCE])
+                self._files[PRIORITE_SEQUENCE].clear()
+            self._files[priorite].append(sequence)
+            # Préemption d'un son moins urgent, ou d'une séquence remplacée par une nouvelle
+            if self.en_cours is not None and (
+                    priorite < self.en_cours or priorite == self.en_cours == PRIORITE_SEQUENCE):
+                self.interruption.set()
+            self._condition.notify()
+
+    def prendre(self):
+        """
+        Retire la séquence la plus urgente, en attendant qu'il y en ait une.
+
+        Returns:
+            tuple or None: (priorite, sequence), None une fois la file fermée
+        """
+        with self._condition:
+            while True:
+                if self.fermee:
+                    return None
+                for priorite, file in self._files.items():
+                    if file:
+                        self.en_cours = priorite
+                        self.interruption.clear()
+                        return priorite, file.popleft()
+                self._condition.wait()
+
+    def terminer(self):
+        """
+        Signale la fin de la lecture de la séquence prise par prendre().
+        """
+        with self._condition:
+            self.en_cours = None
+
+    def annuler(self):
+        """
+        Abandonne les séquences en attente et interrompt la lecture en cours.
+        """
+        with self._condition:
+            for file in self._files.values():
+                file.clear()
+            if self.en_cours is not None:
+                self.interruption.set()
+
+    def vide(self):
+        """
+        Returns:
+            bool: True si aucune séquence n'est en attente
+        """
+        with self._condition:
+            return not any(self._files.values())
+
+    def fermer(self):
+        """
+        Ferme la file : prendre() retourne None et la lecture en cours est interrompue.
+        """
+        with self._condition:
+            self.fermee = True
+            self.interruption.set()
+            self._condition.notify_all()
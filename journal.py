@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Journalisation asynchrone du jeu Simon.
+
+Les modules journalisent avec le module standard logging
+(journal = logging.getLogger(__name__)) et des messages à arguments
+différés ("Lecture du son %s", numero) : un message d'un niveau désactivé
+n'est ni mis en forme ni écrit. Les enregistrements retenus sont déposés
+tels quels dans une file par un QueueHandler ; un QueueListener les met en
+forme et les écrit depuis son propre thread. Les threads Socket.IO, MQTT
+et audio ne font donc aucune entrée/sortie pour journaliser.
+
+Configuration (variables d'environnement lues par configurer_journal()) :
+    - SIMON_JOURNAL : niveau (DEBUG, INFO, WARNING...). Défaut: INFO
+    - SIMON_JOURNAL_FORMAT : "texte" ou "json" (une ligne JSON par
+      enregistrement, pour journald). Défaut: texte
+
+Les affichages destinés au joueur (invites, séquence, score) restent des
+print : ils ne relèvent pas du journal.
+
+Usage:
+    configurer_journal()
+    journal = logging.getLogger(__name__)
+    journal.debug("MQTT >>> [%s] %s", topic, TexteDiffere(charge))
+    ...
+    arreter_journal()
+"""
+
+from queue import SimpleQueue
+from threading import Lock
+
+import json
+import logging
+import logging.handlers
+import os
+
+FORMAT_TEXTE = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+
+_ecouteur = None
+_verrou = Lock()
+
+
+class TexteDiffere:
+    """
+    Charge MQTT décodée seulement si le message qui la contient est mis en forme.
+    """
+
+    __slots__ = ('charge',)
+
+    def __init__(self, charge):
+        """
+        Args:
+            charge (bytes or str): Contenu du message
+        """
+        self.charge = charge
+
+    def __str__(self):
+        charge = self.charge
+        return charge.decode(errors='replace') if isinstance(charge, (bytes, bytearray)) else str(charge)
+
+
+class FormateurJSON(logging.Formatter):
+    """
+    Met en forme un enregistrement sur une ligne JSON.
+    """
+
+    def format(self, record):
+        """
+        Args:
+            record (logging.LogRecord): Enregistrement
+
+        Returns:
+            str: Objet JSON (instant, niveau, module, thread, message et exception éventuelle)
+        """
+        contenu = {
+            "instant": self.formatTime(record),
+            "niveau": record.levelname,
+            "module": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            contenu["exception"] = self.formatException(record.exc_info)
+        return json.dumps(contenu, ensure_ascii=False)
+
+
+class GestionnaireFile(logging.handlers.QueueHandler):
+    """
+    QueueHandler qui dépose l'enregistrement sans le mettre en forme.
+
+    La mise en forme (arguments compris) est faite par le thread du
+    QueueListener ; les arguments sont donc lus au moment de l'écriture.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def configurer_journal(niveau=None, format_=None, sortie=None):
+    """
+    Installe la journalisation asynchrone sur le logger racine (une seule fois).
+
+    Args:
+        niveau (str or int, optional): Niveau minimal. Défaut: SIMON_JOURNAL ou INFO
+        format_ (str, optional): "texte" ou "json". Défaut: SIMON_JOURNAL_FORMAT ou "texte"
+        sortie (logging.Handler, optional): Gestionnaire d'écriture. Défaut: sortie d'erreur
+
+    Returns:
+        logging.handlers.QueueListener: Thread d'écriture du journal
+    """
+    global _ecouteur
+    with _verrou:
+        if _ecouteur is not None:
+            return _ecouteur
+        niveau = niveau or os.environ.get("SIMON_JOURNAL", "INFO")
+        format_ = format_ or os.environ.get("SIMON_JOURNAL_FORMAT", "texte")
+        if sortie is None:
+            sortie = logging.StreamHandler()
+        sortie.setFormatter(FormateurJSON() if format_ == "json" else logging.Formatter(FORMAT_TEXTE))
+        file = SimpleQueue()
+        racine = logging.getLogger()
+        racine.setLevel(niveau.upper() if isinstance(niveau, str) else niveau)
+        racine.addHandler(GestionnaireFile(file))
+        _ecouteur = logging.handlers.QueueListener(file, sortie, respect_handler_level=True)
+        _ecouteur.start()
+        return _ecouteur
+
+
+def arreter_journal():
+    """
+    Écrit les enregistrements en attente puis arrête le thread d'écriture.
+    """
+    global _ecouteur
+    with _verrou:
+        if _ecouteur is None:
+            return
+        _ecouteur.stop()
+        racine = logging.getLogger()
+        for gestionnaire in list(racine.handlers):
+            if isinstance(gestionnaire, GestionnaireFile):
+                racine.removeHandler(gestionnaire)
+        _ecouteur = None
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation des latences du jeu Simon.
+
+Chaque étape de la vie d'un pas (réception Socket.IO, classification,
+mise en file, lecture par la boucle de jeu, publication MQTT) alimente un
+histogramme. Les histogrammes sont exposés :
+    - au format texte Prometheus sur un port HTTP local (/metrics) ;
+    - sous forme de résumé JSON publié périodiquement sur un topic MQTT.
+
+Les histogrammes n'utilisent pas de verrou : une observation se résume à
+une recherche dichotomique et à quelques incréments d'entiers. En cas
+d'observations simultanées depuis plusieurs threads, un incrément peut
+exceptionnellement être perdu, ce qui est sans conséquence pour des
+statistiques de latence.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Thread
+
+import bisect
+import json
+import logging
+import time
+
+journal = logging.getLogger(__name__)
+
+# Bornes supérieures des seaux, en secondes (de 50 µs à 10 s)
+BORNES_PAR_DEFAUT = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Histogramme:
+    """
+    Histogramme à seaux fixes, cumulatif et sur fenêtre glissante.
+
+    Les totaux cumulés servent à l'export Prometheus ; la fenêtre glissante
+    (nb_fenetres sous-fenêtres de duree_fenetre secondes) sert au calcul des
+    quantiles récents.
+    """
+
+    def __init__(self, bornes=BORNES_PAR_DEFAUT, duree_fenetre=10.0, nb_fenetres=6):
+        """
+        Initialise un histogramme vide.
+
+        Args:
+            bornes (tuple): Bornes supérieures croissantes des seaux (en secondes)
+            duree_fenetre (float): Durée d'une sous-fenêtre glissante. Défaut: 10.0
+            nb_fenetres (int): Nombre de sous-fenêtres conservées. Défaut: 6
+        """
+        self.bornes = tuple(bornes)
+        self.totaux = [0] * (len(self.bornes) + 1)  # Dernier seau : +Inf
+        self.somme = 0.0
+        self.nombre = 0
+        self.duree_fenetre = duree_fenetre
+        self.nb_fenetres = nb_fenetres
+        self._fenetres = [[0] * len(self.totaux) for _ in range(nb_fenetres)]
+        self._ids_fenetres = [-1] * nb_fenetres
+
+    def _fenetre(self, instant):
+        """Retourne la sous-fenêtre courante, remise à zéro si elle a expiré."""
+        identifiant = int(instant / self.duree_fenetre)
+        position = identifiant % self.nb_fenetres
+        if self._ids_fenetres[position] != identifiant:
+            self._fenetres[position] = [0] * len(self.totaux)
+            self._ids_fenetres[position] = identifiant
+        return self._fenetres[position]
+
+    def observer(self, valeur):
+        """
+        Ajoute une mesure.
+
+        Args:
+            valeur (float): Durée mesurée en secondes
+        """
+        indice = bisect.bisect_left(self.bornes, valeur)
+        self.totaux[indice] += 1
+        self.somme += valeur
+        self.nombre += 1
+        self._fenetre(time.monotonic())[indice] += 1
+
+    def comptes_recents(self):
+        """
+        Retourne les comptes par seau sur la fenêtre glissante.
+
+        Returns:
+            list: Nombre de mesures par seau
+        """
+        identifiant_courant = int(time.monotonic() / self.duree_fenetre)
+        comptes = [0] * len(self.totaux)
+        for identifiant, fenetre in zip(self._ids_fenetres, self._fenetres):
+            if 0 <= identifiant_courant - identifiant < self.nb_fenetres:
+                for i, compte in enumerate(fenetre):
+                    comptes[i] += compte
+        return comptes
+
+    def quantile(self, q):
+        """
+        Estime un quantile récent (borne supérieure du seau atteint).
+
+        Args:
+            q (float): Quantile entre 0 et 1
+
+        Returns:
+            float or None: Estimation en secondes, None sans mesure récente
+        """
+        comptes = self.comptes_recents()
+        total = sum(comptes)
+        if not total:
+            return None
+        rang = q * total
+        cumul = 0
+        for i, compte in enumerate(comptes):
+            cumul += compte
+            if cumul >= rang:
+                return self.bornes[i] if i < len(self.bornes) else float('inf')
+        return float('inf')
+
+
+class Instrumentation:
+    """
+    Registre des histogrammes de latence, un par étape.
+    """
+
+    def __init__(self):
+        """
+        Initialise un registre vide.
+        """
+        self.histogrammes = {}
+
+    def observer(self, etape, duree):
+        """
+        Enregistre la durée d'une étape.
+
+        Args:
+            etape (str): Nom de l'étape (ex. "classification")
+            duree (float): Durée mesurée en secondes
+        """
+        histogramme = self.histogrammes.get(etape)
+        if histogramme is None:
+            histogramme = self.histogrammes.setdefault(etape, Histogramme())
+        histogramme.observer(duree)
+
+    def format_prometheus(self):
+        """
+        Exporte les histogrammes au format texte Prometheus.
+
+        Returns:
+            str: Exposition texte (version 0.0.4)
+        """
+        lignes = [
+            "# HELP simon_etape_duree_secondes Durée des étapes du traitement d'un pas.",
+            "# TYPE simon_etape_duree_secondes histogram",
+        ]
+        for etape, histogramme in sorted(self.histogrammes.items()):
+            cumul = 0
+            for borne, compte in zip(histogramme.bornes, histogramme.totaux):
+                cumul += compte
+                lignes.append(f'simon_etape_duree_secondes_bucket{{etape="{etape}",le="{borne}"}} {cumul}')
+            lignes.append(f'simon_etape_duree_secondes_bucket{{etape="{etape}",le="+Inf"}} {histogramme.nombre}')
+            lignes.append(f'simon_etape_duree_secondes_sum{{etape="{etape}"}} {histogramme.somme}')
+            lignes.append(f'simon_etape_duree_secondes_count{{etape="{etape}"}} {histogramme.nombre}')
+        return "\n".join(lignes) + "\n"
+
+    def resume(self):
+        """
+        Résume les histogrammes pour la publication MQTT.
+
+        Returns:
+            dict: Par étape, nombre total de mesures et quantiles récents en millisecondes
+        """
+        resume = {}
+        for etape, histogramme in self.histogrammes.items():
+            quantiles = {}
+            for nom, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+                valeur = histogramme.quantile(q)
+                quantiles[nom] = None if valeur is None else valeur * 1000
+            resume[etape] = {"nombre": histogramme.nombre, **quantiles}
+        return resume
+
+
+class ServeurMetriques:
+    """
+    Serveur HTTP local exposant les métriques au format Prometheus sur /metrics.
+    """
+
+    def __init__(self, instrumentation, port=9108, hote="127.0.0.1"):
+        """
+        Démarre le serveur dans un thread dédié.
+
+        Args:
+            instrumentation (Instrumentation): Registre à exposer
+            port (int): Port d'écoute. Défaut: 9108
+            hote (str): Adresse d'écoute. Défaut: "127.0.0.1"
+        """
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                corps = instrumentation.format_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        self._serveur.daemon_threads = True
+        self.port = self._serveur.server_address[1]
+        self._thread = Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        """
+        Arrête le serveur HTTP.
+        """
+        self._serveur.shutdown()
+        self._serveur.server_close()
+
+
+class PublicateurStats:
+    """
+    Publie périodiquement le résumé des histogrammes sur un topic MQTT.
+    """
+
+    def __init__(self, instrumentation, mqtt_client, topic="Tapis/stats", periode=10.0):
+        """
+        Démarre la publication périodique dans un thread dédié.
+
+        Args:
+            instrumentation (Instrumentation): Registre à publier
+            mqtt_client: Client MQTT utilisé pour la publication
+            topic (str): Topic de publication. Défaut: "Tapis/stats"
+            periode (float): Intervalle entre deux publications (en secondes). Défaut: 10.0
+        """
+        self.instrumentation = instrumentation
+        self.mqtt_client = mqtt_client
+        self.topic = topic
+        self.periode = periode
+        self._arret = Event()
+        self._thread = Thread(target=self._boucle, daemon=True)
+        self._thread.start()
+
+    def _boucle(self):
+        while not self._arret.wait(self.periode):
+            try:
+                self.mqtt_client.publish(self.topic, json.dumps(self.instrumentation.resume()))
+            except Exception as e:
+                journal.error("Erreur de publication des statistiques : %s", e)
+
+    def arreter(self):
+        """
+        Arrête la publication périodique.
+        """
+        self._arret.set()
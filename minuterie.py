@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Minuterie centrale des délais du jeu Simon.
+
+Un seul thread exécute toutes les actions différées du processus, à des
+échéances absolues sur l'horloge monotone, rangées dans un tas. Une action
+planifiée peut être annulée tant qu'elle n'a pas été exécutée (annulation
+paresseuse : l'entrée reste dans le tas et est ignorée à son échéance).
+
+Les actions s'exécutent sur le thread de la minuterie : elles doivent être
+brèves (publication, signalement d'un Event...) et ne jamais bloquer.
+
+Usage:
+    minuterie = Minuterie.obtenir()
+    temporisation = minuterie.planifier(1.0, publier, charge)
+    ...
+    temporisation.annuler()
+"""
+
+from threading import Condition, Lock, Thread
+
+import heapq
+import itertools
+import logging
+import time
+
+journal = logging.getLogger(__name__)
+
+
+class Temporisation:
+    """
+    Action planifiée sur la minuterie, annulable jusqu'à son exécution.
+    """
+
+    __slots__ = ('echeance', 'action', 'args', 'annulee', 'executee', '_verrou')
+
+    def __init__(self, echeance, action, args, verrou):
+        """
+        Args:
+            echeance (float): Instant monotone d'exécution
+            action (callable): Fonction à appeler
+            args (tuple): Arguments de l'action
+            verrou: Verrou de la minuterie, qui protège annulee et executee
+        """
+        self._verrou = verrou
+        self.echeance = echeance
+        self.action = action
+        self.args = args
+        self.annulee = False
+        self.executee = False
+
+    def annuler(self):
+        """
+        Annule l'action si elle n'a pas encore été exécutée.
+
+        Returns:
+            bool: True si l'action ne sera pas exécutée
+        """
+        with self._verrou:
+            self.annulee = True
+            return not self.executee
+
+
+class Minuterie:
+    """
+    Thread unique exécutant les temporisations à leur échéance.
+    """
+
+    _instance = None
+    _verrou_instance = Lock()
+
+    @classmethod
+    def obtenir(cls):
+        """
+        Retourne la minuterie partagée du processus, démarrée au premier appel.
+
+        Returns:
+            Minuterie: Minuterie partagée
+        """
+        with cls._verrou_instance:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        """
+        Crée la minuterie et démarre son thread.
+        """
+        self._tas = []
+        self._ordre = itertools.count()
+        self._condition = Condition()
+        self.actif = True
+        self._thread = Thread(target=self._boucle, name="minuterie", daemon=True)
+        self._thread.start()
+
+    def planifier(self, delai, action, *args):
+        """
+        Planifie une action après un délai.
+
+        Args:
+            delai (float): Délai (en secondes)
+            action (callable): Fonction à appeler sur le thread de la minuterie
+            *args: Arguments de l'action
+
+        Returns:
+            Temporisation: Action planifiée
+        """
+        return self.planifier_a(time.monotonic() + max(0.0, delai), action, *args)
+
+    def planifier_a(self, echeance, action, *args):
+        """
+        Planifie une action à un instant monotone.
+
+        Args:
+            echeance (float): Instant d'exécution (time.monotonic())
+            action (callable): Fonction à appeler sur le thread de la minuterie
+            *args: Arguments de l'action
+
+        Returns:
+            Temporisation: Action planifiée
+        """
+        temporisation = Temporisation(echeance, action, args, self._condition)
+        with self._condition:
+            heapq.heappush(self._tas, (echeance, next(self._ordre), temporisation))
+            # Réveil seulement si la nouvelle échéance précède toutes les autres
+            if self._tas[0][2] is temporisation:
+                self._condition.notify()
+        return temporisation
+
+    def en_attente(self):
+        """
+        Returns:
+            int: Nombre de temporisations non annulées restant à exécuter
+        """
+        with self._condition:
+            return sum(1 for _, _, temporisation in self._tas if not temporisation.annulee)
+
+    def _boucle(self):
+        """
+        Exécute les temporisations échues, en dormant jusqu'à la prochaine échéance.
+        """
+        while True:
+            with self._condition:
+                while self.actif:
+                    if self._tas and self._tas[0][2].annulee:
+                        heapq.heappop(self._tas)
+                        continue
+                    attente = self._tas[0][0] - time.monotonic() if self._tas else None
+                    if attente is not None and attente <= 0:
+                        break
+                    self._condition.wait(attente)
+                if not self.actif:
+                    return
+                _, _, temporisation = heapq.heappop(self._tas)
+                if temporisation.annulee:
+                    continue
+                temporisation.executee = True
+            try:
+                temporisation.action(*temporisation.args)
+            except Exception as e:
+                journal.error("Erreur dans une action de la minuterie : %s", e)
+
+    def arreter(self, timeout=1.0):
+        """
+        Arrête le thread ; les temporisations restantes ne sont pas exécutées.
+
+        Args:
+            timeout (float, optional): Attente maximale du thread (en secondes). Défaut: 1.0
+        """
+        with self._condition:
+            self.actif = False
+            self._condition.notify()
+        self._thread.join(timeout)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Suivi de l'occupation des zones à partir des trames objects-update du SensFloor.
+
+Chaque trame contient la liste des objets (personnes) détectés sur le tapis.
+SuiviOccupation convertit cette liste en tableaux numpy, classe toutes les
+positions en un seul appel vectorisé sur la carte des zones, compte les
+objets par zone et émet un événement pour chaque zone dont l'occupation
+change. Le coût par trame reste constant quel que soit le nombre de
+personnes sur le tapis (hors conversion de la liste JSON).
+
+Modules requis:
+    - numpy: Calcul vectorisé
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from zones import AUCUNE_ZONE
+
+
+class ChangementOccupation(namedtuple("ChangementOccupation", "indice nom couleur avant apres")):
+    """
+    Changement du nombre d'objets présents sur une zone.
+
+    Attributes:
+        indice (int): Indice de la zone dans la carte
+        nom (str): Nom de la zone
+        couleur (str): Couleur de la zone
+        avant (int): Nombre d'objets sur la zone à la trame précédente
+        apres (int): Nombre d'objets sur la zone à cette trame
+    """
+
+    __slots__ = ()
+
+    @property
+    def entree(self):
+        """bool: True si la zone vient d'être occupée."""
+        return self.avant == 0 and self.apres > 0
+
+    @property
+    def sortie(self):
+        """bool: True si la zone vient d'être libérée."""
+        return self.avant > 0 and self.apres == 0
+
+
+def positions_objets(objets):
+    """
+    Extrait les positions d'une liste d'objets SensFloor.
+
+    Args:
+        objets (list): Objets sous forme de dictionnaires {'x': ..., 'y': ...}
+                       ou de séquences [x, y, ...]
+
+    Returns:
+        tuple: (xs, ys) en numpy.ndarray de float64
+    """
+    n = len(objets)
+    xs = np.empty(n, dtype=np.float64)
+    ys = np.empty(n, dtype=np.float64)
+    for i, objet in enumerate(objets):
+        if isinstance(objet, dict):
+            xs[i] = objet.get('x', np.nan)
+            ys[i] = objet.get('y', np.nan)
+        else:
+            xs[i] = objet[0]
+            ys[i] = objet[1]
+    return xs, ys
+
+
+class SuiviOccupation:
+    """
+    Occupation courante des zones du tapis, mise à jour trame par trame.
+    """
+
+    def __init__(self, carte, callback=None):
+        """
+        Initialise le suivi.
+
+        Args:
+            carte (CarteZones): Carte des zones du tapis
+            callback (callable): Fonction appelée avec chaque ChangementOccupation. Défaut: None
+        """
+        self.carte = carte
+        self.callback = callback
+        self.nb_zones = len(carte.zones)
+        self.occupation = np.zeros(self.nb_zones, dtype=np.int64)
+
+    def ingerer(self, objets):
+        """
+        Intègre une trame objects-update et émet les changements d'occupation.
+
+        Args:
+            objets (list): Liste des objets détectés sur le tapis
+
+        Returns:
+            list: ChangementOccupation pour chaque zone dont l'occupation a changé
+        """
+        xs, ys = positions_objets(objets)
+        indices = self.carte.indices_zones(xs, ys)
+        comptes = np.bincount(indices[indices != AUCUNE_ZONE], minlength=self.nb_zones)
+        modifiees = np.flatnonzero(comptes != self.occupation)
+        changements = []
+        for indice in modifiees.tolist():
+            zone = self.carte.zones[indice]
+            changements.append(ChangementOccupation(
+                indice, zone.nom, zone.couleur, int(self.occupation[indice]), int(comptes[indice])
+            ))
+        self.occupation = comptes
+        if self.callback:
+            for changement in changements:
+                self.callback(changement)
+        return changements
+
+    def reinitialiser(self):
+        """
+        Considère toutes les zones comme libres.
+        """
+        self.occupation = np.zeros(self.nb_zones, dtype=np.int64)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Publication MQTT sortante du jeu Simon.
+
+Les messages du topic Tapis/sequence sont construits sans json.dumps :
+    - les messages d'une seule couleur (codes 0 à 5) sont pré-sérialisés une
+      fois pour toutes dans CHARGES_COULEUR ;
+    - les séquences complètes sont encodées de façon incrémentale par
+      EncodeurSequence, qui ne sérialise que les couleurs ajoutées depuis
+      la séquence précédente.
+
+Les octets produits sont identiques à ceux de json.dumps(message).encode().
+
+PublieurMQTT découple la publication du thread appelant : les charges sont
+déposées dans une file bornée que vide un thread unique, si bien que le
+callback Socket.IO d'un pas rend la main en quelques microsecondes.
+"""
+
+from queue import Full, Queue
+from threading import Thread
+
+import json
+import logging
+import time
+
+journal = logging.getLogger(__name__)
+
+# Codes couleur du protocole LED/son : 0-3 couleurs, 4 erreur, 5 réservé
+NB_CODES = 6
+
+CHARGES_COULEUR = tuple(
+    json.dumps({"couleur": [code], "pas": False}).encode('utf-8') for code in range(NB_CODES)
+)
+
+_DEBUT_SEQUENCE = b'{"couleur": ['
+_FIN_SEQUENCE = b'], "pas": true}'
+
+
+class EncodeurSequence:
+    """
+    Encodeur incrémental des messages de séquence complète.
+
+    Chaque tour rallonge la séquence précédente : seuls les nouveaux codes
+    sont sérialisés. Une séquence qui ne prolonge pas la précédente est
+    réencodée entièrement.
+    """
+
+    def __init__(self):
+        """
+        Initialise un encodeur vide.
+        """
+        self._codes = []
+        self._corps = bytearray()
+
+    def encoder(self, codes):
+        """
+        Encode une séquence de codes couleur.
+
+        Args:
+            codes (list): Codes couleur de la séquence
+
+        Returns:
+            bytes: Équivalent de json.dumps({"couleur": codes, "pas": True}).encode()
+        """
+        deja_encodes = len(self._codes)
+        if len(codes) < deja_encodes or codes[:deja_encodes] != self._codes:
+            self._codes = []
+            self._corps = bytearray()
+        for code in codes[len(self._codes):]:
+            if self._codes:
+                self._corps += b", "
+            self._corps += str(code).encode('ascii')
+            self._codes.append(code)
+        return _DEBUT_SEQUENCE + self._corps + _FIN_SEQUENCE
+
+
+class PublieurMQTT:
+    """
+    File de publication MQTT bornée, vidée par un thread dédié.
+    """
+
+    def __init__(self, mqtt_client, taille_max=256, demarrer_thread=True, mesures=None):
+        """
+        Initialise le publieur.
+
+        Args:
+            mqtt_client: Client MQTT utilisé pour la publication
+            taille_max (int, optional): Capacité de la file. Défaut: 256
+            demarrer_thread (bool, optional): Si False, publier() publie directement
+                                              dans le thread appelant (boucle asyncio,
+                                              déjà non bloquante). Défaut: True
+            mesures (Instrumentation, optional): Registre recevant les durées des étapes
+                                                 "publication" et "pas_total"
+        """
+        self.mqtt_client = mqtt_client
+        self.mesures = mesures
+        self.file = Queue(maxsize=taille_max)
+        self.perdus = 0
+        self.thread = None
+        if demarrer_thread:
+            self.thread = Thread(target=self._boucle, daemon=True)
+            self.thread.start()
+
+    def publier(self, topic, charge, recu=None):
+        """
+        Dépose un message dans la file de publication sans bloquer.
+
+        Args:
+            topic (str): Topic MQTT
+            charge (bytes or str): Contenu du message
+            recu (float, optional): Instant monotone de réception du pas à l'origine
+                                    du message, pour la mesure "pas_total"
+
+        Returns:
+            bool: False si la file est pleine et le message abandonné
+        """
+        if self.thread is None:
+            self._publier(topic, charge, recu)
+            return True
+        try:
+            self.file.put_nowait((topic, charge, recu))
+            return True
+        except Full:
+            self.perdus += 1
+            return False
+
+    def _publier(self, topic, charge, recu):
+        debut = time.monotonic()
+        self.mqtt_client.publish(topic, charge)
+        if self.mesures is not None:
+            fin = time.monotonic()
+            self.mesures.observer("publication", fin - debut)
+            if recu is not None:
+                self.mesures.observer("pas_total", fin - recu)
+
+    def _boucle(self):
+        while True:
+            message = self.file.get()
+            try:
+                if message is None:
+                    return
+                self._publier(*message)
+            except Exception as e:
+                journal.error("Erreur de publication MQTT : %s", e)
+            finally:
+                self.file.task_done()
+
+    def vider(self):
+        """
+        Attend que tous les messages déposés aient été publiés.
+        """
+        if self.thread is not None:
+            self.file.join()
+
+    def arreter(self, timeout=1.0):
+        """
+        Publie les messages en attente puis arrête le thread de publication.
+
+        Args:
+            timeout (float, optional): Attente maximale de l'arrêt (en secondes). Défaut: 1.0
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return
+        try:
+            self.file.put(None, timeout=timeout)
+        except Full:
+            return
+        self.thread.join(timeout)
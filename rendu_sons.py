@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Rendu des séquences de sons en un seul buffer.
+
+Jouer une séquence note par note (un Sound par note, pygame.mixer.stop()
+entre deux notes) laisse des écarts qui dépendent de l'ordonnancement des
+threads. RenduSequence assemble à la place un unique tableau numpy :
+chaque note occupe exactement son délai (selon la difficulté), tronquée
+ou complétée par du silence, et la séquence entière est jouée par un seul
+appel au mixer.
+
+Les buffers rendus sont conservés dans un cache LRU borné en octets, par
+(difficulté, séquence). Comme la séquence d'un tour prolonge celle du tour
+précédent, le plus long préfixe déjà rendu est réutilisé et seules les
+nouvelles notes sont assemblées. Le préfixe de la séquence privée de sa
+dernière note est également conservé : c'est celui du tour suivant
+(la note de fin 5 étant toujours ajoutée en dernier).
+
+Modules requis:
+    - numpy: Assemblage des échantillons
+    - pygame.sndarray: Conversion entre Sound et tableaux
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+import pygame.mixer
+import pygame.sndarray
+
+
+class RenduSequence:
+    """
+    Assembleur de séquences de sons, avec cache LRU des buffers rendus.
+    """
+
+    def __init__(self, sons, delai_note, taille_max_octets=64 * 1024 * 1024):
+        """
+        Initialise l'assembleur ; pygame.mixer doit être initialisé.
+
+        Args:
+            sons (dict): Sons chargés, indexés par numéro
+            delai_note (callable): Fonction idx -> durée de la note idx (en secondes)
+            taille_max_octets (int, optional): Taille maximale du cache. Défaut: 64 Mio
+        """
+        self.sons = sons
+        self.delai_note = delai_note
+        self.frequence = pygame.mixer.get_init()[0]
+        self.taille_max_octets = taille_max_octets
+        self.taille_octets = 0
+        self.prefixes_reutilises = 0
+        self._echantillons = {}
+        self._cache = OrderedDict()
+        self._verrou = Lock()
+
+    def echantillons(self, numero):
+        """
+        Retourne les échantillons décodés d'un son, convertis une seule fois.
+
+        Args:
+            numero (int): Numéro du son
+
+        Returns:
+            numpy.ndarray: Échantillons (trames x canaux)
+        """
+        tableau = self._echantillons.get(numero)
+        if tableau is None:
+            tableau = self._echantillons[numero] = pygame.sndarray.array(self.sons[numero])
+        return tableau
+
+    def _segment(self, numero, idx):
+        """Échantillons de la note idx, tronqués ou complétés de silence à la durée de la note."""
+        if numero not in self.sons:
+            return None  # Son absent : aucune durée, comme en lecture note par note
+        tableau = self.echantillons(numero)
+        trames = int(round(self.delai_note(idx) * self.frequence))
+        segment = np.zeros((trames,) + tableau.shape[1:], dtype=tableau.dtype)
+        longueur = min(trames, len(tableau))
+        segment[:longueur] = tableau[:longueur]
+        return segment
+
+    def _lire_cache(self, cle):
+        with self._verrou:
+            buffer = self._cache.get(cle)
+            if buffer is not None:
+                self._cache.move_to_end(cle)
+            return buffer
+
+    def _ecrire_cache(self, cle, buffer):
+        with self._verrou:
+            if cle in self._cache or buffer.nbytes > self.taille_max_octets:
+                return
+            self._cache[cle] = buffer
+            self.taille_octets += buffer.nbytes
+            while self.taille_octets > self.taille_max_octets:
+                _, ancien = self._cache.popitem(last=False)
+                self.taille_octets -= ancien.nbytes
+
+    def rendre(self, sequence, difficulte):
+        """
+        Retourne le buffer d'une séquence, rendu ou repris du cache.
+
+        Args:
+            sequence (list): Numéros des sons
+            difficulte: Clé des délais en vigueur (les délais ne dépendent que
+                        d'elle et de la position de la note)
+
+        Returns:
+            numpy.ndarray or None: Buffer de la séquence complète, lisible par
+                                   pygame.sndarray.make_sound ; None sans aucun son jouable
+        """
+        sequence = tuple(sequence)
+        buffer = self._lire_cache((difficulte, sequence))
+        if buffer is not None:
+            return buffer
+        debut, morceaux = 0, []
+        for longueur in range(len(sequence) - 1, 0, -1):
+            prefixe = self._lire_cache((difficulte, sequence[:longueur]))
+            if prefixe is not None:
+                debut, morceaux = longueur, [prefixe]
+                self.prefixes_reutilises += 1
+                break
+        for idx in range(debut, len(sequence) - 1):
+            segment = self._segment(sequence[idx], idx)
+            if segment is not None:
+                morceaux.append(segment)
+        if debut < len(sequence) - 1 and morceaux:
+            prefixe = np.concatenate(morceaux)
+            self._ecrire_cache((difficulte, sequence[:-1]), prefixe)
+            morceaux = [prefixe]
+        if sequence:
+            dernier = self._segment(sequence[-1], len(sequence) - 1)
+            if dernier is not None:
+                morceaux.append(dernier)
+        if not morceaux:
+            return None
+        buffer = np.concatenate(morceaux) if len(morceaux) > 1 else morceaux[0]
+        self._ecrire_cache((difficulte, sequence), buffer)
+        return buffer
+
+    def creer_son(self, sequence, difficulte):
+        """
+        Retourne la séquence sous forme d'un unique Sound.
+
+        Args:
+            sequence (list): Numéros des sons
+            difficulte: Clé des délais en vigueur
+
+        Returns:
+            tuple: (pygame.mixer.Sound, durée en secondes), ou (None, 0.0) sans aucun son jouable
+        """
+        buffer = self.rendre(sequence, difficulte)
+        if buffer is None:
+            return None, 0.0
+        return pygame.sndarray.make_sound(buffer), len(buffer) / self.frequence
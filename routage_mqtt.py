@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Routage des messages MQTT reçus vers les callbacks abonnés.
+
+Les filtres d'abonnement (jokers '+' et '#' compris) sont compilés dans un
+arbre préfixe indexé par niveau de topic ; le résultat de la recherche est
+mis en cache par topic, si bien qu'un topic déjà vu est routé par un simple
+accès à un dictionnaire.
+
+Le contenu des messages est décodé paresseusement (MessageMQTT) : un message
+sans destinataire n'est jamais décodé, et le JSON d'un message partagé par
+plusieurs callbacks n'est analysé qu'une fois.
+
+Les callbacks rapides s'exécutent dans le thread réseau ; les callbacks
+déclarés lents sont confiés à un pool de threads, chacun avec sa propre
+file bornée : une rafale sur un topic ne retarde ni les autres callbacks
+lents ni la distribution dans le thread réseau.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from threading import Lock
+
+import json
+import logging
+
+journal = logging.getLogger(__name__)
+
+TAILLE_CACHE = 1024
+
+
+class MessageMQTT:
+    """
+    Vue d'un message MQTT reçu, décodée à la demande.
+
+    Expose topic et payload comme un message paho, plus texte et json calculés
+    au premier accès puis mémorisés.
+    """
+
+    def __init__(self, message):
+        """
+        Enveloppe un message paho.
+
+        Args:
+            message: Message paho (attributs topic, payload, qos, retain)
+        """
+        self.topic = message.topic
+        self.payload = message.payload
+        self.qos = getattr(message, 'qos', 0)
+        self.retain = getattr(message, 'retain', False)
+
+    @classmethod
+    def envelopper(cls, message):
+        """
+        Retourne une vue paresseuse d'un message, sans ré-envelopper une vue existante.
+
+        Args:
+            message: Message paho ou MessageMQTT
+
+        Returns:
+            MessageMQTT: Vue du message
+        """
+        return message if isinstance(message, cls) else cls(message)
+
+    @cached_property
+    def texte(self):
+        """str: Contenu décodé en UTF-8."""
+        return self.payload.decode()
+
+    @cached_property
+    def json(self):
+        """Contenu analysé comme JSON (lève ValueError si invalide)."""
+        return json.loads(self.texte)
+
+
+class Route:
+    """
+    Abonnement d'un callback à un filtre de topic.
+    """
+
+    __slots__ = ('filtre', 'callback', 'lent', 'file', 'planifiee', 'perdus')
+
+    def __init__(self, filtre, callback, lent=False, taille_file=64):
+        self.filtre = filtre
+        self.callback = callback
+        self.lent = lent
+        self.file = deque(maxlen=taille_file) if lent else None
+        self.planifiee = False
+        self.perdus = 0
+
+
+class _Noeud:
+    __slots__ = ('enfants', 'routes')
+
+    def __init__(self):
+        self.enfants = {}
+        self.routes = []
+
+
+class RouteurMQTT:
+    """
+    Table de routage des filtres MQTT, avec pool de threads pour les callbacks lents.
+    """
+
+    def __init__(self, nb_workers=2, lot=8):
+        """
+        Initialise une table vide.
+
+        Args:
+            nb_workers (int, optional): Taille du pool des callbacks lents. Défaut: 2
+            lot (int, optional): Nombre de messages traités d'affilée pour une route
+                                 avant de laisser passer les autres. Défaut: 8
+        """
+        self.racine = _Noeud()
+        self.nb_workers = nb_workers
+        self.lot = lot
+        self._cache = {}
+        self._verrou = Lock()
+        self._pool = None
+
+    def ajouter(self, filtre, callback, lent=False):
+        """
+        Abonne un callback à un filtre.
+
+        Args:
+            filtre (str): Filtre MQTT, jokers '+' et '#' acceptés
+            callback (callable): Fonction (client, userdata, message) ; message est un MessageMQTT
+            lent (bool, optional): Si True, le callback s'exécute dans le pool de threads.
+                                   Défaut: False
+
+        Returns:
+            bool: True si le filtre n'avait encore aucun abonné
+        """
+        with self._verrou:
+            noeud = self.racine
+            for niveau in filtre.split('/'):
+                noeud = noeud.enfants.setdefault(niveau, _Noeud())
+            nouveau = not noeud.routes
+            noeud.routes.append(Route(filtre, callback, lent))
+            self._cache.clear()
+            return nouveau
+
+    def retirer(self, filtre, callback):
+        """
+        Désabonne un callback d'un filtre.
+
+        Args:
+            filtre (str): Filtre MQTT
+            callback (callable): Callback enregistré par ajouter()
+
+        Returns:
+            bool: True si le filtre n'a plus aucun abonné
+        """
+        with self._verrou:
+            chemin = [self.racine]
+            for niveau in filtre.split('/'):
+                noeud = chemin[-1].enfants.get(niveau)
+                if noeud is None:
+                    return False
+                chemin.append(noeud)
+            routes = chemin[-1].routes
+            routes[:] = [r for r in routes if r.callback != callback]
+            # Élaguer les nœuds devenus inutiles
+            niveaux = filtre.split('/')
+            for i in range(len(niveaux), 0, -1):
+                if chemin[i].routes or chemin[i].enfants:
+                    break
+                del chemin[i - 1].enfants[niveaux[i - 1]]
+            self._cache.clear()
+            return not routes
+
+    def filtres(self):
+        """
+        Liste les filtres ayant au moins un abonné.
+
+        Returns:
+            list: Filtres, dans l'ordre de parcours de l'arbre
+        """
+        resultat = []
+        with self._verrou:
+            a_parcourir = deque([self.racine])
+            while a_parcourir:
+                noeud = a_parcourir.popleft()
+                if noeud.routes:
+                    resultat.append(noeud.routes[0].filtre)
+                a_parcourir.extend(noeud.enfants.values())
+        return resultat
+
+    def correspondances(self, topic):
+        """
+        Retourne les routes dont le filtre correspond à un topic.
+
+        Args:
+            topic (str): Topic d'un message reçu
+
+        Returns:
+            tuple: Routes correspondantes
+        """
+        routes = self._cache.get(topic)
+        if routes is not None:
+            return routes
+        with self._verrou:
+            resultat = []
+            self._chercher(self.racine, topic.split('/'), 0, resultat, topic.startswith('$'))
+            routes = tuple(resultat)
+            if len(self._cache) >= TAILLE_CACHE:
+                self._cache.clear()
+            self._cache[topic] = routes
+        return routes
+
+    def _chercher(self, noeud, niveaux, i, resultat, systeme):
+        # Les topics commençant par '$' ne sont pas couverts par un joker de premier niveau
+        jokers = not (systeme and i == 0)
+        diese = noeud.enfants.get('#')
+        if diese is not None and jokers:
+            resultat.extend(diese.routes)
+        if i == len(niveaux):
+            resultat.extend(noeud.routes)
+            return
+        enfant = noeud.enfants.get(niveaux[i])
+        if enfant is not None:
+            self._chercher(enfant, niveaux, i + 1, resultat, systeme)
+        plus = noeud.enfants.get('+')
+        if plus is not None and jokers:
+            self._chercher(plus, niveaux, i + 1, resultat, systeme)
+
+    def distribuer(self, client, userdata, message):
+        """
+        Transmet un message reçu aux callbacks abonnés.
+
+        Args:
+            client: Instance du client MQTT
+            userdata: Données utilisateur associées au client
+            message: Message paho reçu
+        """
+        routes = self.correspondances(message.topic)
+        if not routes:
+            return
+        message = MessageMQTT.envelopper(message)
+        for route in routes:
+            if route.lent:
+                self._deposer(route, (client, userdata, message))
+            else:
+                self._executer(route, client, userdata, message)
+
+    def _executer(self, route, client, userdata, message):
+        try:
+            route.callback(client, userdata, message)
+        except Exception as e:
+            journal.error("Erreur dans le traitement du message %s : %s", message.topic, e)
+
+    def _deposer(self, route, arguments):
+        with self._verrou:
+            if len(route.file) == route.file.maxlen:
+                route.perdus += 1  # La file bornée écarte le plus ancien message
+            route.file.append(arguments)
+            if route.planifiee:
+                return
+            route.planifiee = True
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.nb_workers, thread_name_prefix="routage-mqtt")
+            pool = self._pool
+        pool.submit(self._vider, route)
+
+    def _vider(self, route):
+        for _ in range(self.lot):
+            with self._verrou:
+                if not route.file:
+                    route.planifiee = False
+                    return
+                arguments = route.file.popleft()
+            self._executer(route, *arguments)
+        # Lot terminé : replanifier en fin de file du pool pour laisser passer les autres routes
+        with self._verrou:
+            if not route.file or self._pool is None:
+                route.planifiee = False
+                return
+            pool = self._pool
+        pool.submit(self._vider, route)
+
+    def arreter(self):
+        """
+        Arrête le pool de threads des callbacks lents après les traitements en cours.
+        """
+        with self._verrou:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
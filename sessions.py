@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sessions multi-tapis : plusieurs parties de Simon indépendantes dans un seul processus.
+
+Chaque tapis (« mat ») a sa propre session : son EtatJeu, son serveur
+SensFloor, son anti-rebond et ses topics, préfixés par l'identifiant du
+tapis après le premier niveau :
+    Tapis/sequence   ->  Tapis/<mat>/sequence
+    site/start       ->  site/<mat>/start
+    site/difficulte  ->  site/<mat>/difficulte
+
+Les sessions partagent :
+    - la connexion MQTT du processus (GestionnaireMQTT) et son routeur ;
+    - un seul publieur MQTT (un thread de publication pour tous les tapis) ;
+    - un pool de threads qui exécute les parties ;
+    - les sons décodés une seule fois.
+
+Usage:
+    python sessions.py tapis1=http://192.168.5.5:8000 tapis2=http://192.168.5.6:8000 \\
+        [--broker 10.0.200.7] [--port 1883]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import argparse
+import logging
+import time
+
+import pygame.mixer
+
+from journal import arreter_journal, configurer_journal
+from publication import PublieurMQTT
+from simon import JeuSimon, Son, charger_sons
+
+# Attributs de JeuSimon contenant un topic à préfixer par l'identifiant du tapis
+TOPICS_SESSION = (
+    "mqtt_topic", "score_topic", "stats_topic", "led_status_topic",
+    "start_topic", "difficulty_topic",
+)
+
+journal = logging.getLogger(__name__)
+
+
+def topic_tapis(topic, mat):
+    """
+    Insère l'identifiant d'un tapis après le premier niveau d'un topic.
+
+    Args:
+        topic (str): Topic global (ex. "Tapis/sequence")
+        mat (str): Identifiant du tapis
+
+    Returns:
+        str: Topic de la session (ex. "Tapis/<mat>/sequence")
+    """
+    premier, _, reste = topic.partition('/')
+    return f"{premier}/{mat}/{reste}" if reste else f"{premier}/{mat}"
+
+
+class SessionSimon(JeuSimon):
+    """
+    Partie de Simon d'un tapis, hébergée par un GestionnaireSessions.
+    """
+
+    moniteur_clavier = False
+
+    def __init__(self, sessions, mat, sensfloor_url=None):
+        """
+        Initialise la session d'un tapis.
+
+        Args:
+            sessions (GestionnaireSessions): Gestionnaire fournissant les ressources partagées
+            mat (str): Identifiant du tapis, utilisé dans les topics
+            sensfloor_url (str, optional): URL du SensFloor de ce tapis
+        """
+        self.sessions = sessions
+        self.mat = mat
+        super().__init__(
+            mode_test=False,
+            sensfloor_url=sensfloor_url,
+            mqtt_broker=sessions.mqtt_broker,
+            mqtt_port=sessions.mqtt_port
+        )
+
+    def _init_parametres(self, mode_test):
+        super()._init_parametres(mode_test)
+        for attribut in TOPICS_SESSION:
+            setattr(self, attribut, topic_tapis(getattr(self, attribut), self.mat))
+
+    def _creer_publieur(self):
+        self.publieur_partage = True
+        return self.sessions.publieur_partage(self.mqtt_client)
+
+    def _creer_son(self):
+        return Son(topic=self.mqtt_topic, difficulty_topic=self.difficulty_topic,
+                   gestionnaire_mqtt=self.mqtt, sons=self.sessions.sons_partages(),
+                   mesures=self.mesures, canal=self.sessions.canal_session())
+
+    def _lancer_partie(self):
+        self.sessions.executeur.submit(self.demarrer)
+
+
+class GestionnaireSessions:
+    """
+    Héberge N sessions de jeu indépendantes sur des ressources partagées.
+    """
+
+    def __init__(self, mats, mqtt_broker=None, mqtt_port=None):
+        """
+        Crée une session par tapis.
+
+        Args:
+            mats (dict): Identifiant du tapis -> URL de son SensFloor
+            mqtt_broker (str, optional): Adresse du broker MQTT. Défaut: celle de JeuSimon
+            mqtt_port (int, optional): Port du broker MQTT. Défaut: celui de JeuSimon
+        """
+        self.mqtt_broker = mqtt_broker
+        self.mqtt_port = mqtt_port
+        self.executeur = ThreadPoolExecutor(max_workers=max(1, len(mats)),
+                                            thread_name_prefix="session-simon")
+        self.publieur = None
+        self.sons = None
+        self.canaux_reserves = 0
+        self._verrou = Lock()
+        self.sessions = {mat: SessionSimon(self, mat, url) for mat, url in mats.items()}
+
+    def publieur_partage(self, mqtt_client):
+        """
+        Retourne le publieur commun à toutes les sessions, créé au premier appel.
+
+        Args:
+            mqtt_client: Client de la connexion MQTT partagée
+
+        Returns:
+            PublieurMQTT: Publieur partagé
+        """
+        with self._verrou:
+            if self.publieur is None:
+                self.publieur = PublieurMQTT(mqtt_client)
+            return self.publieur
+
+    def sons_partages(self):
+        """
+        Retourne les sons décodés une seule fois pour toutes les sessions.
+
+        Returns:
+            dict: Sons indexés par numéro
+        """
+        with self._verrou:
+            if self.sons is None:
+                pygame.mixer.init()
+                pygame.mixer.set_num_channels(16)
+                self.sons = charger_sons()
+            return self.sons
+
+    def canal_session(self):
+        """
+        Réserve à une session son propre canal du mixer.
+
+        Chaque session joue et interrompt ses sons sur son canal, sans couper
+        ceux des autres tapis. Les canaux réservés ne sont plus choisis par
+        Sound.play().
+
+        Returns:
+            pygame.mixer.Channel: Canal de la session
+        """
+        with self._verrou:
+            indice = self.canaux_reserves
+            self.canaux_reserves += 1
+            if self.canaux_reserves > pygame.mixer.get_num_channels():
+                pygame.mixer.set_num_channels(self.canaux_reserves)
+            pygame.mixer.set_reserved(self.canaux_reserves)
+            return pygame.mixer.Channel(indice)
+
+    def arreter(self):
+        """
+        Arrête toutes les sessions puis les ressources partagées.
+        """
+        if self.publieur:
+            self.publieur.vider()  # Avant la fermeture de la connexion par la dernière session
+        for session in self.sessions.values():
+            session.stop()
+        if self.publieur:
+            self.publieur.arreter()
+        self.executeur.shutdown(wait=False, cancel_futures=True)
+        if self.sons is not None:
+            pygame.mixer.quit()
+
+
+def lire_mats(arguments):
+    """
+    Convertit des arguments "mat=url" en dictionnaire.
+
+    Args:
+        arguments (list): Chaînes "identifiant=url"
+
+    Returns:
+        dict: Identifiant du tapis -> URL du SensFloor
+    """
+    mats = {}
+    for argument in arguments:
+        mat, separateur, url = argument.partition('=')
+        if not separateur or not mat or '/' in mat or '+' in mat or '#' in mat:
+            raise ValueError(f"Tapis invalide : {argument} (format attendu : identifiant=url)")
+        mats[mat] = url
+    return mats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sessions Simon multi-tapis")
+    parser.add_argument('mats', nargs='+', help="Tapis au format identifiant=url_sensfloor")
+    parser.add_argument('--broker', default=None, help="Adresse du broker MQTT")
+    parser.add_argument('--port', type=int, default=None, help="Port du broker MQTT")
+    args = parser.parse_args()
+
+    configurer_journal()
+    gestionnaire = None
+    try:
+        gestionnaire = GestionnaireSessions(lire_mats(args.mats), args.broker, args.port)
+        journal.info("Sessions démarrées : %s", ', '.join(gestionnaire.sessions))
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nArrêt demandé par l'utilisateur")
+    finally:
+        if gestionnaire:
+            gestionnaire.arreter()
+            journal.info("Sessions arrêtées proprement")
+        arreter_journal()
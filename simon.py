@@ -23,7 +23,10 @@ Modules requis:
     - paho.mqtt.client: Communication MQTT
     - json: Sérialisation des messages
     - pygame: Gestion audio
-    - msvcrt: Détection des touches (Windows)
+    - clavier: Lecture des touches du mode test
+    - journal: Journalisation asynchrone des diagnostics (logging)
+    - zones: Carte des zones du tapis (zones.json)
+    - numpy (optionnel): Suivi vectorisé de l'occupation des zones
 
 Auteur: Jossua Nabec et Charlotte Conte
 Version: 1.12
@@ -32,113 +35,105 @@ Date: 03/06/2025
 
 from datetime import datetime
 from queue import Queue, Empty
-from threading import Event, Thread
+from collections import deque
+from threading import Event, Lock, Thread
 
 import random
-import socketio
-import paho.mqtt.client as mqtt
 import json
+import logging
 import sys
 import time
 import os
-import pygame.mixer
-import platform
-
-IS_WINDOWS = platform.system() == "Windows"
-
-if IS_WINDOWS:
-    import msvcrt
-else:
-    import select
-    import termios
-    import tty
-def input_with_timeout(prompt, timeout):
+
+from demarrage import CHRONOMETRE, ModuleDiffere
+from antirebond import AntiRebond
+from clavier import LecteurClavier
+from connexion_mqtt import GestionnaireMQTT
+from enregistrement import Enregistreur
+from minuterie import Minuterie
+from journal import TexteDiffere, configurer_journal, arreter_journal
+from file_sons import PRIORITE_ALERTE, PRIORITE_RETOUR, PRIORITE_SEQUENCE, FileSons
+from mesures import Instrumentation, PublicateurStats, ServeurMetriques
+from publication import CHARGES_COULEUR, EncodeurSequence, PublieurMQTT
+from zones import AUCUNE_ZONE, CarteZones
+
+try:
+    from occupation import SuiviOccupation
+except ImportError:  # numpy absent : pas de suivi d'occupation par trames
+    SuiviOccupation = None
+
+journal = logging.getLogger(__name__)
+
+# Modules lourds importés au premier usage (voir demarrage.py)
+pygame = ModuleDiffere("pygame")
+socketio = ModuleDiffere("socketio")
+
+# Code du son d'erreur dans le protocole LED/son (voir publication.py)
+CODE_ERREUR = 4
+
+# Dernière portion de l'attente d'une note effectuée activement (en secondes)
+MARGE_ATTENTE = 0.002
+
+CHRONOMETRE.marquer("imports de simon")
+
+def charger_sons(dossier=None):
     """
-    Fonction input compatible Windows et Linux avec timeout
-    Retourne None si timeout expiré
+    Précharge les sons son0.mp3 à son5.mp3 dans pygame.mixer.
+
+    Le PCM décodé est mis en cache sur disque (voir cache_sons.py) : seuls
+    les sons absents du cache ou modifiés sont décodés.
+
+    Args:
+        dossier (str, optional): Dossier des fichiers audio. Défaut: le dossier "son"
+                                 à côté de ce module
+
+    Returns:
+        dict: Sons chargés, indexés par numéro (0 à 5)
     """
-    print(prompt, end='', flush=True)
-    if IS_WINDOWS:
-        start_time = time.time()
-        input_str = ""
-        while True:
-            if msvcrt.kbhit():
-                char = msvcrt.getch()
-                if char in [b'\r', b'\n']:
-                    print()
-                    return input_str
-                elif char == b'\x08':  # backspace
-                    input_str = input_str[:-1]
-                    print('\b \b', end='', flush=True)
-                else:
-                    try:
-                        char_decoded = char.decode('utf-8')
-                        input_str += char_decoded
-                        print(char_decoded, end='', flush=True)
-                    except Exception:
-                        pass
-            if time.time() - start_time > timeout:
-                print()
-                return None
-            time.sleep(0.01)
-    else:
-        # Linux (Raspberry Pi)
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
+    from cache_sons import charger_son
+
+    if dossier is None:
+        dossier = os.path.join(os.path.dirname(os.path.abspath(__file__)), "son")
+    sons = {}
+    for i in range(0, 6):
         try:
-            tty.setraw(fd)
-            rlist, _, _ = select.select([fd], [], [], timeout)
-            if rlist:
-                input_str = ""
-                while True:
-                    char = sys.stdin.read(1)
-                    if char in ['\r', '\n']:
-                        print()
-                        return input_str
-                    elif char == '\x7f':  # backspace
-                        input_str = input_str[:-1]
-                        print('\b \b', end='', flush=True)
-                    else:
-                        input_str += char
-                        print(char, end='', flush=True)
+            sound_path = os.path.join(dossier, f"son{i}.mp3")
+            if os.path.exists(sound_path):
+                sons[i] = charger_son(sound_path)
+                journal.debug("Son %s chargé avec succès", i)
             else:
-                print()
-                return None
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    return None
-def get_single_char(timeout=None):
-    """Lit un caractère depuis le clavier (non bloquant, compatible Win/RPi)."""
-    if IS_WINDOWS:
-        start = None
-        if timeout is not None:
-            import time
-            start = time.time()
-        while True:
-            if msvcrt.kbhit():
-                ch = msvcrt.getch()
-                try:
-                    return ch.decode('utf-8').lower()
-                except Exception:
-                    continue
-            if timeout is not None and (time.time() - start) > timeout:
-                return None
-    else:
-        # Linux/RPi
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            if timeout is None:
-                timeout = 0.1
-            rlist, _, _ = select.select([fd], [], [], timeout)
-            if rlist:
-                ch = sys.stdin.read(1)
-                return ch.lower()
-            return None
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-            
+                journal.warning("Fichier son%s.mp3 non trouvé dans %s", i, sound_path)
+        except Exception as e:
+            journal.error("Erreur lors du chargement du son %s : %s", i, e)
+    return sons
+
+def attendre_jusqu_a(echeance, marge=MARGE_ATTENTE, interruption=None):
+    """
+    Attend jusqu'à un instant time.monotonic() donné.
+
+    time.sleep() seul peut se réveiller avec plusieurs millisecondes de retard :
+    il est utilisé jusqu'à marge secondes de l'échéance, puis l'attente se
+    termine activement, en rendant le GIL à chaque tour (time.sleep(0)) pour
+    ne pas retarder les threads Socket.IO et de traitement des pas.
+
+    Args:
+        echeance (float): Instant monotone à atteindre
+        marge (float, optional): Durée finale attendue activement (en secondes)
+        interruption (Event, optional): Événement mettant fin à l'attente avant l'échéance
+
+    Returns:
+        bool: False si l'attente a été interrompue
+    """
+    reste = echeance - time.monotonic()
+    if reste > marge:
+        if interruption is None:
+            time.sleep(reste - marge)
+        elif interruption.wait(reste - marge):
+            return False
+    while time.monotonic() < echeance:
+        time.sleep(0)
+    return True
+
 class Son:
     """
     Gestionnaire audio pour le jeu Simon.
@@ -148,7 +143,9 @@ class Son:
     et gestion des différents niveaux de difficulté.
     """
 
-    def __init__(self, broker="10.0.200.7", port=1883, topic="Tapis/sequence", mqtt_client=None):
+    def __init__(self, broker="10.0.200.7", port=1883, topic="Tapis/sequence", mqtt_client=None,
+                 demarrer_worker=True, gestionnaire_mqtt=None, difficulty_topic="site/difficulte",
+                 sons=None, mesures=None, differer_audio=False, canal=None):
         """
         Initialise le gestionnaire audio.
 
@@ -156,176 +153,384 @@ class Son:
             broker (str): Adresse IP du broker MQTT. Défaut: "10.0.200.7"
             port (int): Port du broker MQTT. Défaut: 1883
             topic (str): Topic MQTT principal. Défaut: "Tapis/sequence"
-            mqtt_client: Instance du client MQTT existant ou None
-        """
-        # Initialiser pygame.mixer pour l'audio
-        pygame.mixer.init()
-        pygame.mixer.set_num_channels(16)        
-        # Ajouter une queue pour les sons à jouer
-        self.sound_queue = Queue()       
+            mqtt_client: Instance du client MQTT existant ou None. Un client fourni
+                         est déjà connecté, sa boucle réseau est gérée par son propriétaire
+                         qui route lui-même les messages vers on_message_sequence() et
+                         on_message_difficulte().
+            demarrer_worker (bool): Si False, aucun thread de lecture n'est lancé et
+                                    la queue doit être consommée par l'appelant. Défaut: True
+            gestionnaire_mqtt (GestionnaireMQTT): Connexion partagée sur laquelle enregistrer
+                                                  les abonnements. Défaut: la connexion partagée
+                                                  du processus pour broker:port
+            difficulty_topic (str): Topic MQTT de la difficulté. Défaut: "site/difficulte"
+            sons (dict): Sons déjà chargés par charger_sons(), partagés avec d'autres
+                         instances (le mixer n'est alors pas fermé par stop()). Défaut: None
+            mesures (Instrumentation): Registre recevant la gigue de déclenchement des notes.
+                                       Défaut: None
+            differer_audio (bool): Si True, pygame.mixer n'est initialisé et les sons
+                                   chargés qu'à la lecture de la première séquence. Défaut: False
+            canal (pygame.mixer.Channel): Canal du mixer réservé à cette instance ; ses
+                                          sons n'interrompent alors que ce canal. Défaut: None
+                                          (tout le mixer)
+        """
+        # File des sons à jouer, par priorité (voir file_sons.py)
+        self.sound_queue = FileSons()
         # Configuration MQTT
         self.topic = topic
-        self.difficulty_topic = "site/difficulte"  # Définir explicitement
+        self.difficulty_topic = difficulty_topic
+        self.client_partage = mqtt_client is not None
+        self.gestionnaire_mqtt = None
         if mqtt_client:
             self.client = mqtt_client
         else:
-            self.client = mqtt.Client()
-            self.client.on_connect = self.on_connect
-            self.client.on_message = self.on_message
-        # Obtenir le chemin du dossier courant
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Chemin du dossier des sons
-        sounds_dir = os.path.join(current_dir, "son")       
-        # Dictionnaire pour stocker les sons préchargés
-        self.sounds = {}        
-        # Charger tous les sons au démarrage
-        for i in range(0, 6):
-            try:
-                sound_path = os.path.join(sounds_dir, f"son{i}.mp3")
-                if os.path.exists(sound_path):
-                    self.sounds[i] = pygame.mixer.Sound(sound_path)
-                    print(f"Son {i} chargé avec succès")
-                else:
-                    print(f"Attention: Fichier son{i}.mp3 non trouvé dans {sound_path}")
-            except Exception as e:
-                print(f"Erreur lors du chargement du son {i}: {e}")        
+            if gestionnaire_mqtt:
+                self.gestionnaire_mqtt = gestionnaire_mqtt.prendre()
+            else:
+                self.gestionnaire_mqtt = GestionnaireMQTT.obtenir(broker, port)
+            self.client = self.gestionnaire_mqtt.client
+        # Sons préchargés, éventuellement partagés avec d'autres instances
+        self.sons_partages = sons is not None
+        self.sounds = sons
+        self.canal = canal
+        self.audio_pret = False
+        self._verrou_audio = Lock()
+        # Charges remises directement par le jeu du processus, dont l'écho du broker est ignoré
+        self.delai_echo = 5.0
+        self._echos_attendus = deque()
+        self._verrou_echos = Lock()
+        # Lecture des séquences en un seul buffer, activée par activer_rendu()
+        self.rendu = None
+        self._parametres_rendu = None
+        if not differer_audio:
+            self.initialiser_audio()
         # Variables pour la difficulté
         self.difficulty_level = 0  # 0=normal, 1=progressive, 2=accelerating
         self.base_display_time = 2  # Temps d'affichage de base (en secondes)        
-        # Connexion au broker MQTT
-        try:
-            self.client.connect(broker, port, 60)
-            print(f"Connexion réussie au broker MQTT: {broker}:{port}")
-            self.client.loop_start()
-        except Exception as e:
-            print(f"Erreur de connexion au broker MQTT: {e}")
-        # Démarrer le thread MQTT
-        self.client.loop_start()       
+        self.mesures = mesures
+        # Abonnements sur la connexion partagée (aucune connexion propre)
+        if self.gestionnaire_mqtt:
+            self.gestionnaire_mqtt.abonner(self.topic, self.on_message_sequence)
+            self.gestionnaire_mqtt.abonner(self.difficulty_topic, self.on_message_difficulte)
+            self.gestionnaire_mqtt.demarrer()
         # Démarrer le thread de lecture des sons
         self.running = True
-        self.sound_thread = Thread(target=self._sound_worker, daemon=True)
-        self.sound_thread.start()
+        self.sound_thread = None
+        if demarrer_worker:
+            self.sound_thread = Thread(target=self._sound_worker, daemon=True)
+            self.sound_thread.start()
+
+    def initialiser_audio(self):
+        """
+        Initialise pygame.mixer et charge les sons, une seule fois.
+        """
+        if self.audio_pret:
+            return
+        with self._verrou_audio:
+            if self.audio_pret:
+                return
+            with CHRONOMETRE.mesurer("initialisation audio"):
+                pygame.mixer.init()
+                pygame.mixer.set_num_channels(16)
+                if self.sounds is None:
+                    self.sounds = charger_sons()
+            self.audio_pret = True
+
+    def _arreter_sons(self):
+        """
+        Arrête les sons en cours de cette instance (son canal, ou tout le mixer).
+        """
+        if self.canal is not None:
+            self.canal.stop()
+        else:
+            pygame.mixer.stop()
+
+    def _declencher(self, son):
+        """
+        Déclenche un son sur le canal de cette instance, ou sur un canal libre du mixer.
+
+        Args:
+            son (pygame.mixer.Sound): Son à jouer
+        """
+        if self.canal is not None:
+            self.canal.play(son)
+        else:
+            son.play()
 
     def _sound_worker(self):
         """
         Thread worker pour jouer les sons de manière asynchrone.
         
-        Boucle continue qui récupère les séquences de sons depuis la queue
-        et les joue via _play_sounds().
+        Boucle continue qui attend la séquence la plus urgente de la file
+        et la joue via _play_sounds(), jusqu'à la fermeture de la file.
         """
         while self.running:
+            element = self.sound_queue.prendre()
+            if element is None:
+                return
             try:
-                sequence = self.sound_queue.get(timeout=0.1)
-                self._play_sounds(sequence)
-            except Empty:
-                continue
+                self._play_sounds(element[1])
             except Exception as e:
-                print(f"Erreur dans le worker de son: {e}")
+                journal.error("Erreur dans le worker de son : %s", e)
+            finally:
+                self.sound_queue.terminer()
+
+    def delai_note(self, idx):
+        """
+        Calcule la durée d'affichage d'une note selon sa position et la difficulté.
+
+        Args:
+            idx (int): Position de la note dans la séquence
+
+        Returns:
+            float: Délai en secondes avant la note suivante
+        """
+        if self.difficulty_level == 1:  # Mode progressif
+            sequence_multiple = idx // 5
+            animation_speed_factor = 1.0 / (1 + (sequence_multiple * 0.2))  # Réduction de 20% tous les 5 sons
+            return self.base_display_time * animation_speed_factor
+        elif self.difficulty_level == 2:  # Mode accéléré
+            animation_speed_factor = 1.0 / (1 + (idx * 0.1))  # Réduction de 10% à chaque son
+            return self.base_display_time * animation_speed_factor
+        return self.base_display_time
+
+    def echeances_notes(self, sequence, debut):
+        """
+        Calcule d'avance l'instant de déclenchement de chaque note.
+
+        Les échéances sont absolues : le retard pris sur une note n'est pas
+        reporté sur les suivantes. Un son absent de la bibliothèque n'occupe
+        aucune durée.
+
+        Args:
+            sequence (list): Liste des numéros de sons
+            debut (float): Instant time.monotonic() de la première note
+
+        Returns:
+            list: Échéances des notes, suivies de l'instant de fin de la séquence
+        """
+        echeances = [debut]
+        for idx, number in enumerate(sequence):
+            duree = self.delai_note(idx) if number in self.sounds else 0.0
+            echeances.append(echeances[-1] + duree)
+        return echeances
 
     def _play_sounds(self, sequence):
         """
         Joue une séquence de sons avec timing adapté à la difficulté.
 
+        Chaque note est déclenchée à son échéance précalculée (voir echeances_notes) ;
+        l'écart mesuré entre l'échéance et le déclenchement est enregistré dans
+        l'étape "gigue_note" des mesures. La lecture s'arrête dès qu'un son plus
+        urgent est déposé dans la file (voir file_sons.py).
+
         Args:
             sequence (list): Liste des numéros de sons à jouer
-        """
-        current_display_time = self.base_display_time
+
+        Returns:
+            list: Gigue mesurée de chaque note jouée (en secondes)
+        """
+        self.initialiser_audio()
+        if self._parametres_rendu is not None:
+            return self._jouer_rendu(sequence)
+        echeances = self.echeances_notes(sequence, time.monotonic())
+        gigues = []
+        detail = journal.isEnabledFor(logging.DEBUG)
         for idx, number in enumerate(sequence):
-            if number in self.sounds:
-                try:
-                    # Ajuster le délai en fonction de la difficulté
-                    if self.difficulty_level == 1:  # Mode progressif
-                        sequence_multiple = idx // 5
-                        animation_speed_factor = 1.0 / (1 + (sequence_multiple * 0.2))  # Réduction de 20% tous les 5 sons
-                        current_display_time = self.base_display_time * animation_speed_factor
-                    elif self.difficulty_level == 2:  # Mode accéléré
-                        animation_speed_factor = 1.0 / (1 + (idx * 0.1))  # Réduction de 10% à chaque son
-                        current_display_time = self.base_display_time * animation_speed_factor
-                    print(f"Lecture du son {number} avec un délai de {current_display_time:.2f} secondes")
-                    pygame.mixer.stop()
-                    self.sounds[number].play()
-                    time.sleep(current_display_time)
-                except Exception as e:
-                    print(f"Erreur lors de la lecture du son {number}: {e}")
-            else:
-                print(f"Son {number} non trouvé dans la bibliothèque")
+            if number not in self.sounds:
+                journal.warning("Son %s non trouvé dans la bibliothèque", number)
+                continue
+            try:
+                if not attendre_jusqu_a(echeances[idx], interruption=self.sound_queue.interruption):
+                    journal.debug("Séquence %s interrompue", sequence)
+                    return gigues
+                self._arreter_sons()
+                self._declencher(self.sounds[number])
+                gigue = time.monotonic() - echeances[idx]
+                gigues.append(gigue)
+                if self.mesures is not None:
+                    self.mesures.observer("gigue_note", gigue)
+                if detail:
+                    journal.debug("Lecture du son %s avec un délai de %.2f secondes (gigue %.2f ms)",
+                                  number, self.delai_note(idx), gigue * 1000)
+            except Exception as e:
+                journal.error("Erreur lors de la lecture du son %s : %s", number, e)
+        if not attendre_jusqu_a(echeances[-1], interruption=self.sound_queue.interruption):
+            journal.debug("Séquence %s interrompue", sequence)
+            return gigues
+        if gigues and detail:
+            journal.debug("Séquence jouée : gigue max %.2f ms sur %d notes", max(gigues) * 1000, len(gigues))
+        return gigues
+
+    def activer_rendu(self, taille_max_octets=64 * 1024 * 1024):
+        """
+        Joue désormais chaque séquence en un seul buffer pré-rendu (voir rendu_sons.py).
 
-    def play_sequence(self, sequence):
+        Args:
+            taille_max_octets (int, optional): Taille maximale du cache des buffers. Défaut: 64 Mio
+
+        Returns:
+            bool: False si numpy est absent (la lecture note par note est conservée)
+        """
+        try:
+            from rendu_sons import RenduSequence
+        except ImportError as e:
+            journal.warning("Rendu des séquences indisponible (%s), lecture note par note conservée", e)
+            return False
+        self._parametres_rendu = (RenduSequence, taille_max_octets)
+        return True
+
+    def _jouer_rendu(self, sequence):
         """
-        Ajoute une séquence de sons à la queue de lecture.
+        Joue une séquence pré-rendue par un seul appel au mixer.
+
+        Args:
+            sequence (list): Liste des numéros de sons à jouer
+
+        Returns:
+            list: Gigue du déclenchement de la séquence (en secondes), vide si rien n'est joué
+        """
+        if self.rendu is None:
+            classe, taille_max_octets = self._parametres_rendu
+            self.rendu = classe(self.sounds, self.delai_note, taille_max_octets)
+        echeance = time.monotonic()
+        son, duree = self.rendu.creer_son(sequence, (self.difficulty_level, self.base_display_time))
+        if son is None:
+            journal.warning("Aucun son de la séquence %s trouvé dans la bibliothèque", sequence)
+            return []
+        self._arreter_sons()
+        self._declencher(son)
+        debut = time.monotonic()
+        gigue = debut - echeance
+        if self.mesures is not None:
+            self.mesures.observer("gigue_note", gigue)
+        journal.debug("Lecture de la séquence %s en un seul buffer (%.2f s, rendu et déclenchement en %.2f s)",
+                      sequence, duree, gigue)
+        if not attendre_jusqu_a(debut + duree, interruption=self.sound_queue.interruption):
+            self._arreter_sons()
+            journal.debug("Séquence %s interrompue", sequence)
+        return [gigue]
+
+    def play_sequence(self, sequence, priorite=PRIORITE_SEQUENCE):
+        """
+        Ajoute une séquence de sons à la file de lecture.
 
         Args:
             sequence (list): Séquence de numéros de sons à jouer
+            priorite (int, optional): PRIORITE_ALERTE (erreur), PRIORITE_RETOUR (retour d'un pas)
+                                      ou PRIORITE_SEQUENCE. Défaut: PRIORITE_SEQUENCE
         """
-        self.sound_queue.put(sequence)
+        self.sound_queue.deposer(sequence, priorite)
+
+    def _mettre_en_file(self, chiffres, pas):
+        """
+        Met en file les sons d'un message du topic de séquence.
+
+        Args:
+            chiffres (list): Codes couleur du message
+            pas (bool): True pour une séquence complète, encadrée par le son de fin 5
+        """
+        # Copie : le contenu analysé d'un message est partagé entre ses callbacks
+        sequence = list(chiffres)
+        if pas:
+            sequence.insert(0, 5)
+            sequence.append(5)
+            priorite = PRIORITE_SEQUENCE
+        else:
+            priorite = PRIORITE_ALERTE if sequence == [CODE_ERREUR] else PRIORITE_RETOUR
+        self.play_sequence(sequence, priorite)
+
+    def jouer_local(self, charge, chiffres, pas):
+        """
+        Met en file un message publié par le jeu du même processus, sans attendre le broker.
+
+        L'écho de la même charge reçu ensuite du broker est ignoré par
+        on_message_sequence(), s'il arrive dans les delai_echo secondes.
+
+        Args:
+            charge (bytes): Charge publiée sur le topic de séquence
+            chiffres (list): Codes couleur déjà calculés par le jeu
+            pas (bool): Valeur du champ "pas" de la charge
+        """
+        with self._verrou_echos:
+            self._echos_attendus.append((time.monotonic() + self.delai_echo, bytes(charge)))
+        self._mettre_en_file(chiffres, pas)
+
+    def _est_echo(self, charge):
+        """Retire et signale l'écho attendu d'une charge remise par jouer_local()."""
+        maintenant = time.monotonic()
+        with self._verrou_echos:
+            while self._echos_attendus and self._echos_attendus[0][0] < maintenant:
+                self._echos_attendus.popleft()
+            for i, (_, attendue) in enumerate(self._echos_attendus):
+                if attendue == charge:
+                    del self._echos_attendus[i]
+                    return True
+        return False
 
-    def on_message(self, client, userdata, msg):
+    def on_message_sequence(self, client, userdata, msg):
         """
-        Callback MQTT appelé lors de la réception d'un message.
+        Callback MQTT des messages de séquence : met les sons correspondants en file.
+
+        Les échos des messages déjà remis par jouer_local() sont ignorés.
 
         Args:
             client: Instance du client MQTT
             userdata: Données utilisateur associées au client
-            msg: Message MQTT reçu
+            msg (MessageMQTT): Message reçu, décodé à la demande
         """
         try:
-            payload = msg.payload.decode()
-            print(f"Message reçu sur le topic {msg.topic}: {payload}")
-            data = json.loads(payload)
-            
-            if msg.topic == self.difficulty_topic:
-                # Gestion des messages de difficulté
-                if "dif" in data:
-                    new_difficulty = data["dif"]
-                    if 0 <= new_difficulty <= 2:
-                        self.difficulty_level = new_difficulty
-                        print(f"Niveau de difficulté mis à jour: {self.difficulty_level}")
-                    else:
-                        print("Valeur de difficulté invalide")
-            elif msg.topic == self.topic:
-                # Gestion des messages de séquence
-                if "couleur" in data and "pas" in data:
-                    sequence = data["couleur"]
-                    if data["pas"]:
-                        sequence.insert(0, 5)
-                        sequence.append(5)
-                    self.play_sequence(sequence)
-                else:
-                    print("Format du message incorrect")
+            if self._echos_attendus and self._est_echo(msg.payload):
+                return
+            journal.debug("Message reçu sur le topic %s : %s", msg.topic, TexteDiffere(msg.payload))
+            data = msg.json
+            if "couleur" in data and "pas" in data:
+                self._mettre_en_file(data["couleur"], data["pas"])
+            else:
+                journal.warning("Format du message incorrect : %s", TexteDiffere(msg.payload))
         except Exception as e:
-            print(f"Erreur lors du traitement du message: {e}")
+            journal.error("Erreur lors du traitement du message : %s", e)
 
-    def on_connect(self, client, userdata, flags, rc):
+    def on_message_difficulte(self, client, userdata, msg):
         """
-        Callback MQTT appelé lors de la connexion au broker.
+        Callback MQTT des messages de difficulté : ajuste le rythme de lecture.
 
         Args:
             client: Instance du client MQTT
             userdata: Données utilisateur associées au client
-            flags: Dictionnaire des flags de connexion
-            rc (int): Code de retour de connexion
+            msg (MessageMQTT): Message reçu, décodé à la demande
         """
-        if rc == 0:
-            print(f"Connecté aux topics: {self.topic}, {self.difficulty_topic}")
-            client.subscribe(self.topic)
-            client.subscribe(self.difficulty_topic)
-        else:
-            print(f"Échec de connexion, code retour = {rc}")
+        try:
+            journal.debug("Message reçu sur le topic %s : %s", msg.topic, TexteDiffere(msg.payload))
+            data = msg.json
+            if "dif" in data:
+                new_difficulty = data["dif"]
+                if 0 <= new_difficulty <= 2:
+                    self.difficulty_level = new_difficulty
+                    journal.info("Niveau de difficulté des sons mis à jour : %s", self.difficulty_level)
+                else:
+                    journal.warning("Valeur de difficulté invalide : %s", new_difficulty)
+        except Exception as e:
+            journal.error("Erreur lors du traitement du message : %s", e)
 
     def stop(self):
         """
         Arrête proprement le gestionnaire audio.
         
-        Ferme les threads, arrête pygame.mixer et déconnecte le client MQTT.
+        Ferme les threads, arrête pygame.mixer et rend la connexion MQTT partagée.
         """
         self.running = False
-        if self.sound_thread.is_alive():
+        self.sound_queue.fermer()
+        if self.sound_thread and self.sound_thread.is_alive():
             self.sound_thread.join(timeout=1)
-        pygame.mixer.stop()
-        pygame.mixer.quit()
-        self.client.loop_stop()
-        self.client.disconnect()
-        print("Déconnexion du broker MQTT")
+        if self.audio_pret:
+            self._arreter_sons()
+            if not self.sons_partages:
+                pygame.mixer.quit()
+        if self.gestionnaire_mqtt:
+            self.gestionnaire_mqtt.desabonner(self.topic, self.on_message_sequence)
+            self.gestionnaire_mqtt.desabonner(self.difficulty_topic, self.on_message_difficulte)
+            self.gestionnaire_mqtt.liberer()
+            self.gestionnaire_mqtt = None
 
 
 class JeuSimon:
@@ -337,25 +542,131 @@ class JeuSimon:
     modes de jeu (normal avec tapis, test avec clavier).
     """
 
-    def __init__(self, mode_test=False):
+    # Surveillance des commandes clavier (désactivée pour les sessions multi-tapis)
+    moniteur_clavier = True
+
+    def __init__(self, mode_test=False, sensfloor_url=None, mqtt_broker=None, mqtt_port=None,
+                 demarrage_differe=False):
         """
         Initialise une nouvelle instance du jeu Simon.
 
         Args:
             mode_test (bool): Si True, active le mode test avec saisie clavier.
                              Si False, utilise le SensFloor. Défaut: False
+            sensfloor_url (str): URL du serveur SensFloor. Défaut: 'http://192.168.5.5:8000'
+            mqtt_broker (str): Adresse du broker MQTT. Défaut: "10.0.200.7"
+            mqtt_port (int): Port du broker MQTT. Défaut: 1883
+            demarrage_differe (bool): Si True, l'audio n'est initialisé qu'à la première
+                                      séquence et le client Socket.IO n'est créé qu'au
+                                      premier démarrage en mode normal : le jeu attend
+                                      site/start dès la connexion MQTT établie. Défaut: False
+        """
+        self._init_parametres(mode_test)
+        self.demarrage_differe = demarrage_differe
+        if sensfloor_url:
+            self.sensfloor_url = sensfloor_url
+        if mqtt_broker:
+            self.mqtt_broker = mqtt_broker
+        if mqtt_port:
+            self.mqtt_port = mqtt_port
+        # Connexion MQTT partagée du processus (voir connexion_mqtt.py) :
+        # le jeu et le gestionnaire audio y enregistrent leurs abonnements
+        # Création de l'état du jeu
+        self.etat = EtatJeu()
+        with CHRONOMETRE.mesurer("connexion MQTT"):
+            self.mqtt = GestionnaireMQTT.obtenir(self.mqtt_broker, self.mqtt_port)
+            self.mqtt_client = self.mqtt.client
+            self.mqtt.abonner(self.start_topic, self.on_message_start)
+            # Traitement de la difficulté (analyse, confirmation, affichage) hors du thread réseau
+            self.mqtt.abonner(self.difficulty_topic, self.on_message_difficulte, lent=True)
+            self.mqtt.abonner(self.led_status_topic, self.on_message_led_status)
+            self.mqtt.demarrer()
+        self.publieur = self._creer_publieur()
+        self.sound_manager = self._creer_son()
+        # Client socket pour la communication réseau, créé d'emblée sauf en démarrage différé
+        if not demarrage_differe:
+            self._creer_socket()
+        CHRONOMETRE.marquer("prêt pour site/start")
+        # Démarrage du thread de surveillance des commandes
+        self.running = True
+        self.command_thread = None
+        if self.moniteur_clavier:
+            self.command_thread = Thread(target=self.mode_switch_monitor, daemon=True)
+            self.command_thread.start()
+
+    def _creer_publieur(self):
+        """
+        Crée la publication sortante dans un thread dédié (voir publication.py).
+
+        Returns:
+            PublieurMQTT: Publieur propre à ce jeu
+        """
+        return PublieurMQTT(self.mqtt_client, mesures=self.mesures)
+
+    def _creer_son(self):
+        """
+        Crée le gestionnaire audio abonné aux topics de ce jeu sur la connexion partagée.
+
+        Returns:
+            Son: Gestionnaire audio
+        """
+        return Son(topic=self.mqtt_topic, difficulty_topic=self.difficulty_topic,
+                   gestionnaire_mqtt=self.mqtt, mesures=self.mesures,
+                   differer_audio=self.demarrage_differe)
+
+    def _creer_socket(self):
+        """
+        Crée le client Socket.IO du SensFloor et configure ses événements, une seule fois.
+
+        Returns:
+            socketio.Client: Client Socket.IO du jeu
+        """
+        if not hasattr(self, 'socket'):
+            with CHRONOMETRE.mesurer("client Socket.IO"):
+                self.socket = socketio.Client(
+                    reconnection_delay=1,
+                    reconnection=True,
+                    reconnection_attempts=5,
+                    reconnection_delay_max=5,
+                    logger=False,
+                    engineio_logger=False
+                )
+                # Configuration des événements socket
+                self._config_socket()
+        return self.socket
+
+    def _init_parametres(self, mode_test):
+        """
+        Initialise les paramètres de jeu indépendants du runtime (threads ou asyncio).
+
+        Args:
+            mode_test (bool): Si True, active le mode test avec saisie clavier
         """
         self.difficulty_topic = "site/difficulte"
         self.difficulty_timeout = 30  # 30 secondes pour choisir la difficulté
         self.difficulty_received = False
         self.waiting_for_difficulty = False
         self.last_difficulty_time = time.time()
+        self.instant_difficulte = None  # Instant monotone de réception de la difficulté
+        self.intervalle_rappel_difficulte = 5.0  # Période des rappels de sélection de la difficulté
+        self._difficulte_choisie = Event()
+        self._rappels_actifs = False
+        self._temporisation_rappel = None
         self.difficulty_map = {
             0: "facile",
             1: "moyen", 
             2: "difficile"
         }
-        self.dernier_pas = 0
+        self.intervalle_compte_a_rebours = 1.0  # Rafraîchissement de l'affichage du temps restant
+        self.delai_erreur = 1.0  # Délai avant le signal d'erreur (fin du retour du dernier pas)
+        # Acquittement de fin d'affichage de la séquence par les LEDs (topic LED/status)
+        self.marge_acquittement_led = 1.0  # Marge ajoutée à la durée d'affichage prévue
+        self._fin_affichage_led = Event()
+        self._affichage_led_commence = False
+        # Délais de la partie planifiés sur la minuterie partagée (voir minuterie.py),
+        # associés à l'Event réveillant le thread du jeu qui les attend
+        self._temporisations = {}
+        self._verrou_temporisations = Lock()
         self.config_difficulte = {
             "facile": {
                 "temps_attente": 100.0,     # 20 secondes par couleur (augmenté)
@@ -390,63 +701,57 @@ class JeuSimon:
             2: 'bleu',
             3: 'jaune'
         }
-        # Configuration MQTT
-        self.mqtt_client = mqtt.Client()
+        # Zones du tapis compilées en grille de correspondance
+        self.carte_zones = CarteZones.par_defaut()
+        # Anti-rebond par zone (durées de maintien en secondes)
+        self.anti_rebond = AntiRebond(
+            len(self.carte_zones.zones),
+            duree_entree=0.05,
+            duree_sortie=0.15
+        )
+        # Source des pas : "step" (événements SensFloor) ou "objects" (trames objects-update)
+        self.source_pas = "step"
+        self.instant_trame = 0.0  # Horodatage de la trame 'objects-update' en cours
+        self.suivi_occupation = None
+        if SuiviOccupation is not None:
+            self.suivi_occupation = SuiviOccupation(self.carte_zones, self.on_changement_zone)
+        # Paramètres MQTT
         self.mqtt_broker = "10.0.200.7"
         self.mqtt_port = 1883
         self.mqtt_topic = "Tapis/sequence"
+        self.score_topic = "Tapis/score"
         self.led_status_topic = "LED/status"
         self.start_topic = "site/start"  # Topic pour démarrer le jeu
-        self.game_started = False       
-        # Configure le callback pour la réception des messages
-        self.mqtt_client.on_message = self.on_mqtt_message
-        self.mqtt_client.subscribe([
-            (self.start_topic, 0),
-            (self.difficulty_topic, 0)
-        ])  # Nouveau callback pour les abonnements
-        self.mqtt_client.on_connect = self.on_connect
-        # Initialize MQTT connection
-        try:
-            self.mqtt_client.connect(self.mqtt_broker, self.mqtt_port)
-            self.mqtt_client.loop_start()
-        except Exception as e:
-            print(f"Erreur de connexion MQTT: {e}")
-        self.sound_manager = Son(mqtt_client=self.mqtt_client)
-        self.mqtt_client.subscribe([(self.led_status_topic, 0), (self.start_topic, 0)])
-        self.mqtt_client.loop_start()
-        # Création du client socket pour la communication réseau
-        self.socket = socketio.Client(
-            reconnection_delay=1,
-            reconnection=True,
-            reconnection_attempts=5,
-            reconnection_delay_max=5,
-            logger=False,
-            engineio_logger=False
-        )
-        # Création de l'état du jeu
-        self.etat = EtatJeu()       
-        # Configuration des événements socket
-        self._config_socket()
-        # Démarrage du thread de surveillance des commandes
-        self.running = True
-        self.command_thread = Thread(target=self.mode_switch_monitor, daemon=True)
-        self.command_thread.start()
-        self.sound_manager = Son()
-
-    def handle_difficulty_message(self, payload):
+        self.game_started = False
+        # Serveur SensFloor
+        self.sensfloor_url = 'http://192.168.5.5:8000'
+        self.sensfloor_transports = ['websocket']
+        # Journal des événements SensFloor (voir activer_enregistrement)
+        self.enregistreur = None
+        # Latences par étape du traitement d'un pas (voir activer_metriques)
+        self.mesures = Instrumentation()
+        self.serveur_metriques = None
+        self.publicateur_stats = None
+        self.stats_topic = "Tapis/stats"
+        self.encodeur_sequence = EncodeurSequence()
+        self.publieur_partage = False  # Publieur commun à plusieurs jeux (voir sessions.py)
+
+    def handle_difficulty_message(self, payload, data=None):
         """
         Traite les messages de difficulté reçus via MQTT.
 
         Args:
             payload (str): Message JSON contenant la difficulté au format {'dif': 0-2}
+            data (optional): Contenu déjà analysé de payload, s'il est disponible
         """
         try:
-            print(f"Reception difficulté: {payload}")
-            data = json.loads(payload)
+            journal.info("Réception difficulté : %s", payload)
+            if data is None:
+                data = json.loads(payload)
             
             # Vérifier si c'est un message de confirmation
             if "status" in data:
-                print("Message de confirmation reçu, ignoré")
+                journal.debug("Message de confirmation reçu, ignoré")
                 return
                 
             if not isinstance(data, dict) or 'dif' not in data:
@@ -459,9 +764,11 @@ class JeuSimon:
             if not isinstance(dif_value, int) or dif_value not in [0, 1, 2]:
                 raise ValueError("La valeur doit être 0, 1 ou 2")                
             self.difficulte = self.difficulty_map[dif_value]
+            self.instant_difficulte = time.monotonic()
             self.difficulty_received = True
             self.waiting_for_difficulty = False   
-            print(f"Difficulté appliquée: {self.difficulte}")
+            self._difficulte_choisie.set()
+            journal.info("Difficulté appliquée : %s", self.difficulte)
             self.afficher_parametres_difficulte()            
             # Confirmation MQTT
             confirmation = {
@@ -470,7 +777,7 @@ class JeuSimon:
                 "applied_difficulty": self.difficulte,
                 "timestamp": datetime.now().isoformat()
             }
-            self.mqtt_client.publish(self.difficulty_topic, json.dumps(confirmation))           
+            self.publieur.publier(self.difficulty_topic, json.dumps(confirmation))           
         except Exception as e:
             error_msg = {
                 "status": "error",
@@ -478,8 +785,8 @@ class JeuSimon:
                 "expected_format": {"dif": "0-2"},
                 "timestamp": datetime.now().isoformat()
             }
-            self.mqtt_client.publish(self.difficulty_topic, json.dumps(error_msg))
-            print(f"Erreur traitement difficulté: {e}")
+            self.publieur.publier(self.difficulty_topic, json.dumps(error_msg))
+            journal.warning("Erreur traitement difficulté : %s", e)
 
     def afficher_parametres_difficulte(self):
         """
@@ -510,9 +817,9 @@ class JeuSimon:
                 (self.mqtt_topic, 0)
             ]
             client.subscribe(topics)
-            print(f"Abonné aux topics: {[topic for topic, qos in topics]}")
+            journal.info("Abonné aux topics : %s", [topic for topic, qos in topics])
         else:
-            print(f"Échec de connexion MQTT, code={rc}")
+            journal.error("Échec de connexion MQTT, code=%s", rc)
 
     def on_subscribe(self, client, userdata, mid, granted_qos):
         """
@@ -524,32 +831,39 @@ class JeuSimon:
             mid: Identifiant du message d'abonnement
             granted_qos (list): Liste des niveaux QoS accordés
         """
-        print(f"Successfully subscribed to topics with QoS: {granted_qos}")
+        journal.debug("Abonnement accepté avec les QoS : %s", granted_qos)
 
     def mode_switch_monitor(self):
         """
         Thread de surveillance pour le changement de mode et l'arrêt du jeu.
         
         Permet de basculer entre mode test/normal et de quitter proprement.
+        Les touches sont lues sur le clavier partagé (voir clavier.py) en dehors
+        des saisies du jeu, qui leur sont réservées.
         """
+        clavier = LecteurClavier.obtenir()
+        invite = True
         while self.running:
             try:
-                if not hasattr(self, 'in_test_sequence') or not self.in_test_sequence:
+                if invite:
                     if self.mode_test:
-                        command = input("\nEnter 'm' to switch to normal mode, 'q' to quit: ").lower()
-                        if command == 'm':
-                            self.switch_mode()
-                        elif command == 'q':
-                            self.running = False
-                            sys.exit(0)
+                        print("\nEnter 'm' to switch to normal mode, 'q' to quit: ", end='', flush=True)
                     else:
-                        command = input("\nEnter 'q' to quit: ").lower()
-                        if command == 'q':
-                            self.running = False
-                            sys.exit(0)
-                time.sleep(0.1)
+                        print("\nEnter 'q' to quit: ", end='', flush=True)
+                    invite = False
+                command = clavier.lire(timeout=0.5, commande=True)
+                if command is None:
+                    continue
+                if command == 'm' and self.mode_test:
+                    print(command)
+                    self.switch_mode()
+                    invite = True
+                elif command == 'q':
+                    print(command)
+                    self.running = False
+                    sys.exit(0)
             except Exception as e:
-                print(f"Command error: {e}")
+                journal.error("Erreur de la surveillance des commandes : %s", e)
                 break
 
     def switch_mode(self):
@@ -565,15 +879,15 @@ class JeuSimon:
             print("Switched to TEST mode")
         else:
             try:
-                self.socket.connect(
-                    'http://192.168.5.5:8000',
-                    transports=['websocket'],
+                self._creer_socket().connect(
+                    self.sensfloor_url,
+                    transports=self.sensfloor_transports,
                     wait=True,
                     wait_timeout=10
                 )
                 print("Switched to NORMAL mode")
             except Exception as e:
-                print(f"Failed to connect to server: {e}")
+                journal.error("Connexion au SensFloor impossible : %s", e)
                 print("Falling back to TEST mode")
                 self.mode_test = True
                 self.current_mode = "test"
@@ -592,22 +906,22 @@ class JeuSimon:
         self.etat.preparer_tour()
         derniere_couleur = None
         sequence_joueur = []    
+        clavier = LecteurClavier.obtenir()
         while self.etat.position < len(self.etat.sequence):
             try:
                 print(f"\nEntrez la couleur {self.etat.position + 1}/{len(self.etat.sequence)}")
                 print("(0:vert, 1:rouge, 2:bleu, 3:jaune, q:quit)")
                 print("> ", end='', flush=True)  # Affiche le prompt sans nouvelle ligne
-                # Démarre le chrono après avoir affiché le prompt
-                start_time = time.time()
-                choix = input().lower()  # Enlève le prompt ">" de input()
-                elapsed_time = time.time() - start_time
+                # Le délai de réponse court à partir de l'affichage du prompt
+                with clavier.saisie():
+                    choix = clavier.lire(timeout=config['temps_attente'])
+                if choix is None:
+                    print(f"\nTemps écoulé ! Vous avez dépassé {config['temps_attente']} secondes.")
+                    return False
+                print(choix)
                 if choix == 'q':
                     raise Exception("Test mode terminated")
                 if choix in ['0', '1', '2', '3']:
-                    # Vérifie le temps APRÈS avoir reçu une réponse valide
-                    if elapsed_time > config['temps_attente']:
-                        print(f"\nTemps écoulé ! Vous avez dépassé {config['temps_attente']} secondes.")
-                        return False  
                     couleur = self.chiffre_vers_couleur[int(choix)]                   
                     if couleur == derniere_couleur:
                         print("Même couleur que la précédente, ignorée")
@@ -616,19 +930,15 @@ class JeuSimon:
                     sequence_joueur.append(couleur)
                     self.etat.ajouter_couleur(couleur)
                     print(f"Couleur ajoutée : {couleur}")                   
-                    message = {
-                        "couleur": [self.couleur_vers_chiffre[couleur]],
-                        "pas": False
-                    }
-                    self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-                    print(f"MQTT >>> [Tapis/sequence] Mode test - Couleur jouée : {json.dumps(message)}")                   
+                    charge = self.publier_couleur(self.couleur_vers_chiffre[couleur])
+                    journal.debug("MQTT >>> [%s] Mode test - Couleur jouée : %s", self.mqtt_topic, TexteDiffere(charge))
                     if couleur != self.etat.sequence[self.etat.position - 1]:
                         print(f"\nErreur! Couleur attendue : {self.etat.sequence[self.etat.position - 1]}")
                         return False                        
                 else:
                     print("Entrée invalide. Utilisez 0-3 ou q pour quitter")                    
             except Exception as e:
-                print(f"Erreur mode test : {e}")
+                journal.error("Erreur mode test : %s", e)
                 return False
         if sequence_joueur == self.etat.sequence:
             print("\nBravo! Séquence complétée avec succès!")
@@ -647,46 +957,154 @@ class JeuSimon:
         """
         return [self.couleur_vers_chiffre[couleur] for couleur in sequence]
 
-    def on_mqtt_message(self, client, userdata, message):
+    def on_message_start(self, client, userdata, message):
+        """
+        Callback MQTT du topic de démarrage : lance une partie sur "true".
+
+        Args:
+            client: Instance du client MQTT
+            userdata: Données utilisateur associées au client
+            message (MessageMQTT): Message reçu, décodé à la demande
+        """
+        if message.texte.lower() != "true":
+            return
+        if self.game_started:
+            journal.info("Une partie est déjà en cours")
+            return
+        journal.info("Démarrage d'une nouvelle partie")
+        self.game_started = True
+        self.waiting_for_difficulty = True
+        self.last_difficulty_time = time.time()
+        # Réinitialiser l'état du jeu
+        self.etat.reinitialiser()
+        self._lancer_partie()
+
+    def _lancer_partie(self):
         """
-        Gestionnaire principal des messages MQTT reçus.
+        Exécute demarrer() dans un thread dédié.
+        """
+        game_thread = Thread(target=self.demarrer, daemon=True)
+        game_thread.start()
+
+    def on_message_difficulte(self, client, userdata, message):
+        """
+        Callback MQTT du topic de difficulté.
 
         Args:
             client: Instance du client MQTT
             userdata: Données utilisateur associées au client
-            message: Message MQTT reçu
+            message (MessageMQTT): Message reçu, décodé à la demande
         """
         try:
-            topic = message.topic
-            payload = message.payload.decode()
-            
-            if topic == self.difficulty_topic:
-                self.handle_difficulty_message(payload)
-            elif topic == self.start_topic:
-                if payload.lower() == "true":
-                    if not self.game_started:
-                        print("Démarrage d'une nouvelle partie...")
-                        self.game_started = True
-                        self.waiting_for_difficulty = True
-                        self.last_difficulty_time = time.time()
-                        # Réinitialiser l'état du jeu
-                        self.etat.reinitialiser()
-                        game_thread = Thread(target=self.demarrer, daemon=True)
-                        game_thread.start()
-                    else:
-                        print("Une partie est déjà en cours")
-                
-        except Exception as e:
-            print(f"Error processing MQTT message: {e}")
+            data = message.json
+        except ValueError:
+            data = None  # Signalé par handle_difficulty_message
+        self.handle_difficulty_message(message.texte, data)
+
+    def on_message_led_status(self, client, userdata, message):
+        """
+        Callback MQTT du topic LED/status : détecte la fin de l'affichage d'une séquence.
+
+        Le firmware publie "true" au début de son animation et "false" à la fin
+        (ainsi qu'un "false" isolé à la réception d'une séquence, ignoré ici) :
+        seul un "false" suivant un "true" signale la fin de l'affichage.
+
+        Args:
+            client: Instance du client MQTT
+            userdata: Données utilisateur associées au client
+            message (MessageMQTT): Message reçu, décodé à la demande
+        """
+        statut = message.payload.strip().lower()
+        if statut == b"true":
+            self._affichage_led_commence = True
+        elif statut == b"false" and self._affichage_led_commence:
+            self._affichage_led_commence = False
+            self._fin_affichage_led.set()
+
+    def duree_affichage_sequence(self, longueur):
+        """
+        Estime la durée d'affichage d'une séquence par les LEDs.
+
+        Les LEDs suivent la même courbe de temps que les sons (Son.delai_note),
+        séparateurs blancs de début et de fin compris.
+
+        Args:
+            longueur (int): Nombre de couleurs de la séquence
+
+        Returns:
+            float: Durée estimée (en secondes)
+        """
+        return sum(self.sound_manager.delai_note(idx) for idx in range(longueur + 2))
 
     def reset_game(self):
         """
         Réinitialise complètement l'état du jeu pour une nouvelle partie.
         """
+        self.annuler_temporisations()
         self.game_started = False
         self.waiting_for_difficulty = False
         self.etat.reinitialiser()
 
+    def _planifier(self, delai, action, *args, reveil=None):
+        """
+        Planifie une étape de la partie sur la minuterie partagée.
+
+        Args:
+            delai (float): Délai (en secondes)
+            action (callable): Fonction appelée sur le thread de la minuterie
+            *args: Arguments de l'action
+            reveil (Event, optional): Event signalé si la temporisation est annulée
+
+        Returns:
+            Temporisation: Étape planifiée, annulée par annuler_temporisations()
+        """
+        def executer():
+            with self._verrou_temporisations:
+                self._temporisations.pop(temporisation, None)
+            action(*args)
+
+        with self._verrou_temporisations:
+            temporisation = Minuterie.obtenir().planifier(delai, executer)
+            self._temporisations[temporisation] = reveil
+        return temporisation
+
+    def _attendre(self, delai, fin=None):
+        """
+        Attend un délai de la partie sans dormir : le thread est réveillé par la
+        minuterie à l'échéance, par le signalement de fin, ou aussitôt par
+        annuler_temporisations().
+
+        Args:
+            delai (float): Délai (en secondes)
+            fin (Event, optional): Événement terminant l'attente avant l'échéance
+
+        Returns:
+            bool: True si le délai s'est écoulé ou si fin a été signalé, False
+                  si l'attente a été annulée
+        """
+        fin = fin if fin is not None else Event()
+        temporisation = self._planifier(delai, fin.set, reveil=fin)
+        fin.wait()
+        if temporisation.annulee:
+            return False
+        # Fin signalée avant l'échéance : retirer la temporisation devenue inutile
+        with self._verrou_temporisations:
+            self._temporisations.pop(temporisation, None)
+        temporisation.annuler()
+        return True
+
+    def annuler_temporisations(self):
+        """
+        Annule les étapes planifiées de la partie et réveille les attentes en cours.
+        """
+        with self._verrou_temporisations:
+            temporisations = list(self._temporisations.items())
+            self._temporisations.clear()
+        for temporisation, reveil in temporisations:
+            temporisation.annuler()
+            if reveil is not None:
+                reveil.set()
+
     def publier_sequence_mqtt(self, sequence, tmp, index, type_sequence="generated"):
         """
         Publie une séquence sur le topic MQTT après conversion en chiffres.
@@ -699,24 +1117,58 @@ class JeuSimon:
         """
         try:
             if tmp == 3:
-                error_message = {"couleur": [4], "pas": False}
-                self.mqtt_client.publish(self.mqtt_topic, json.dumps(error_message))
-                print(f"Error sequence published to MQTT: {error_message}")
+                charge = self.publier_couleur(4)
+                journal.debug("MQTT >>> [%s] Séquence d'erreur : %s", self.mqtt_topic, TexteDiffere(charge))
                 return
-            sequence_chiffres = self.convertir_sequence_en_chiffres(sequence)
             if tmp == 2:
-                message = {"couleur": sequence_chiffres,"pas": True}
-                print(f"MQTT >>> [Tapis/sequence] Séquence complète : {json.dumps(message)}")
+                chiffres = self.convertir_sequence_en_chiffres(sequence)
+                charge = self.encodeur_sequence.encoder(chiffres)
+                journal.debug("MQTT >>> [%s] Séquence complète : %s", self.mqtt_topic, TexteDiffere(charge))
             elif tmp == 1:
-                message = {"couleur": [self.couleur_vers_chiffre[couleur]],"pas": False}
-                print(f"MQTT >>> [Tapis/sequence] Couleur unique : {json.dumps(message)}")
-            self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-            print(f"Sequence published to MQTT: {message}")
+                chiffres = [self.couleur_vers_chiffre[sequence[index]]]
+                charge = CHARGES_COULEUR[chiffres[0]]
+                journal.debug("MQTT >>> [%s] Couleur unique : %s", self.mqtt_topic, TexteDiffere(charge))
+            else:
+                raise ValueError(f"Type de message inconnu : {tmp}")
+            self._publier_son(charge, chiffres, tmp == 2)
         except Exception as e:
-            error_message = {"couleur": [4],"pas": False}
-            self.mqtt_client.publish(self.mqtt_topic, json.dumps(error_message))
-            print(f"Failed to publish to MQTT: {e}")
-            print(f"Sent error sequence: {error_message}")
+            charge = self.publier_couleur(4)
+            journal.error("Échec de la publication MQTT : %s ; séquence d'erreur envoyée : %s",
+                          e, TexteDiffere(charge))
+
+    def publier_couleur(self, chiffre, recu=None):
+        """
+        Publie un message d'une seule couleur sur le topic de la séquence.
+
+        La charge est prise dans la table pré-sérialisée et déposée dans la file
+        du publieur : l'appel ne bloque pas sur le réseau.
+
+        Args:
+            chiffre (int): Code couleur (0-3 couleurs, 4 erreur, 5 fin de séquence)
+            recu (float, optional): Instant monotone de réception du pas publié
+
+        Returns:
+            bytes: Charge publiée, pour l'affichage
+        """
+        charge = CHARGES_COULEUR[chiffre]
+        self._publier_son(charge, [chiffre], False, recu)
+        return charge
+
+    def _publier_son(self, charge, chiffres, pas, recu=None):
+        """
+        Publie un message du topic de séquence et le remet directement au Son du processus.
+
+        Le broker relaie toujours le message aux LEDs et aux clients web ; le
+        son local démarre sans attendre l'aller-retour réseau et ignore l'écho.
+
+        Args:
+            charge (bytes): Charge sérialisée du message
+            chiffres (list): Codes couleur du message
+            pas (bool): Valeur du champ "pas" de la charge
+            recu (float, optional): Instant monotone de réception du pas publié
+        """
+        self.publieur.publier(self.mqtt_topic, charge, recu)
+        self.sound_manager.jouer_local(charge, chiffres, pas)
 
     def montrer_sequence(self, temps_sequence):
         """
@@ -724,23 +1176,40 @@ class JeuSimon:
 
         Args:
             temps_sequence (float): Temps d'attente entre chaque couleur (non utilisé ici)
+
+        Returns:
+            bool: True une fois la séquence affichée, False si l'attente a été annulée
+
+        Note:
+            La saisie s'ouvre dès l'acquittement de fin d'affichage des LEDs
+            (voir on_message_led_status) ; sans acquittement, au bout de la durée
+            d'affichage prévue pour la difficulté plus marge_acquittement_led.
         """
         print("\nAttention ! Voici la séquence :")
+        self._affichage_led_commence = False
+        self._fin_affichage_led.clear()
         
         # Envoyer la séquence une seule fois avec le son de fin (5)
+        # ("pas": true ajoutera automatiquement le son 5 à la fin)
         sequence_chiffres = [self.couleur_vers_chiffre[c] for c in self.etat.sequence]
-        sequence_message = {
-            "couleur": sequence_chiffres,
-            "pas": True  # Cela ajoutera automatiquement le son 5 à la fin
-        }
-        self.mqtt_client.publish(self.mqtt_topic, json.dumps(sequence_message))
-        print(f"MQTT >>> [Tapis/sequence] Séquence envoyée : {json.dumps(sequence_message)}")
+        charge = self.encodeur_sequence.encoder(sequence_chiffres)
+        self._publier_son(charge, sequence_chiffres, True)
+        journal.debug("MQTT >>> [%s] Séquence envoyée : %s", self.mqtt_topic, TexteDiffere(charge))
         
         # Afficher simplement la séquence sans jouer les sons
         for i, couleur in enumerate(self.etat.sequence, 1):
             chiffre = self.couleur_vers_chiffre[couleur]
             print(f"{i}. {couleur} ({chiffre})")
-            time.sleep(2)  # Attendre que le son soit joué
+        # Attendre la fin de l'affichage sur le tapis
+        debut = time.monotonic()
+        delai_max = self.duree_affichage_sequence(len(self.etat.sequence)) + self.marge_acquittement_led
+        if not self._attendre(delai_max, self._fin_affichage_led):
+            return False
+        duree = time.monotonic() - debut
+        self.mesures.observer("affichage_sequence", duree)
+        if duree >= delai_max:
+            journal.warning("Pas d'acquittement de fin d'affichage des LEDs après %.1f s", delai_max)
+        return True
 
     def _config_socket(self):
         """
@@ -754,7 +1223,8 @@ class JeuSimon:
         
         Note:
             Les callbacks sont définis comme des fonctions internes pour avoir accès
-            aux attributs de l'instance via la fermeture (closure).
+            aux attributs de l'instance via la fermeture (closure), sauf celui des
+            pas (on_pas), méthode réenregistrée après le choix de la difficulté.
         """
         
         @self.socket.event
@@ -765,7 +1235,7 @@ class JeuSimon:
             Configure le timeout de ping et affiche un message de confirmation.
             Le timeout est défini à 2 secondes pour maintenir une connexion active.
             """
-            print("Connecté au serveur SensFloor")
+            journal.info("Connecté au serveur SensFloor")
             self.socket.eio.ping_timeout = 2000  # 2 seconds
 
         @self.socket.event
@@ -776,25 +1246,13 @@ class JeuSimon:
             En cas de déconnexion pendant une partie, force la reprise du jeu
             pour éviter un blocage de l'état de jeu.
             """
-            print("Déconnecté du serveur")
+            journal.warning("Déconnecté du serveur SensFloor")
             if not self.etat.peut_jouer:
                 self.etat.peut_jouer = True
-                print("Forçage de la reprise du jeu après déconnexion")
+                journal.warning("Forçage de la reprise du jeu après déconnexion")
+
+        self.socket.on('step', self.on_pas)
 
-        @self.socket.on('step')
-        def on_pas(x, y):
-            """
-            Callback appelé lors de la détection d'un pas sur le SensFloor.
-            
-            Args:
-                x (float): Coordonnée X du pas détecté sur le tapis
-                y (float): Coordonnée Y du pas détecté sur le tapis
-                
-            Note:
-                Délègue le traitement à la méthode traiter_pas() de l'instance.
-            """
-            self.traiter_pas(x, y)
-            
         @self.socket.on('objects-update')
         def on_objects_update(objects):
             """
@@ -804,12 +1262,88 @@ class JeuSimon:
                 objects (list): Liste des objets actuellement détectés sur le tapis
                 
             Note:
-                Active la détection des pas pour permettre une nouvelle séquence
-                de jeu lorsque des objets sont détectés.
+                Délègue le traitement à la méthode traiter_objets() de l'instance,
+                après enregistrement de la trame si un journal est actif.
             """
-            if isinstance(objects, list):
-                self.etat.peut_jouer = True
-                #print("Détection des pas activée pour nouvelle séquence")
+            if self.enregistreur and isinstance(objects, list):
+                self.enregistreur.objets(objects)
+            self.traiter_objets(objects)
+
+    def on_pas(self, x, y):
+        """
+        Callback Socket.IO appelé lors de la détection d'un pas sur le SensFloor.
+
+        Args:
+            x (float): Coordonnée X du pas détecté sur le tapis
+            y (float): Coordonnée Y du pas détecté sur le tapis
+
+        Note:
+            Délègue le traitement à la méthode traiter_pas() de l'instance,
+            après enregistrement de l'événement si un journal est actif.
+            L'instant de réception sert de référence aux mesures de latence.
+        """
+        recu = time.monotonic()
+        if self.enregistreur:
+            self.enregistreur.pas(x, y)
+        self.traiter_pas(x, y, recu=recu)
+
+    def traiter_objets(self, objects, instant=None):
+        """
+        Traite une trame 'objects-update' du SensFloor.
+        
+        Active la détection des pas pour permettre une nouvelle séquence de jeu
+        lorsque des objets sont détectés, et classe toutes les positions de la
+        trame en un seul appel vectorisé pour suivre l'occupation des zones
+        (voir on_changement_zone).
+        
+        Args:
+            objects (list): Liste des objets actuellement détectés sur le tapis
+            instant (float, optional): Horodatage monotone de la trame. Défaut: maintenant
+        """
+        if isinstance(objects, list):
+            self.etat.peut_jouer = True
+            #print("Détection des pas activée pour nouvelle séquence")
+            if self.suivi_occupation is not None:
+                try:
+                    self.instant_trame = time.monotonic() if instant is None else instant
+                    self.suivi_occupation.ingerer(objects)
+                    if self.source_pas == "objects":
+                        # Zones dont la présence a atteint la durée d'entrée
+                        for zone in self.anti_rebond.actualiser(self.instant_trame):
+                            self.traiter_couleur(self.carte_zones.couleurs[zone])
+                except Exception as e:
+                    journal.error("Erreur de suivi des zones : %s", e)
+
+    def activer_enregistrement(self, chemin):
+        """
+        Enregistre tous les événements 'step' et 'objects-update' reçus dans un journal.
+        
+        Args:
+            chemin (str): Chemin du journal binaire (ouvert en ajout)
+        """
+        self.enregistreur = Enregistreur(chemin)
+        journal.info("Enregistrement des événements SensFloor dans %s", chemin)
+
+    def activer_metriques(self, port=9108, periode_stats=10.0):
+        """
+        Expose les latences mesurées à chaque étape du traitement d'un pas.
+        
+        Les histogrammes sont servis au format Prometheus sur http://127.0.0.1:<port>/metrics
+        et leur résumé (quantiles récents en millisecondes) est publié sur stats_topic.
+        
+        Args:
+            port (int, optional): Port HTTP local. Défaut: 9108
+            periode_stats (float, optional): Intervalle des publications MQTT (en secondes).
+                                             Défaut: 10.0
+        """
+        try:
+            self.serveur_metriques = ServeurMetriques(self.mesures, port)
+            journal.info("Métriques disponibles sur http://127.0.0.1:%s/metrics", self.serveur_metriques.port)
+        except OSError as e:
+            journal.warning("Impossible d'ouvrir le port des métriques %s : %s", port, e)
+        self.publicateur_stats = PublicateurStats(
+            self.mesures, self.mqtt_client, self.stats_topic, periode_stats
+        )
 
     def creer_sequence(self, seq_precedente):
         """
@@ -857,11 +1391,14 @@ class JeuSimon:
         """
         Convertit les coordonnées du pas en couleur correspondante sur le SensFloor.
         
-        Le SensFloor est divisé en 4 zones de couleur selon un quadrillage 2x2 :
-        - Zone supérieure gauche (0 ≤ x ≤ 0.5, 1 ≤ y ≤ 1.5) : vert
-        - Zone inférieure gauche (0 ≤ x ≤ 0.5, y < 1 ou y > 1.5) : rouge  
-        - Zone supérieure droite (0.5 < x ≤ 1, 1 ≤ y ≤ 1.5) : jaune
-        - Zone inférieure droite (0.5 < x ≤ 1, y < 1 ou y > 1.5) : bleu
+        Les zones de couleur sont décrites dans zones.json (rectangles ou polygones)
+        et compilées au démarrage en grille de correspondance : la classification
+        est un simple accès indexé, quel que soit le nombre de zones. La disposition
+        par défaut est un quadrillage 2x2 sur un tapis de 1.0 x 2.0 :
+        - Gauche, bande centrale (0 ≤ x ≤ 0.5, 1 ≤ y ≤ 1.5) : vert
+        - Gauche, bords (0 ≤ x ≤ 0.5, y < 1 ou y > 1.5) : rouge
+        - Droite, bande centrale (0.5 < x ≤ 1, 1 ≤ y ≤ 1.5) : jaune
+        - Droite, bords (0.5 < x ≤ 1, y < 1 ou y > 1.5) : bleu
         
         Args:
             x (float): Coordonnée X normalisée (0.0 à 1.0) du pas sur le tapis
@@ -871,11 +1408,7 @@ class JeuSimon:
             str: Nom de la couleur correspondante ('vert', 'rouge', 'bleu', 'jaune')
                  ou 'inconnu' si les coordonnées sont hors des zones définies
         """
-        if 0 <= x <= 0.5:
-            return 'vert' if 1 <= y <= 1.5 else 'rouge'
-        elif 0.5 < x <= 1:
-            return 'jaune' if 1 <= y <= 1.5 else 'bleu'
-        return 'inconnu'
+        return self.carte_zones.classer(x, y)
 
     def reinitialiser_queue_couleurs(self):
         """
@@ -890,49 +1423,90 @@ class JeuSimon:
         """
         while not self.etat.couleurs.empty():
             self.etat.couleurs.get()
+        self.etat.instants_ajout.clear()
 
-    def traiter_pas(self, x, y):
+    def traiter_pas(self, x, y, instant=None, recu=None):
         """
-        Traite un nouveau pas détecté sur le SensFloor avec gestion des doublons et du timing.
+        Traite un nouveau pas détecté sur le SensFloor avec anti-rebond par zone.
         
-        Cette méthode convertit les coordonnées en couleur, applique un filtre temporel
-        pour éviter les détections multiples rapides, et publie la couleur détectée via MQTT.
+        Cette méthode convertit les coordonnées en zone, passe le pas à l'anti-rebond
+        de la zone (voir antirebond.AntiRebond) et transmet les pas validés à
+        traiter_couleur().
         
         Args:
             x (float): Coordonnée X du pas détecté (0.0 à 1.0)
             y (float): Coordonnée Y du pas détecté (0.0 à 2.0)
+            instant (float, optional): Horodatage monotone du pas. Défaut: maintenant.
+                                       Fourni par le rejeu d'un journal pour conserver
+                                       le rythme d'origine quelle que soit la vitesse.
+            recu (float, optional): Instant monotone de réception de l'événement, origine
+                                    des mesures de latence. Défaut: maintenant.
         
         Note:
             - Ignore les pas si le jeu n'est pas en état de réception (peut_jouer = False)
-            - Applique un délai minimum de 0.5 seconde entre les détections
-            - Ignore les couleurs identiques consécutives pour éviter les rebonds
-            - Publie chaque couleur valide via MQTT sur le topic de séquence
+              ou si les pas proviennent des trames 'objects-update' (source_pas)
+            - Les rebonds d'un même appui sur une zone sont ignorés ; une zone quittée
+              depuis plus de duree_sortie peut être rejouée, y compris la même couleur
         """
-        if not self.etat.peut_jouer:
+        if not self.etat.peut_jouer or self.source_pas != "step":
             return
         try:
+            if recu is None:
+                recu = time.monotonic()
             x, y = float(x), float(y)
-            couleur = self.detecter_couleur(x, y)
-            if couleur == 'inconnu':
+            zone = self.carte_zones.indice_zone(x, y)
+            classe = time.monotonic()
+            self.mesures.observer("classification", classe - recu)
+            if zone == AUCUNE_ZONE:
                 return
-            temps_actuel = time.time()
-            # Vérifier si le temps minimum est écoulé et si la couleur est différente de la dernière
-            if  temps_actuel - self.dernier_pas > 0.5 and couleur != self.etat.derniere_couleur_detectee:
-                print(f"Nouvelle couleur : {couleur}")
-                self.etat.ajouter_couleur(couleur)
-                self.dernier_pas = temps_actuel
-                self.etat.derniere_couleur_detectee = couleur  # Sauvegarder la dernière couleur
-                # Envoyer la couleur détectée en MQTT uniquement
-                chiffre = self.couleur_vers_chiffre[couleur]
-                message = {"couleur": [chiffre],"pas": False}
-                self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-                print(f"MQTT >>> [Tapis/sequence] Détection pas : {json.dumps(message)}")
-            else:
-                # Si c'est la même couleur, ne rien faire
-                if couleur == self.etat.derniere_couleur_detectee:
-                    print(f"Même couleur que la précédente ({couleur}), ignorée")
+            if instant is None:
+                instant = classe
+            if self.anti_rebond.pas(zone, instant):
+                self.traiter_couleur(self.carte_zones.couleurs[zone], recu)
+        except Exception as e:
+            journal.error("Erreur de traitement du pas (%s, %s) : %s", x, y, e)
+
+    def traiter_couleur(self, couleur, recu=None):
+        """
+        Enregistre une couleur validée par l'anti-rebond puis la publie via MQTT.
+        
+        Point d'entrée commun aux événements 'step' (via traiter_pas) et aux entrées
+        de zone issues des trames 'objects-update'.
+        
+        Args:
+            couleur (str): Couleur de la zone foulée ('vert', 'rouge', 'bleu', 'jaune')
+            recu (float, optional): Instant monotone de réception du pas, pour les
+                                    mesures de latence "mise_en_file" et "pas_total"
+        """
+        if not self.etat.peut_jouer:
+            return
+        try:
+            journal.debug("Nouvelle couleur : %s", couleur)
+            self.etat.ajouter_couleur(couleur)
+            if recu is not None:
+                self.mesures.observer("mise_en_file", time.monotonic() - recu)
+            self.etat.derniere_couleur_detectee = couleur  # Sauvegarder la dernière couleur
+            # Envoyer la couleur détectée en MQTT uniquement
+            charge = self.publier_couleur(self.couleur_vers_chiffre[couleur], recu)
+            journal.debug("MQTT >>> [%s] Détection pas : %s", self.mqtt_topic, TexteDiffere(charge))
         except Exception as e:
-            print(f"Erreur : {str(e)}")
+            journal.error("Erreur de traitement de la couleur %s : %s", couleur, e)
+
+    def on_changement_zone(self, changement):
+        """
+        Reçoit les changements d'occupation calculés sur les trames 'objects-update'.
+        
+        Lorsque la source des pas est "objects", l'occupation de chaque zone passe
+        par l'anti-rebond, et chaque entrée validée est traitée comme un pas sur
+        la couleur de cette zone.
+        
+        Args:
+            changement (ChangementOccupation): Changement d'occupation d'une zone
+        """
+        if self.source_pas != "objects":
+            return
+        if self.anti_rebond.presence(changement.indice, self.instant_trame, changement.apres > 0):
+            self.traiter_couleur(changement.couleur)
 
     def attendre_fin_pas(self, timeout=1.0):
         """
@@ -969,18 +1543,27 @@ class JeuSimon:
                                        Défaut: "sequence"
         
         Note:
-            - Ajoute un délai d'1 seconde avant l'envoi pour éviter les conflits
+            - Le son d'erreur est mis en file immédiatement (priorité d'alerte) ;
+              seule la publication MQTT est planifiée sur la minuterie après
+              delai_erreur (1 seconde), pour laisser finir le retour du dernier
+              pas sur les LEDs. L'appel ne bloque pas
+            - L'écho de la publication différée est ignoré par le Son du
+              processus (delai_echo couvre delai_erreur)
+            - Le signal n'est pas annulé par reset_game() : il est envoyé même si
+              la partie est réinitialisée entre-temps
             - Le code 4 déclenche généralement un son d'erreur côté récepteur
             - Le paramètre "pas" est mis à False pour indiquer une couleur simple
         """
-        error_message = {
-            "couleur": [4],  # 4 représente une erreur
-            "pas": False
-        }
-        time.sleep(1)
-        self.mqtt_client.publish(self.mqtt_topic, json.dumps(error_message))
-        
-        print(f"MQTT >>> Envoi signal d'erreur : {error_message}")
+        self.sound_manager.jouer_local(CHARGES_COULEUR[CODE_ERREUR], [CODE_ERREUR], False)
+        Minuterie.obtenir().planifier(self.delai_erreur, self._signaler_erreur)
+
+    def _signaler_erreur(self):
+        """
+        Publie le signal d'erreur planifié par envoyer_erreur_mqtt(), déjà joué localement.
+        """
+        charge = CHARGES_COULEUR[CODE_ERREUR]
+        self.publieur.publier(self.mqtt_topic, charge)
+        journal.debug("MQTT >>> [%s] Signal d'erreur : %s", self.mqtt_topic, TexteDiffere(charge))
 
     def stop(self):
         """
@@ -996,32 +1579,45 @@ class JeuSimon:
             Gère les exceptions pour chaque composant individuellement afin d'assurer
             un arrêt propre même en cas d'erreur sur l'un des éléments.
         """
-        print("Arrêt du jeu demandé")
+        journal.info("Arrêt du jeu demandé")
         self.game_started = False
         self.running = False
+        self.annuler_temporisations()
         
         if hasattr(self, 'sound_manager'):
             try:
                 self.sound_manager.stop()
             except Exception as e:
-                print(f"Erreur lors de l'arrêt du gestionnaire de sons : {e}")
+                journal.error("Erreur lors de l'arrêt du gestionnaire de sons : %s", e)
         
-        if hasattr(self, 'mqtt_client'):
+        if hasattr(self, 'publieur') and not self.publieur_partage:
+            self.publieur.arreter()
+        
+        if hasattr(self, 'mqtt'):
             try:
-                self.mqtt_client.loop_stop()
-                self.mqtt_client.disconnect()
-                print("Déconnexion du broker MQTT effectuée")
+                self.mqtt.desabonner(self.start_topic, self.on_message_start)
+                self.mqtt.desabonner(self.difficulty_topic, self.on_message_difficulte)
+                self.mqtt.desabonner(self.led_status_topic, self.on_message_led_status)
+                self.mqtt.liberer()
             except Exception as e:
-                print(f"Erreur lors de la déconnexion MQTT : {e}")
+                journal.error("Erreur lors de la déconnexion MQTT : %s", e)
         
         if hasattr(self, 'socket') and self.socket.connected:
             try:
                 self.socket.disconnect()
-                print("Déconnexion du socket effectuée")
+                journal.info("Déconnexion du socket effectuée")
             except Exception as e:
-                print(f"Erreur lors de la déconnexion du socket : {e}")
+                journal.error("Erreur lors de la déconnexion du socket : %s", e)
+        
+        if self.enregistreur:
+            self.enregistreur.fermer()
+        
+        if self.serveur_metriques:
+            self.serveur_metriques.arreter()
+        if self.publicateur_stats:
+            self.publicateur_stats.arreter()
         
-        print("Arrêt du jeu terminé")
+        journal.info("Arrêt du jeu terminé")
 
     def lire_sequence_test(self, longueur_sequence, temps_total):
         """
@@ -1040,16 +1636,17 @@ class JeuSimon:
                          (timeout, erreur de couleur, ou abandon)
         
         Note:
-            - Utilise msvcrt.kbhit() pour une saisie non-bloquante sur Windows
+            - Lit les touches sur le clavier partagé (voir clavier.py), réservées
+              à cette saisie jusqu'à la fin de la séquence
             - Publie chaque couleur saisie via MQTT pour feedback visuel/audio
             - Envoie des signaux d'erreur MQTT spécifiques selon le type d'échec
-            - Met à jour l'affichage du temps restant en temps réel
+            - Met à jour l'affichage du temps restant toutes les 0,5 secondes
         """
         sequence_joueur = []
         sequence_start_time = time.time()
-        self.in_test_sequence = True  # Indiquer que nous sommes en séquence de test
+        clavier = LecteurClavier.obtenir()
         
-        try:
+        with clavier.saisie():
             for position in range(longueur_sequence):
                 temps_ecoule = time.time() - sequence_start_time
                 temps_restant = temps_total - temps_ecoule
@@ -1057,7 +1654,6 @@ class JeuSimon:
                 if temps_restant <= 0:
                     self.envoyer_erreur_mqtt("timeout")
                     print(f"\nTemps écoulé ! Vous avez dépassé {temps_total} secondes.")
-                    self.sound_manager.play_sequence([4])
                     return None
                 
                 print(f"\nEntrez la couleur {position + 1}/{longueur_sequence}")
@@ -1065,33 +1661,22 @@ class JeuSimon:
                 print(f"Temps restant : {temps_restant:.1f} secondes")
                 print("> ", end='', flush=True)
                 
-                # Utiliser un timeout pour input
-                start_input_time = time.time()
                 choix = None
-                
                 while True:
-                    char = get_single_char()
-                    if char and char in ['0', '1', '2', '3', 'q']:
-                        choix = char
-                        print(char)
-                        break
-
-                    
-                    current_time = time.time()
-                    temps_ecoule = current_time - sequence_start_time
-                    temps_restant = temps_total - temps_ecoule
-                    
+                    temps_restant = temps_total - (time.time() - sequence_start_time)
                     if temps_restant <= 0:
                         print(f"\nTemps écoulé ! Vous avez dépassé {temps_total} secondes.")
                         self.envoyer_erreur_mqtt("timeout")
-                        self.sound_manager.play_sequence([4])
                         return None
                     
-                    # Mise à jour du temps toutes les 0.5 secondes
-                    if int(temps_restant * 2) != int((temps_total - (current_time - start_input_time)) * 2):
-                        print(f"\rTemps restant : {temps_restant:.1f} secondes > ", end='', flush=True)
-                    
-                    time.sleep(0.1)
+                    char = clavier.lire(timeout=min(0.5, temps_restant))
+                    if char is None:
+                        # Mise à jour du temps toutes les 0.5 secondes
+                        print(f"\rTemps restant : {max(0.0, temps_restant - 0.5):.1f} secondes > ", end='', flush=True)
+                    elif char in ['0', '1', '2', '3', 'q']:
+                        choix = char
+                        print(char)
+                        break
                 
                 if choix == 'q':
                     self.envoyer_erreur_mqtt("abandon")
@@ -1103,28 +1688,17 @@ class JeuSimon:
                 
                 # Vérifier si la couleur est correcte
                 if couleur != self.etat.sequence[position]:
-                    message = {
-                        "couleur": [self.couleur_vers_chiffre[couleur]],
-                        "pas": False
-                    }
-                    self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
+                    self.publier_couleur(self.couleur_vers_chiffre[couleur])
                     self.envoyer_erreur_mqtt("wrong_color")
                     print(f"\nErreur ! Couleur attendue : {self.etat.sequence[position]}")
                     print(f"Couleur reçue : {couleur}")
                     return None
                 
                 # Si la couleur est correcte, envoie la confirmation
-                message = {
-                    "couleur": [self.couleur_vers_chiffre[couleur]],
-                    "pas": False
-                }
-                self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-                print(f"MQTT >>> [Tapis/sequence] Lecture test : {json.dumps(message)}")
+                charge = self.publier_couleur(self.couleur_vers_chiffre[couleur])
+                journal.debug("MQTT >>> [%s] Lecture test : %s", self.mqtt_topic, TexteDiffere(charge))
             
             return sequence_joueur
-        
-        finally:
-            self.in_test_sequence = False  # Réinitialiser le flag quoi qu'il arrive
 
     def lire_sequence_tapis(self, longueur_sequence, temps_total):
         """
@@ -1143,7 +1717,8 @@ class JeuSimon:
         
         Note:
             - Active la réception des pas via self.etat.peut_jouer
-            - Surveille la queue des couleurs détectées par traiter_pas()
+            - Attend les couleurs détectées par traiter_pas() en bloquant sur la queue,
+              avec une échéance calculée à partir de temps_total (pas de scrutation)
             - Vérifie chaque couleur reçue contre la séquence attendue
             - Affiche le temps restant en temps réel sur la console
             - Publie les couleurs détectées et les erreurs via MQTT
@@ -1151,41 +1726,39 @@ class JeuSimon:
         sequence_joueur = []
         self.etat.peut_jouer = True
         position = 0
-        sequence_start_time = time.time()  # Ajout de cette ligne
+        echeance = time.monotonic() + temps_total
         
         while position < longueur_sequence:
             # Afficher le temps restant
-            temps_ecoule = time.time() - sequence_start_time
-            temps_restant = temps_total - temps_ecoule
-            print(f"\rTemps restant : {temps_restant:.1f} secondes", end='', flush=True)
+            temps_restant = echeance - time.monotonic()
+            print(f"\rTemps restant : {max(temps_restant, 0):.1f} secondes", end='', flush=True)
             
             if temps_restant <= 0:
                 self.envoyer_erreur_mqtt("timeout")
                 print(f"\nTemps total écoulé ! Vous avez dépassé {temps_total} secondes.")
-                self.sound_manager.play_sequence([4])  # Jouer le son d'erreur
+                return None
+            
+            # Attente bloquante sur la queue : réveil immédiat au prochain pas,
+            # sinon au prochain rafraîchissement du compte à rebours ou à l'échéance
+            try:
+                couleur = self.etat.couleurs.get(
+                    timeout=min(temps_restant, self.intervalle_compte_a_rebours)
+                )
+            except Empty:
+                continue
+            self.mesures.observer("attente_file", self.etat.retirer_instant_ajout())
+            sequence_joueur.append(couleur)
+            
+            # Vérifier si la couleur est correcte
+            if couleur != self.etat.sequence[position]:
+                charge = self.publier_couleur(self.couleur_vers_chiffre[couleur])
+                journal.debug("MQTT >>> [%s] Lecture normale : %s", self.mqtt_topic, TexteDiffere(charge))
+                self.envoyer_erreur_mqtt("wrong_color")
+                print(f"\nErreur ! Couleur attendue : {self.etat.sequence[position]}")
+                print(f"Couleur reçue : {couleur}")
                 return None
                 
-            if len(self.etat.couleurs.queue) > 0:
-                couleur = self.etat.couleurs.get()
-                sequence_joueur.append(couleur)
-                
-                # Vérifier si la couleur est correcte
-                if couleur != self.etat.sequence[position]:
-                    message = {
-                        "couleur": [self.couleur_vers_chiffre[couleur]],
-                        "pas": False
-                    }
-                    self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-                    print(f"MQTT >>> [Tapis/sequence] Lecture normale : {json.dumps(message)}")
-                    self.envoyer_erreur_mqtt("wrong_color")
-                    print(f"\nErreur ! Couleur attendue : {self.etat.sequence[position]}")
-                    print(f"Couleur reçue : {couleur}")
-                    self.sound_manager.play_sequence([4])  # Jouer le son d'erreur
-                    return None
-                    
-                position += 1
-                
-            time.sleep(0.1)  # Petite pause pour ne pas surcharger le CPU
+            position += 1
             
         return sequence_joueur
 
@@ -1269,22 +1842,17 @@ class JeuSimon:
                     self.etat.sequence.append(nouvelle_couleur)
 
                 print("\nNouvelle séquence :")
-                self.montrer_sequence(config['temps_sequence'])
-                time.sleep(config['delai_entre_tours'])
+                if not self.montrer_sequence(config['temps_sequence']) or \
+                        not self._attendre(config['delai_entre_tours']):
+                    print("\nPartie interrompue")
+                    return
 
                 # Lire la séquence du joueur
                 sequence_joueur = self.lire_sequence_joueur(len(self.etat.sequence))
                 if sequence_joueur is None:
                     # Partie perdue
                     print("\nPartie perdue !")
-                    # Envoyer le score final
-                    score_message = {
-                        "score": score,
-                        "difficulte": self.difficulte,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    self.mqtt_client.publish("Tapis/score", json.dumps(score_message))
-                    print(f"MQTT >>> [Tapis/score] Score final envoyé : {json.dumps(score_message)}")
+                    self.publier_score(score)
                     self.reset_game()
                     return
 
@@ -1294,31 +1862,37 @@ class JeuSimon:
                 else:
                     # Partie perdue
                     print("\nPartie perdue !")
-                    # Envoyer le score final
-                    score_message = {
-                        "score": score,
-                        "difficulte": self.difficulte,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    self.mqtt_client.publish("Tapis/score", json.dumps(score_message))
-                    print(f"MQTT >>> [Tapis/score] Score final envoyé : {json.dumps(score_message)}")
+                    self.publier_score(score)
                     self.reset_game()
                     return
 
         except Exception as e:
-            print(f"Erreur dans le jeu : {e}")
+            journal.error("Erreur dans le jeu : %s", e)
             # Envoyer le score même en cas d'erreur
             if 'score' in locals():
-                score_message = {
-                    "score": score,
-                    "difficulte": self.difficulte,
-                    "timestamp": datetime.now().isoformat(),
-                    "ended_with_error": True
-                }
-                self.mqtt_client.publish("Tapis/score", json.dumps(score_message))
-                print(f"MQTT >>> [Tapis/score] Score final envoyé (erreur) : {json.dumps(score_message)}")
+                self.publier_score(score, ended_with_error=True)
             self.reset_game()
 
+    def publier_score(self, score, ended_with_error=False):
+        """
+        Publie le score final de la partie sur le topic MQTT Tapis/score.
+
+        Args:
+            score (int): Score atteint par le joueur
+            ended_with_error (bool): True si la partie s'est terminée sur une erreur
+                                     technique. Défaut: False
+        """
+        score_message = {
+            "score": score,
+            "difficulte": self.difficulte,
+            "timestamp": datetime.now().isoformat()
+        }
+        if ended_with_error:
+            score_message["ended_with_error"] = True
+        charge = json.dumps(score_message)
+        self.publieur.publier(self.score_topic, charge)
+        journal.info("MQTT >>> [%s] Score final envoyé : %s", self.score_topic, charge)
+
     def choisir_difficulte_avec_tapis(self):
         """
         Permet de choisir la difficulté en utilisant le tapis.
@@ -1353,17 +1927,13 @@ class JeuSimon:
 
                 if choix_fait.is_set():
                     # Envoyer la couleur choisie en MQTT
-                    message = {
-                        "couleur": [self.couleur_vers_chiffre[couleur]],
-                        "pas": False
-                    }
-                    self.mqtt_client.publish(self.mqtt_topic, json.dumps(message))
-                    print(f"MQTT >>> [Tapis/sequence] Choix difficulté : {json.dumps(message)}")
+                    charge = self.publier_couleur(self.couleur_vers_chiffre[couleur])
+                    journal.debug("MQTT >>> [%s] Choix difficulté : %s", self.mqtt_topic, TexteDiffere(charge))
                     print(f"\nDifficulté choisie : {self.difficulte}")
                     self.afficher_parametres_difficulte()
 
         # Enregistrer le handler temporaire pour les pas
-        @self.socket.on('step')
+        @self._creer_socket().on('step')
         def on_step(x, y):
             on_couleur_detectee(x, y)
 
@@ -1373,13 +1943,11 @@ class JeuSimon:
                 print("\nAucun choix fait dans le temps imparti. Passage en mode facile par défaut.")
                 self.difficulte = "facile"
         except Exception as e:
-            print(f"Erreur lors de la détection : {e}")
+            journal.error("Erreur lors de la détection : %s", e)
             self.difficulte = "facile"  # Mode par défaut en cas d'erreur
         finally:
             # Réinitialiser le handler des pas pour le jeu normal
-            @self.socket.on('step')
-            def on_pas(x, y):
-                self.traiter_pas(x, y)
+            self.socket.on('step', self.on_pas)
 
         return self.difficulte
 
@@ -1394,8 +1962,16 @@ class JeuSimon:
         print("2. Moyen  - Pour les joueurs habitués")
         print("3. Difficile - Pour les experts")
 
+        clavier = LecteurClavier.obtenir()
         while True:
-            choix = input("\nVotre choix (1-3) : ").strip()
+            print("\nVotre choix (1-3) : ", end='', flush=True)
+            with clavier.saisie():
+                choix = clavier.lire()
+            if choix is None:
+                print("\nClavier indisponible, difficulté facile par défaut")
+                self.difficulte = "facile"
+                break
+            print(choix)
             if choix == "1":
                 self.difficulte = "facile"
                 break
@@ -1420,32 +1996,38 @@ class JeuSimon:
         try:
             if not self.mode_test:
                 # Vérifier si nous sommes déjà connectés
-                if not hasattr(self, 'socket') or not self.socket.connected:
-                    print("Connexion au serveur...")
+                if not self._creer_socket().connected:
+                    journal.info("Connexion au serveur SensFloor %s", self.sensfloor_url)
                     self.socket.connect(
-                        'http://192.168.5.5:8000',
-                        transports=['websocket'],
+                        self.sensfloor_url,
+                        transports=self.sensfloor_transports,
                         wait=True,
                         wait_timeout=10
                     )
                     print("Connecté en mode NORMAL")
 
-                # Attente de la difficulté via MQTT
-                if not self.difficulty_received:
+                # Attente de la difficulté via MQTT, réveillée par handle_difficulty_message()
+                self._difficulte_choisie.clear()
+                difficulte_attendue = not self.difficulty_received
+                if difficulte_attendue:
                     print("\nEn attente de la difficulté via MQTT...")
-                    start_time = time.time()
-
-                    while not self.difficulty_received and time.time() - start_time < self.difficulty_timeout:
-                        remaining = int(self.difficulty_timeout - (time.time() - start_time))
-                        if remaining % 5 == 0:
-                            self.send_difficulty_reminder()
-                        time.sleep(1)
+                    self._rappels_actifs = True
+                    self._rappeler_difficulte()
+                    try:
+                        if not self._attendre(self.difficulty_timeout, self._difficulte_choisie):
+                            return  # Arrêt du jeu pendant l'attente
+                    finally:
+                        self._rappels_actifs = False
+                        if self._temporisation_rappel is not None:
+                            self._temporisation_rappel.annuler()
 
                     if not self.difficulty_received:
                         print("\nPas de difficulté reçue, utilisation du mode facile par défaut")
                         self.difficulte = "facile"
 
                 # Démarrer le jeu
+                if difficulte_attendue and self.difficulty_received:
+                    self.mesures.observer("demarrage_partie", time.monotonic() - self.instant_difficulte)
                 print("\nDémarrage du jeu en mode NORMAL")
                 # Réinitialiser l'état du jeu
                 self.etat.reinitialiser()
@@ -1459,7 +2041,7 @@ class JeuSimon:
                     self.choisir_difficulte_manuelle()
                 self.demarrer_jeu()
         except Exception as e:
-            print(f"Erreur de connexion : {str(e)}")
+            journal.error("Erreur de connexion : %s", e)
             if "Already connected" not in str(e):  # Ignorer l'erreur de connexion déjà établie
                 print("Passage en mode TEST")
                 self.mode_test = True
@@ -1467,11 +2049,23 @@ class JeuSimon:
                     self.choisir_difficulte_manuelle()
                 self.demarrer_jeu()
 
+    def _rappeler_difficulte(self):
+        """
+        Envoie un rappel de sélection de la difficulté et planifie le suivant sur la minuterie.
+
+        Les rappels s'arrêtent dès que demarrer() cesse d'attendre la difficulté.
+        """
+        if not self._rappels_actifs or self.difficulty_received:
+            return
+        self.send_difficulty_reminder()
+        self._temporisation_rappel = self._planifier(self.intervalle_rappel_difficulte, self._rappeler_difficulte)
+
     def send_difficulty_reminder(self):
         """
         Envoie un rappel pour la sélection de la difficulté sur le topic MQTT.
 
-        Utilisé toutes les 5 secondes si la difficulté n'a pas encore été reçue.
+        Utilisé toutes les intervalle_rappel_difficulte secondes (5 par défaut)
+        si la difficulté n'a pas encore été reçue.
         """
         reminder = {
             "type": "reminder",
@@ -1489,7 +2083,7 @@ class JeuSimon:
             "example": {"dif": 1},
             "timestamp": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
         }
-        self.mqtt_client.publish(self.mqtt_topic, json.dumps(reminder))
+        self.publieur.publier(self.mqtt_topic, json.dumps(reminder))
 
 class EtatJeu:
     """
@@ -1510,6 +2104,7 @@ class EtatJeu:
         self.derniere_couleur_ajoutee = None
         self.derniere_detection = 0
         self.derniere_couleur_detectee = None
+        self.instants_ajout = deque()  # Instants monotones de mise en file, pour les mesures
 
     def reinitialiser(self):
         """
@@ -1530,31 +2125,54 @@ class EtatJeu:
 
     def ajouter_couleur(self, couleur):
         """
-        Ajoute une nouvelle couleur à la file avec gestion du délai.
+        Ajoute une nouvelle couleur à la file.
+
+        Le filtrage des rebonds est fait en amont, par zone, dans JeuSimon.anti_rebond :
+        chaque appel correspond à un pas validé et est toujours enregistré.
 
         Args:
             couleur (str): Nom de la couleur à ajouter.
         """
-        temps_actuel = time.time()
-        # Ajouter un délai minimum entre les détections (par exemple 0.5 secondes)
-        if temps_actuel - self.derniere_detection > 0.5:
-            self.derniere_couleur_ajoutee = couleur
-            self.couleurs.put(couleur)
-            self.position += 1
-            self.derniere_detection = temps_actuel
+        self.derniere_couleur_ajoutee = couleur
+        self.instants_ajout.append(time.monotonic())
+        self.couleurs.put(couleur)
+        self.position += 1
+        self.derniere_detection = time.time()
+
+    def retirer_instant_ajout(self):
+        """
+        Retire l'instant de mise en file de la plus ancienne couleur lue.
+
+        Returns:
+            float: Temps passé dans la file par cette couleur (en secondes),
+                   0.0 si l'instant n'est pas connu
+        """
+        try:
+            return time.monotonic() - self.instants_ajout.popleft()
+        except IndexError:
+            return 0.0
 
 if __name__ == "__main__":
+    configurer_journal()
     jeu = None
     try:
-        jeu = JeuSimon(mode_test=False)
-        print("Jeu Simon démarré, en attente des messages MQTT...")
+        jeu = JeuSimon(mode_test=False,
+                       demarrage_differe=bool(os.environ.get("SIMON_DEMARRAGE_DIFFERE")))
+        if os.environ.get("SIMON_ENREGISTREMENT"):
+            jeu.activer_enregistrement(os.environ["SIMON_ENREGISTREMENT"])
+        jeu.activer_metriques(int(os.environ.get("SIMON_METRIQUES_PORT", "9108")))
+        if os.environ.get("SIMON_RENDU_SEQUENCES"):
+            jeu.sound_manager.activer_rendu()
+        journal.info("%s", CHRONOMETRE.rapport())
+        journal.info("Jeu Simon démarré, en attente des messages MQTT")
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nArrêt demandé par l'utilisateur")
     except Exception as e:
-        print(f"Erreur : {e}")
+        journal.exception("Erreur : %s", e)
     finally:
         if jeu:
             jeu.stop()
-            print("Jeu arrêté proprement")
\ No newline at end of file
+            journal.info("Jeu arrêté proprement")
+        arreter_journal()
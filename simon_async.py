@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Runtime asyncio optionnel pour le jeu Simon.
+
+Ce module exécute toute la partie (MQTT, SensFloor, lecture audio et logique
+de jeu) sur une seule boucle d'événements, au lieu des threads du runtime
+classique (boucle réseau paho, thread socketio, thread de partie, worker audio).
+Les attentes bloquantes (time.sleep) deviennent des temporisations asyncio,
+ce qui réduit les changements de contexte et la consommation CPU au repos
+sur le Raspberry Pi.
+
+Seul le mode normal (SensFloor) est pris en charge : le mode test au clavier
+reste disponible via le runtime classique de simon.py.
+
+Modules requis:
+    - asyncio: Boucle d'événements
+    - socketio: Client Socket.IO asynchrone (socketio.AsyncClient, nécessite aiohttp)
+    - paho.mqtt.client: Client MQTT piloté par la boucle asyncio
+
+Usage:
+    python simon_async.py
+"""
+
+from collections import deque
+from queue import Empty
+
+import asyncio
+import logging
+import random
+import time
+
+import paho.mqtt.client as mqtt
+import socketio
+
+from file_sons import PRIORITE_ALERTE, PRIORITE_RETOUR, PRIORITE_SEQUENCE
+from journal import TexteDiffere, arreter_journal, configurer_journal
+from publication import CHARGES_COULEUR, PublieurMQTT
+from routage_mqtt import RouteurMQTT
+from simon import CODE_ERREUR, EtatJeu, JeuSimon, Son
+
+journal = logging.getLogger(__name__)
+
+
+class ClientMQTTAsync:
+    """
+    Adaptateur paho-mqtt dont les entrées/sorties sont pilotées par asyncio.
+
+    Le socket du client est surveillé par la boucle d'événements
+    (add_reader/add_writer) au lieu du thread réseau de loop_start().
+    """
+
+    def __init__(self, broker, port, on_connect=None, on_message=None):
+        """
+        Initialise l'adaptateur MQTT.
+
+        Args:
+            broker (str): Adresse IP du broker MQTT
+            port (int): Port du broker MQTT
+            on_connect: Callback paho appelé à la connexion
+            on_message: Callback paho appelé à la réception d'un message
+        """
+        self.broker = broker
+        self.port = port
+        self.loop = None
+        self.actif = False
+        self._tache_misc = None
+        self.client = mqtt.Client()
+        self.client.on_connect = on_connect
+        self.client.on_message = on_message
+        self.client.on_socket_open = self._on_socket_open
+        self.client.on_socket_close = self._on_socket_close
+        self.client.on_socket_register_write = self._on_socket_register_write
+        self.client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def _on_socket_open(self, client, userdata, sock):
+        """Enregistre le socket MQTT auprès de la boucle d'événements."""
+        self.loop.add_reader(sock, client.loop_read)
+
+    def _on_socket_close(self, client, userdata, sock):
+        """Retire le socket MQTT de la boucle d'événements."""
+        self.loop.remove_reader(sock)
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        """Surveille le socket en écriture tant que paho a des données à envoyer."""
+        self.loop.add_writer(sock, client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        """Arrête la surveillance en écriture du socket."""
+        self.loop.remove_writer(sock)
+
+    async def _boucle_misc(self):
+        """
+        Tâche de maintenance paho (keepalive, retransmissions, reconnexion).
+        """
+        while self.actif:
+            if self.client.loop_misc() != mqtt.MQTT_ERR_SUCCESS:
+                try:
+                    self.client.reconnect()
+                except Exception as e:
+                    journal.warning("Reconnexion MQTT impossible : %s", e)
+            await asyncio.sleep(1)
+
+    async def connecter(self):
+        """
+        Connecte le client au broker et démarre la tâche de maintenance.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.actif = True
+        self.client.connect(self.broker, self.port, 60)
+        self._tache_misc = self.loop.create_task(self._boucle_misc())
+
+    def deconnecter(self):
+        """
+        Déconnecte proprement le client et arrête la tâche de maintenance.
+        """
+        self.actif = False
+        if self._tache_misc:
+            self._tache_misc.cancel()
+        self.client.disconnect()
+
+
+class SonAsync(Son):
+    """
+    Gestionnaire audio dont la lecture est une tâche asyncio.
+
+    Réutilise le préchargement et le calcul des délais de Son, sans thread
+    de lecture : les séquences sont jouées par executer() sur la boucle.
+    Les priorités suivent FileSons (voir file_sons.py) : un son urgent
+    annule la lecture d'un son moins urgent, et une nouvelle séquence
+    remplace les séquences en attente et annule la séquence en cours.
+    """
+
+    def __init__(self, mqtt_client, mesures=None):
+        """
+        Initialise le gestionnaire audio asynchrone.
+
+        Args:
+            mqtt_client: Client MQTT partagé (déjà géré par le runtime)
+            mesures (Instrumentation, optional): Registre recevant la gigue des notes
+        """
+        super().__init__(mqtt_client=mqtt_client, demarrer_worker=False, mesures=mesures)
+        self.loop = None
+        self._files = {priorite: deque() for priorite in (PRIORITE_ALERTE, PRIORITE_RETOUR, PRIORITE_SEQUENCE)}
+        self._disponible = asyncio.Event()
+        self._lecture = None  # Tâche jouant la séquence en cours
+        self._priorite_en_cours = None
+        self.remplacees = 0
+
+    def play_sequence(self, sequence, priorite=PRIORITE_SEQUENCE):
+        """
+        Ajoute une séquence de sons à la file de lecture asynchrone.
+
+        Args:
+            sequence (list): Séquence de numéros de sons à jouer
+            priorite (int, optional): Priorité (voir file_sons.py). Défaut: PRIORITE_SEQUENCE
+        """
+        self.loop.call_soon_threadsafe(self._deposer, sequence, priorite)
+
+    def _deposer(self, sequence, priorite):
+        """
+        Range une séquence dans sa file et annule la lecture qu'elle préempte (sur la boucle).
+
+        Args:
+            sequence (list): Séquence de numéros de sons à jouer
+            priorite (int): Priorité de la séquence
+        """
+        if priorite == PRIORITE_SEQUENCE:
+            self.remplacees += len(self._files[PRIORITE_SEQUENCE])
+            self._files[PRIORITE_SEQUENCE].clear()
+        self._files[priorite].append(sequence)
+        en_cours = self._priorite_en_cours
+        if self._lecture is not None and (
+                priorite < en_cours or priorite == en_cours == PRIORITE_SEQUENCE):
+            self._lecture.cancel()
+        self._disponible.set()
+
+    def _prendre(self):
+        """
+        Returns:
+            tuple or None: (priorite, sequence) la plus urgente, None si les files sont vides
+        """
+        for priorite, file in self._files.items():
+            if file:
+                return priorite, file.popleft()
+        return None
+
+    async def executer(self):
+        """
+        Tâche de lecture : joue les séquences les plus urgentes, chacune dans une tâche annulable.
+        """
+        self.loop = asyncio.get_running_loop()
+        while self.running:
+            element = self._prendre()
+            if element is None:
+                self._disponible.clear()
+                await self._disponible.wait()
+                continue
+            self._priorite_en_cours, sequence = element
+            self._lecture = self.loop.create_task(self._jouer(sequence))
+            try:
+                # wait() ne propage pas l'annulation de la lecture, seulement celle d'executer()
+                await asyncio.wait({self._lecture})
+            finally:
+                self._lecture.cancel()
+                self._lecture = None
+                self._priorite_en_cours = None
+
+    async def _jouer(self, sequence):
+        """
+        Joue une séquence à ses échéances précalculées.
+
+        Args:
+            sequence (list): Séquence de numéros de sons à jouer
+        """
+        echeances = self.echeances_notes(sequence, time.monotonic())
+        for idx, number in enumerate(sequence):
+            if number not in self.sounds:
+                journal.warning("Son %s non trouvé dans la bibliothèque", number)
+                continue
+            try:
+                await asyncio.sleep(max(0.0, echeances[idx] - time.monotonic()))
+                self._arreter_sons()
+                self._declencher(self.sounds[number])
+                gigue = time.monotonic() - echeances[idx]
+                if self.mesures is not None:
+                    self.mesures.observer("gigue_note", gigue)
+                journal.debug("Lecture du son %s avec un délai de %.2f secondes (gigue %.2f ms)",
+                              number, self.delai_note(idx), gigue * 1000)
+            except asyncio.CancelledError:
+                journal.debug("Séquence %s interrompue", sequence)
+                raise
+            except Exception as e:
+                journal.error("Erreur lors de la lecture du son %s : %s", number, e)
+        await asyncio.sleep(max(0.0, echeances[-1] - time.monotonic()))
+
+
+class JeuSimonAsync(JeuSimon):
+    """
+    Jeu Simon exécuté sur une seule boucle asyncio.
+
+    Reprend la logique de JeuSimon (détection des couleurs, difficulté,
+    publication MQTT) ; les étapes qui attendaient avec time.sleep ou
+    scrutaient une queue sont réécrites en coroutines.
+    """
+
+    def __init__(self):
+        """
+        Initialise le jeu sans ouvrir de connexion : voir executer().
+        """
+        self._init_parametres(mode_test=False)
+        self.etat = EtatJeu()
+        self.running = True
+        # Tous les callbacks s'exécutent sur la boucle d'événements : aucun n'est déclaré lent
+        self.routeur = RouteurMQTT()
+        self.mqtt = ClientMQTTAsync(
+            self.mqtt_broker,
+            self.mqtt_port,
+            on_connect=self.on_connect,
+            on_message=self.routeur.distribuer
+        )
+        self.mqtt_client = self.mqtt.client
+        # La boucle asyncio ne bloque pas sur publish : publication directe, sans thread
+        self.publieur = PublieurMQTT(self.mqtt_client, demarrer_thread=False, mesures=self.mesures)
+        self.sound_manager = SonAsync(self.mqtt_client, self.mesures)
+        self.routeur.ajouter(self.mqtt_topic, self.sound_manager.on_message_sequence)
+        self.routeur.ajouter(self.difficulty_topic, self.on_message_difficulte)
+        self.routeur.ajouter(self.difficulty_topic, self.sound_manager.on_message_difficulte)
+        self.routeur.ajouter(self.start_topic, self.on_message_start)
+        self.routeur.ajouter(self.led_status_topic, self.on_message_led_status)
+        self.socket = socketio.AsyncClient(
+            reconnection_delay=1,
+            reconnection=True,
+            reconnection_attempts=5,
+            reconnection_delay_max=5,
+            logger=False,
+            engineio_logger=False
+        )
+        self._config_socket()
+        self.loop = None
+        self._pas_recu = asyncio.Event()
+        self._difficulte_recue = asyncio.Event()
+        self._fin_affichage_led = asyncio.Event()
+        self._arret = asyncio.Event()
+        self._tache_partie = None
+
+    def on_connect(self, client, userdata, flags, rc):
+        """
+        Callback MQTT de connexion : abonne aussi le runtime aux acquittements des LEDs.
+
+        Args:
+            client: Instance du client MQTT
+            userdata: Données utilisateur associées au client
+            flags: Dictionnaire des flags de connexion
+            rc (int): Code de retour de connexion
+        """
+        super().on_connect(client, userdata, flags, rc)
+        if rc == 0:
+            client.subscribe(self.led_status_topic)
+
+    def traiter_couleur(self, couleur, recu=None):
+        """
+        Valide une couleur détectée puis réveille la coroutine de lecture de séquence.
+
+        Args:
+            couleur (str): Couleur de la zone foulée
+            recu (float, optional): Instant monotone de réception du pas
+        """
+        super().traiter_couleur(couleur, recu)
+        self._pas_recu.set()
+
+    def on_message_difficulte(self, client, userdata, message):
+        """
+        Applique la difficulté reçue puis réveille l'attente de demarrer().
+
+        Args:
+            client: Instance du client MQTT
+            userdata: Données utilisateur associées au client
+            message (MessageMQTT): Message reçu, décodé à la demande
+        """
+        super().on_message_difficulte(client, userdata, message)
+        if self.difficulty_received:
+            self._difficulte_recue.set()
+
+    def _lancer_partie(self):
+        """
+        Exécute demarrer() dans une tâche de la boucle d'événements.
+        """
+        self._tache_partie = self.loop.create_task(self.demarrer())
+
+    def envoyer_erreur_mqtt(self, type_erreur="sequence"):
+        """
+        Joue le son d'erreur tout de suite et planifie sa publication après delai_erreur.
+
+        Comme JeuSimon.envoyer_erreur_mqtt, mais la publication est planifiée
+        sur la boucle d'événements (call_later) plutôt que sur la minuterie :
+        la partie n'attend pas et le client MQTT reste utilisé par la boucle seule.
+
+        Args:
+            type_erreur (str, optional): Type d'erreur pour le logging local.
+                                       Défaut: "sequence"
+        """
+        self.sound_manager.jouer_local(CHARGES_COULEUR[CODE_ERREUR], [CODE_ERREUR], False)
+        self.loop.call_later(self.delai_erreur, self._signaler_erreur)
+
+    async def montrer_sequence(self, temps_sequence):
+        """
+        Envoie la séquence complète puis attend la fin de son affichage.
+
+        Args:
+            temps_sequence (float): Temps d'attente entre chaque couleur (non utilisé ici)
+
+        Note:
+            Même attente que JeuSimon.montrer_sequence : acquittement de fin
+            d'affichage des LEDs, ou durée d'affichage prévue plus
+            marge_acquittement_led sans acquittement.
+        """
+        print("\nAttention ! Voici la séquence :")
+        self._affichage_led_commence = False
+        self._fin_affichage_led.clear()
+        sequence_chiffres = self.convertir_sequence_en_chiffres(self.etat.sequence)
+        charge = self.encodeur_sequence.encoder(sequence_chiffres)
+        self._publier_son(charge, sequence_chiffres, True)
+        journal.debug("MQTT >>> [%s] Séquence envoyée : %s", self.mqtt_topic, TexteDiffere(charge))
+        for i, couleur in enumerate(self.etat.sequence, 1):
+            print(f"{i}. {couleur} ({self.couleur_vers_chiffre[couleur]})")
+        debut = time.monotonic()
+        delai_max = self.duree_affichage_sequence(len(self.etat.sequence)) + self.marge_acquittement_led
+        try:
+            await asyncio.wait_for(self._fin_affichage_led.wait(), delai_max)
+        except asyncio.TimeoutError:
+            journal.warning("Pas d'acquittement de fin d'affichage des LEDs après %.1f s", delai_max)
+        self.mesures.observer("affichage_sequence", time.monotonic() - debut)
+
+    async def lire_sequence_tapis(self, longueur_sequence, temps_total):
+        """
+        Attend les pas du joueur jusqu'à l'échéance de la séquence.
+
+        Args:
+            longueur_sequence (int): Nombre de couleurs attendues dans la séquence
+            temps_total (float): Temps total alloué pour compléter la séquence (en secondes)
+
+        Returns:
+            list or None: Liste des couleurs détectées si succès, None en cas d'échec
+        """
+        sequence_joueur = []
+        self.etat.peut_jouer = True
+        position = 0
+        echeance = time.monotonic() + temps_total
+
+        while position < longueur_sequence:
+            temps_restant = echeance - time.monotonic()
+            print(f"\rTemps restant : {max(temps_restant, 0):.1f} secondes", end='', flush=True)
+
+            if temps_restant <= 0:
+                self.envoyer_erreur_mqtt("timeout")
+                print(f"\nTemps total écoulé ! Vous avez dépassé {temps_total} secondes.")
+                return None
+
+            try:
+                couleur = self.etat.couleurs.get_nowait()
+            except Empty:
+                self._pas_recu.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._pas_recu.wait(),
+                        min(temps_restant, self.intervalle_compte_a_rebours)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.mesures.observer("attente_file", self.etat.retirer_instant_ajout())
+            sequence_joueur.append(couleur)
+
+            if couleur != self.etat.sequence[position]:
+                charge = self.publier_couleur(self.couleur_vers_chiffre[couleur])
+                journal.debug("MQTT >>> [%s] Lecture normale : %s", self.mqtt_topic, TexteDiffere(charge))
+                self.envoyer_erreur_mqtt("wrong_color")
+                print(f"\nErreur ! Couleur attendue : {self.etat.sequence[position]}")
+                print(f"Couleur reçue : {couleur}")
+                return None
+
+            position += 1
+
+        return sequence_joueur
+
+    async def lire_sequence_joueur(self, longueur_sequence):
+        """
+        Lit la séquence du joueur sur le tapis avec le temps alloué par la difficulté.
+
+        Args:
+            longueur_sequence (int): Nombre de couleurs attendues dans la séquence.
+
+        Returns:
+            list or None: La liste des couleurs détectées, None en cas d'erreur ou de timeout.
+        """
+        config = self.config_difficulte[self.difficulte]
+        temps_total = config['temps_attente'] * longueur_sequence
+        print(f"\nTemps disponible pour cette séquence : {temps_total} secondes")
+        return await self.lire_sequence_tapis(longueur_sequence, temps_total)
+
+    async def demarrer_jeu(self):
+        """
+        Gère une partie avec les paramètres de difficulté courants.
+        """
+        score = 0
+        try:
+            config = self.config_difficulte[self.difficulte]
+            self.etat.sequence = []
+            derniere_couleur = None
+
+            print("\n=== Début des messages MQTT ===")
+
+            while True:
+                self.etat.peut_jouer = False
+                self.reinitialiser_queue_couleurs()
+
+                for _ in range(config['nouvelles_couleurs']):
+                    couleurs_disponibles = [c for c in self.couleur_vers_chiffre.keys()
+                                            if c != derniere_couleur]
+                    derniere_couleur = random.choice(couleurs_disponibles)
+                    self.etat.sequence.append(derniere_couleur)
+
+                print("\nNouvelle séquence :")
+                await self.montrer_sequence(config['temps_sequence'])
+                await asyncio.sleep(config['delai_entre_tours'])
+
+                sequence_joueur = await self.lire_sequence_joueur(len(self.etat.sequence))
+                if sequence_joueur is None or sequence_joueur != self.etat.sequence:
+                    print("\nPartie perdue !")
+                    self.publier_score(score)
+                    self.reset_game()
+                    return
+
+                score += len(sequence_joueur)
+                print(f"\nBravo ! Score actuel : {score}")
+
+        except asyncio.CancelledError:
+            self.reset_game()
+            raise
+        except Exception as e:
+            journal.error("Erreur dans le jeu : %s", e)
+            self.publier_score(score, ended_with_error=True)
+            self.reset_game()
+
+    async def _rappels_difficulte(self):
+        """
+        Envoie un rappel de sélection de difficulté toutes les intervalle_rappel_difficulte secondes.
+        """
+        while True:
+            self.send_difficulty_reminder()
+            await asyncio.sleep(self.intervalle_rappel_difficulte)
+
+    async def demarrer(self):
+        """
+        Connecte le SensFloor, attend la difficulté via MQTT puis lance la partie.
+        """
+        print("\nBienvenue dans le Jeu Simon!")
+        try:
+            if not self.socket.connected:
+                journal.info("Connexion au serveur SensFloor %s", self.sensfloor_url)
+                await self.socket.connect(
+                    self.sensfloor_url,
+                    transports=self.sensfloor_transports,
+                    wait=True,
+                    wait_timeout=10
+                )
+                journal.info("Connecté au serveur SensFloor")
+
+            if not self.difficulty_received:
+                print("\nEn attente de la difficulté via MQTT...")
+                rappels = self.loop.create_task(self._rappels_difficulte())
+                try:
+                    await asyncio.wait_for(self._difficulte_recue.wait(), self.difficulty_timeout)
+                    self.mesures.observer("demarrage_partie", time.monotonic() - self.instant_difficulte)
+                except asyncio.TimeoutError:
+                    print("\nPas de difficulté reçue, utilisation du mode facile par défaut")
+                    self.difficulte = "facile"
+                finally:
+                    rappels.cancel()
+
+            print("\nDémarrage du jeu en mode NORMAL")
+            self.etat.reinitialiser()
+            await self.demarrer_jeu()
+        except Exception as e:
+            journal.error("Erreur de connexion : %s", e)
+            self.reset_game()
+
+    async def executer(self):
+        """
+        Point d'entrée du runtime : connecte MQTT, lance l'audio et attend l'arrêt.
+        """
+        self.loop = asyncio.get_running_loop()
+        lecteur_sons = self.loop.create_task(self.sound_manager.executer())
+        try:
+            await self.mqtt.connecter()
+        except Exception as e:
+            journal.error("Erreur de connexion MQTT : %s", e)
+        try:
+            await self._arret.wait()
+        finally:
+            await self._fermer(lecteur_sons)
+
+    async def _fermer(self, lecteur_sons):
+        """
+        Annule les tâches en cours et ferme toutes les connexions.
+
+        Args:
+            lecteur_sons (asyncio.Task): Tâche de lecture audio à annuler
+        """
+        journal.info("Arrêt du jeu demandé")
+        self.game_started = False
+        self.running = False
+        for tache in (self._tache_partie, lecteur_sons):
+            if tache and not tache.done():
+                tache.cancel()
+        try:
+            self.sound_manager.stop()
+        except Exception as e:
+            journal.error("Erreur lors de l'arrêt du gestionnaire de sons : %s", e)
+        try:
+            self.mqtt.deconnecter()
+            journal.info("Déconnexion du broker MQTT effectuée")
+        except Exception as e:
+            journal.error("Erreur lors de la déconnexion MQTT : %s", e)
+        if self.socket.connected:
+            try:
+                await self.socket.disconnect()
+                journal.info("Déconnexion du socket effectuée")
+            except Exception as e:
+                journal.error("Erreur lors de la déconnexion du socket : %s", e)
+        if self.enregistreur:
+            self.enregistreur.fermer()
+        if self.serveur_metriques:
+            self.serveur_metriques.arreter()
+        if self.publicateur_stats:
+            self.publicateur_stats.arreter()
+        journal.info("Arrêt du jeu terminé")
+
+    def stop(self):
+        """
+        Demande l'arrêt du runtime (appelable depuis n'importe quel thread).
+        """
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._arret.set)
+
+
+if __name__ == "__main__":
+    configurer_journal()
+    jeu = JeuSimonAsync()
+    try:
+        journal.info("Jeu Simon (asyncio) démarré, en attente des messages MQTT")
+        asyncio.run(jeu.executer())
+    except KeyboardInterrupt:
+        print("\nArrêt demandé par l'utilisateur")
+    finally:
+        arreter_journal()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mode superviseur : sessions multi-tapis réparties sur plusieurs processus.
+
+Un seul processus Python ne suffit pas à absorber les pas et l'audio de
+plusieurs tapis actifs à cause du GIL. Le superviseur répartit donc les
+tapis entre des processus workers (un par cœur au plus), chacun hébergeant
+ses sessions dans un GestionnaireSessions (voir sessions.py).
+
+Répartition :
+    Un tapis est affecté au worker zlib.crc32(mat) % nb_workers : pour un
+    nombre de workers donné, un tapis est toujours servi par le même worker,
+    y compris après un redémarrage.
+
+Routage :
+    - Le superviseur possède la seule connexion MQTT de l'installation. Les
+      abonnements des sessions d'un worker lui sont relayés par IPC ; chaque
+      message reçu est transmis au seul worker abonné à son topic.
+    - Les publications des sessions remontent au superviseur, qui les publie.
+    - Les pas sont reçus directement par le worker propriétaire du tapis,
+      sur la connexion Socket.IO de son SensFloor.
+
+Santé :
+    Chaque worker émet un battement périodique depuis sa boucle de relais.
+    Un worker mort ou silencieux est redémarré, au plus max_redemarrages fois
+    par fenêtre de fenetre_redemarrages secondes ; au-delà, il est abandonné.
+
+Usage:
+    python superviseur.py tapis1=http://192.168.5.5:8000 tapis2=http://192.168.5.6:8000 \\
+        [--broker 10.0.200.7] [--port 1883] [--workers 4]
+"""
+
+from collections import deque
+from queue import Empty
+from threading import Event, Thread
+from types import SimpleNamespace
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+import zlib
+
+from connexion_mqtt import GestionnaireMQTT
+from journal import arreter_journal, configurer_journal
+from sessions import lire_mats
+
+# Mêmes valeurs par défaut que JeuSimon
+BROKER_PAR_DEFAUT = "10.0.200.7"
+PORT_PAR_DEFAUT = 1883
+
+journal = logging.getLogger(__name__)
+
+
+def affecter_worker(mat, nb_workers):
+    """
+    Retourne l'indice du worker propriétaire d'un tapis.
+
+    Args:
+        mat (str): Identifiant du tapis
+        nb_workers (int): Nombre de workers
+
+    Returns:
+        int: Indice du worker, entre 0 et nb_workers - 1
+    """
+    return zlib.crc32(mat.encode('utf-8')) % nb_workers
+
+
+def repartir(mats, nb_workers):
+    """
+    Répartit les tapis entre les workers.
+
+    Args:
+        mats (dict): Identifiant du tapis -> URL de son SensFloor
+        nb_workers (int): Nombre de workers
+
+    Returns:
+        dict: Indice du worker -> tapis qui lui sont affectés (workers sans tapis omis)
+    """
+    repartition = {}
+    for mat, url in mats.items():
+        repartition.setdefault(affecter_worker(mat, nb_workers), {})[mat] = url
+    return repartition
+
+
+class ClientIPC:
+    """
+    Client MQTT d'un worker : abonnements et publications relayés au superviseur.
+
+    Expose la partie de l'interface paho utilisée par GestionnaireMQTT et PublieurMQTT.
+    """
+
+    def __init__(self, indice, sortie):
+        """
+        Args:
+            indice (int): Indice du worker
+            sortie: File worker -> superviseur
+        """
+        self.indice = indice
+        self.sortie = sortie
+        self.on_connect = None
+        self.on_message = None
+
+    def is_connected(self):
+        return True
+
+    def subscribe(self, filtre):
+        self.sortie.put(("abonner", self.indice, filtre))
+
+    def unsubscribe(self, filtre):
+        self.sortie.put(("desabonner", self.indice, filtre))
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.sortie.put(("publier", self.indice, topic, payload, qos, retain))
+
+
+class GestionnaireMQTTIPC(GestionnaireMQTT):
+    """
+    Gestionnaire MQTT d'un worker, sans connexion au broker.
+
+    Les messages transmis par le superviseur sont distribués par relayer().
+    """
+
+    def __init__(self, broker, port, indice, sortie):
+        """
+        Args:
+            broker (str): Adresse du broker MQTT (clé du gestionnaire partagé)
+            port (int): Port du broker MQTT
+            indice (int): Indice du worker
+            sortie: File worker -> superviseur
+        """
+        super().__init__(broker, port, client=ClientIPC(indice, sortie))
+
+    def demarrer(self):
+        self.demarre = True
+
+    def arreter(self):
+        if not self.demarre:
+            return
+        self.demarre = False
+        self.routeur.arreter()
+
+    def relayer(self, topic, payload):
+        """
+        Distribue un message transmis par le superviseur.
+
+        Args:
+            topic (str): Topic du message
+            payload (bytes): Contenu du message
+        """
+        self.routeur.distribuer(self.client, None, SimpleNamespace(topic=topic, payload=payload))
+
+
+def executer_worker(indice, mats, broker, port, entree, sortie, periode_battement=1.0):
+    """
+    Point d'entrée d'un processus worker.
+
+    Héberge les sessions des tapis affectés, relaie les messages reçus du
+    superviseur et émet un battement toutes les periode_battement secondes.
+    Un None sur la file d'entrée arrête le worker.
+
+    Args:
+        indice (int): Indice du worker
+        mats (dict): Tapis affectés -> URL de leur SensFloor
+        broker (str): Adresse du broker MQTT
+        port (int): Port du broker MQTT
+        entree: File superviseur -> worker
+        sortie: File worker -> superviseur
+        periode_battement (float, optional): Intervalle entre deux battements. Défaut: 1.0
+    """
+    from sessions import GestionnaireSessions
+
+    # Processus lancé par "spawn" : la journalisation du superviseur n'est pas héritée
+    configurer_journal()
+    sessions = None
+    dernier_battement = 0.0
+    try:
+        mqtt = GestionnaireMQTTIPC(broker, port, indice, sortie)
+        GestionnaireMQTT.installer(mqtt)
+        sessions = GestionnaireSessions(mats, broker, port)
+        while True:
+            maintenant = time.monotonic()
+            if maintenant - dernier_battement >= periode_battement:
+                sortie.put(("battement", indice))
+                dernier_battement = maintenant
+            try:
+                element = entree.get(timeout=periode_battement)
+            except Empty:
+                continue
+            if element is None:
+                break
+            mqtt.relayer(*element)
+    except KeyboardInterrupt:
+        pass  # Interruption transmise par le terminal : le superviseur arrête les workers
+    finally:
+        if sessions is not None:
+            sessions.arreter()
+        arreter_journal()
+
+
+class Worker:
+    """
+    État d'un processus worker vu du superviseur.
+    """
+
+    def __init__(self, indice, mats):
+        self.indice = indice
+        self.mats = mats
+        self.processus = None
+        self.entree = None
+        self.sortie = None
+        self.lecteur = None
+        self.abonnements = {}  # Filtre -> callback enregistré auprès du routeur
+        self.dernier_battement = None
+        self.lancement = None
+        self.redemarrages = deque()
+        self.abandonne = False
+
+
+class Superviseur:
+    """
+    Répartit les sessions de jeu entre des processus workers et relaie leur trafic MQTT.
+    """
+
+    def __init__(self, mats, nb_workers=None, mqtt_broker=None, mqtt_port=None,
+                 delai_battement=10.0, delai_demarrage=60.0, max_redemarrages=5,
+                 fenetre_redemarrages=300.0, periode_surveillance=1.0,
+                 cible=executer_worker):
+        """
+        Se connecte au broker et lance un worker par groupe de tapis.
+
+        Args:
+            mats (dict): Identifiant du tapis -> URL de son SensFloor
+            nb_workers (int, optional): Nombre de workers. Défaut: nombre de cœurs
+            mqtt_broker (str, optional): Adresse du broker MQTT. Défaut: "10.0.200.7"
+            mqtt_port (int, optional): Port du broker MQTT. Défaut: 1883
+            delai_battement (float, optional): Silence au-delà duquel un worker est
+                                               considéré bloqué (en secondes). Défaut: 10.0
+            delai_demarrage (float, optional): Délai accordé au premier battement d'un
+                                               worker (en secondes). Défaut: 60.0
+            max_redemarrages (int, optional): Redémarrages tolérés par fenêtre. Défaut: 5
+            fenetre_redemarrages (float, optional): Durée de la fenêtre (en secondes). Défaut: 300.0
+            periode_surveillance (float, optional): Intervalle entre deux contrôles de santé.
+                                                    Défaut: 1.0
+            cible (callable, optional): Point d'entrée des workers. Défaut: executer_worker
+        """
+        self.nb_workers = nb_workers or os.cpu_count() or 1
+        self.mqtt_broker = mqtt_broker or BROKER_PAR_DEFAUT
+        self.mqtt_port = mqtt_port or PORT_PAR_DEFAUT
+        self.delai_battement = delai_battement
+        self.delai_demarrage = delai_demarrage
+        self.max_redemarrages = max_redemarrages
+        self.fenetre_redemarrages = fenetre_redemarrages
+        self.cible = cible
+        # "spawn" : un fork hériterait des threads réseau et audio du superviseur
+        self.contexte = multiprocessing.get_context("spawn")
+        self.mqtt = GestionnaireMQTT.obtenir(self.mqtt_broker, self.mqtt_port)
+        self.mqtt.demarrer()
+        self.workers = {
+            indice: Worker(indice, mats_worker)
+            for indice, mats_worker in repartir(mats, self.nb_workers).items()
+        }
+        for worker in self.workers.values():
+            self._lancer(worker)
+        self._arret = Event()
+        self._surveillance = Thread(target=self._boucle_surveillance,
+                                    args=(periode_surveillance,), daemon=True)
+        self._surveillance.start()
+
+    def _lancer(self, worker):
+        worker.entree = self.contexte.Queue()
+        worker.sortie = self.contexte.Queue()
+        worker.dernier_battement = None
+        worker.lancement = time.monotonic()
+        worker.processus = self.contexte.Process(
+            target=self.cible,
+            args=(worker.indice, worker.mats, self.mqtt_broker, self.mqtt_port,
+                  worker.entree, worker.sortie),
+            name=f"simon-worker-{worker.indice}",
+            daemon=True
+        )
+        worker.processus.start()
+        worker.lecteur = Thread(target=self._lire_sortie, args=(worker, worker.sortie), daemon=True)
+        worker.lecteur.start()
+        journal.info("Worker %s lancé pour les tapis : %s", worker.indice, ', '.join(worker.mats))
+
+    def _lire_sortie(self, worker, sortie):
+        while True:
+            element = sortie.get()
+            if element is None:
+                return
+            try:
+                self.traiter(worker, element)
+            except Exception as e:
+                journal.error("Erreur de relais du worker %s : %s", worker.indice, e)
+
+    def traiter(self, worker, element):
+        """
+        Exécute une demande remontée par un worker.
+
+        Args:
+            worker (Worker): Worker émetteur
+            element (tuple): Demande ("publier", "abonner", "desabonner" ou "battement")
+        """
+        nature = element[0]
+        if nature == "publier":
+            self.mqtt.publish(*element[2:])
+        elif nature == "abonner":
+            filtre = element[2]
+            if filtre not in worker.abonnements:
+                entree = worker.entree
+                callback = lambda client, userdata, message: entree.put((message.topic, message.payload))
+                worker.abonnements[filtre] = callback
+                self.mqtt.abonner(filtre, callback)
+        elif nature == "desabonner":
+            callback = worker.abonnements.pop(element[2], None)
+            if callback is not None:
+                self.mqtt.desabonner(element[2], callback)
+        elif nature == "battement":
+            worker.dernier_battement = time.monotonic()
+
+    def _boucle_surveillance(self, periode):
+        while not self._arret.wait(periode):
+            self.surveiller()
+
+    def surveiller(self):
+        """
+        Redémarre les workers morts ou silencieux, dans la limite de la politique de redémarrage.
+        """
+        maintenant = time.monotonic()
+        for worker in self.workers.values():
+            if worker.abandonne:
+                continue
+            if worker.dernier_battement is None:
+                bloque = maintenant - worker.lancement > self.delai_demarrage
+            else:
+                bloque = maintenant - worker.dernier_battement > self.delai_battement
+            if worker.processus.is_alive() and not bloque:
+                continue
+            cause = "bloqué" if worker.processus.is_alive() else f"arrêté (code {worker.processus.exitcode})"
+            self._terminer(worker)
+            while worker.redemarrages and maintenant - worker.redemarrages[0] > self.fenetre_redemarrages:
+                worker.redemarrages.popleft()
+            if len(worker.redemarrages) >= self.max_redemarrages:
+                worker.abandonne = True
+                journal.error("Worker %s %s : trop de redémarrages, abandon des tapis %s",
+                              worker.indice, cause, ', '.join(worker.mats))
+                continue
+            worker.redemarrages.append(maintenant)
+            journal.warning("Worker %s %s : redémarrage", worker.indice, cause)
+            self._lancer(worker)
+
+    def _terminer(self, worker, timeout=2.0):
+        if worker.processus.is_alive():
+            worker.processus.terminate()
+        worker.processus.join(timeout)
+        for filtre, callback in worker.abonnements.items():
+            self.mqtt.desabonner(filtre, callback)
+        worker.abonnements = {}
+        worker.sortie.put(None)  # Arrête le thread lecteur
+
+    def arreter(self, timeout=5.0):
+        """
+        Arrête les workers (leurs sessions s'arrêtent proprement) puis la connexion MQTT.
+
+        Args:
+            timeout (float, optional): Attente maximale de chaque worker (en secondes). Défaut: 5.0
+        """
+        self._arret.set()
+        self._surveillance.join()
+        for worker in self.workers.values():
+            if worker.processus.is_alive():
+                worker.entree.put(None)
+        for worker in self.workers.values():
+            worker.processus.join(timeout)
+            self._terminer(worker)
+            worker.lecteur.join(timeout)  # Publications restantes relayées avant la déconnexion
+        self.mqtt.liberer()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Superviseur Simon multi-tapis multi-processus")
+    parser.add_argument('mats', nargs='+', help="Tapis au format identifiant=url_sensfloor")
+    parser.add_argument('--broker', default=None, help="Adresse du broker MQTT")
+    parser.add_argument('--port', type=int, default=None, help="Port du broker MQTT")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de workers. Défaut: nombre de cœurs")
+    args = parser.parse_args()
+
+    configurer_journal()
+    superviseur = None
+    try:
+        superviseur = Superviseur(lire_mats(args.mats), args.workers, args.broker, args.port)
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nArrêt demandé par l'utilisateur")
+    finally:
+        if superviseur:
+            superviseur.arreter()
+            journal.info("Workers arrêtés proprement")
+        arreter_journal()
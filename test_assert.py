@@ -1,10 +1,35 @@
 import unittest
 from queue import Queue
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import pygame.mixer
 from datetime import datetime
+import asyncio
 import json
+import logging
+import os
+import tempfile
+import time
+import urllib.request
+import threading
+from threading import Event
 from simon import JeuSimon, EtatJeu, Son
+from simon_async import JeuSimonAsync
+from zones import CarteZones, CONFIG_PAR_DEFAUT
+from occupation import SuiviOccupation
+from antirebond import AntiRebond
+from clavier import LecteurClavier
+from minuterie import Minuterie
+from journal import TexteDiffere, arreter_journal, configurer_journal
+from mesures import Instrumentation, ServeurMetriques
+from demarrage import CHRONOMETRE, ModuleDiffere
+from connexion_mqtt import GestionnaireMQTT
+from routage_mqtt import MessageMQTT, RouteurMQTT
+from sessions import GestionnaireSessions, SessionSimon
+from superviseur import GestionnaireMQTTIPC, Superviseur, affecter_worker, repartir
+from publication import CHARGES_COULEUR, EncodeurSequence, PublieurMQTT
+import cache_sons
+from file_sons import PRIORITE_ALERTE, PRIORITE_RETOUR, PRIORITE_SEQUENCE, FileSons
+from enregistrement import Enregistreur, Rejoueur, lire_evenements, TYPE_PAS, TYPE_OBJETS
 
 class TestEtatJeu(unittest.TestCase):
     def setUp(self):
@@ -35,21 +60,285 @@ class TestEtatJeu(unittest.TestCase):
         self.assertIsNone(self.etat.derniere_couleur_detectee)
 
     def test_ajouter_couleur(self):
-        """Test color addition with time delay"""
-        with patch('time.time') as mock_time:
-            mock_time.return_value = 1.0
-            self.etat.ajouter_couleur('rouge')
-            self.assertEqual(self.etat.derniere_couleur_ajoutee, 'rouge')
-            self.assertEqual(self.etat.position, 1)
-            
-            mock_time.return_value = 1.1
-            self.etat.ajouter_couleur('rouge')
-            self.assertEqual(self.etat.position, 1)
-            
-            mock_time.return_value = 1.6
-            self.etat.ajouter_couleur('vert')
-            self.assertEqual(self.etat.derniere_couleur_ajoutee, 'vert')
-            self.assertEqual(self.etat.position, 2)
+        """Test that every validated color is queued, repeats included"""
+        self.etat.ajouter_couleur('rouge')
+        self.assertEqual(self.etat.derniere_couleur_ajoutee, 'rouge')
+        self.assertEqual(self.etat.position, 1)
+
+        self.etat.ajouter_couleur('rouge')
+        self.assertEqual(self.etat.position, 2)
+
+        self.etat.ajouter_couleur('vert')
+        self.assertEqual(self.etat.derniere_couleur_ajoutee, 'vert')
+        self.assertEqual(self.etat.position, 3)
+        self.assertEqual(list(self.etat.couleurs.queue), ['rouge', 'rouge', 'vert'])
+
+class TestAntiRebond(unittest.TestCase):
+    def setUp(self):
+        """Initialize test environment before each test"""
+        self.anti_rebond = AntiRebond(4, duree_entree=0.05, duree_sortie=0.15)
+
+    def test_pas_rapides(self):
+        """Test chained steps at 250 ms, same zone repeats and bounces"""
+        self.assertTrue(self.anti_rebond.pas(0, 10.00))
+        self.assertFalse(self.anti_rebond.pas(0, 10.05))   # rebond du même appui
+        self.assertTrue(self.anti_rebond.pas(1, 10.30))    # autre zone, enchaînement rapide
+        self.assertTrue(self.anti_rebond.pas(0, 10.55))    # même couleur rejouée
+        self.assertFalse(self.anti_rebond.pas(0, 10.65))
+
+    def test_presence_hysteresis(self):
+        """Test enter/exit dwell times on the occupancy stream"""
+        self.assertFalse(self.anti_rebond.presence(2, 1.00, True))
+        self.assertEqual(self.anti_rebond.actualiser(1.02), [])
+        self.assertEqual(self.anti_rebond.actualiser(1.06), [2])
+        self.assertFalse(self.anti_rebond.presence(2, 1.10, False))
+        self.assertFalse(self.anti_rebond.presence(2, 1.15, True))   # retour avant duree_sortie
+        self.assertFalse(self.anti_rebond.presence(2, 1.20, False))
+        self.assertFalse(self.anti_rebond.presence(2, 1.40, True))   # nouvel appui
+        self.assertEqual(self.anti_rebond.actualiser(1.46), [2])
+
+class TestCarteZones(unittest.TestCase):
+    def test_carte_par_defaut(self):
+        """Test that the default map reproduces the 2x2 layout"""
+        carte = CarteZones.depuis_dict(CONFIG_PAR_DEFAUT)
+        self.assertEqual(carte.classer(0.2, 1.2), 'vert')
+        self.assertEqual(carte.classer(0.2, 1.8), 'rouge')
+        self.assertEqual(carte.classer(0.8, 1.2), 'jaune')
+        self.assertEqual(carte.classer(0.8, 0.1), 'bleu')
+        self.assertEqual(carte.classer(1.0, 2.0), 'bleu')
+        self.assertEqual(carte.classer(-0.1, 1.0), 'inconnu')
+
+    def test_frontieres_historiques(self):
+        """Test that the default map keeps the old detecter_couleur boundaries exactly"""
+        def detecter_couleur(x, y):
+            if 0 <= x <= 0.5:
+                return 'vert' if 1 <= y <= 1.5 else 'rouge'
+            elif 0.5 < x <= 1:
+                return 'jaune' if 1 <= y <= 1.5 else 'bleu'
+            return 'inconnu'
+
+        carte = CarteZones.depuis_dict(CONFIG_PAR_DEFAUT)
+        xs = [0.0, 0.004, 0.499, 0.5, 0.501, 0.505, 0.999, 1.0]
+        ys = [0.0, 0.995, 1.0, 1.004, 1.495, 1.5, 1.501, 1.505, 2.0]
+        points = [(x, y) for x in xs for y in ys]
+        for x, y in points:
+            self.assertEqual(carte.classer(x, y), detecter_couleur(x, y), (x, y))
+        indices = carte.indices_zones([x for x, _ in points], [y for _, y in points]).tolist()
+        self.assertEqual(indices, [carte.indice_zone(x, y) for x, y in points])
+
+    def test_grille_4x4_et_polygone(self):
+        """Test a 4x4 board and a polygon zone compiled into the grid"""
+        couleurs = ['vert', 'rouge', 'bleu', 'jaune']
+        zones = [
+            {"couleur": couleurs[(ligne + colonne) % 4],
+             "rectangles": [[colonne * 0.5, ligne * 0.5, (colonne + 1) * 0.5, (ligne + 1) * 0.5]]}
+            for ligne in range(4) for colonne in range(4)
+        ]
+        zones.insert(0, {"nom": "triangle", "couleur": "jaune",
+                         "polygone": [[0.0, 0.0], [0.4, 0.0], [0.0, 0.4]]})
+        carte = CarteZones.depuis_dict({"largeur": 2.0, "hauteur": 2.0, "zones": zones})
+        self.assertEqual(len(carte.grille), 200 * 200)
+        self.assertEqual(carte.classer(0.05, 0.05), 'jaune')
+        self.assertEqual(carte.classer(0.45, 0.45), 'vert')
+        self.assertEqual(carte.classer(1.7, 0.2), 'jaune')
+        self.assertEqual(carte.zones[carte.indice_zone(1.7, 1.7)].couleur, 'bleu')
+
+class TestSuiviOccupation(unittest.TestCase):
+    def setUp(self):
+        """Initialize test environment before each test"""
+        self.carte = CarteZones.depuis_dict(CONFIG_PAR_DEFAUT)
+        self.evenements = []
+        self.suivi = SuiviOccupation(self.carte, self.evenements.append)
+
+    def test_classement_vectorise(self):
+        """Test that batch classification matches the scalar lookup"""
+        points = [(0.2, 1.2), (0.2, 0.8), (0.8, 1.2), (0.8, 0.1), (1.0, 2.0), (2.0, 2.0), (-1.0, 0.5)]
+        xs, ys = zip(*points)
+        indices = self.carte.indices_zones(xs, ys).tolist()
+        self.assertEqual(indices, [self.carte.indice_zone(x, y) for x, y in points])
+
+    def test_changements_occupation(self):
+        """Test zone entry and exit events between frames"""
+        self.suivi.ingerer([{'x': 0.2, 'y': 1.2}, {'x': 0.3, 'y': 1.3}, {'x': 0.8, 'y': 0.1}])
+        self.assertEqual(sorted((e.couleur, e.apres) for e in self.evenements), [('bleu', 1), ('vert', 2)])
+        self.assertTrue(all(e.entree for e in self.evenements))
+        self.evenements.clear()
+        self.suivi.ingerer([{'x': 0.2, 'y': 1.2}])
+        self.assertEqual(sorted((e.couleur, e.avant, e.apres) for e in self.evenements),
+                         [('bleu', 1, 0), ('vert', 2, 1)])
+        self.assertTrue(self.evenements[0].sortie or self.evenements[1].sortie)
+
+class TestEnregistrement(unittest.TestCase):
+    def setUp(self):
+        """Initialize test environment before each test"""
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = os.path.join(self.dossier.name, "session.simonlog")
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def test_aller_retour(self):
+        """Test that recorded events are read back in order"""
+        enregistreur = Enregistreur(self.chemin)
+        enregistreur.pas(0.2, 1.2)
+        enregistreur.objets([{'x': 0.8, 'y': 0.5, 'id': 3}, [0.1, 0.2]])
+        enregistreur.fermer()
+        Enregistreur(self.chemin).fermer()  # Réouverture en ajout sans nouvel en-tête
+        evenements = list(lire_evenements(self.chemin))
+        self.assertEqual([e[1] for e in evenements], [TYPE_PAS, TYPE_OBJETS])
+        self.assertEqual(evenements[0][2], (0.2, 1.2))
+        self.assertAlmostEqual(evenements[1][2][0]['x'], 0.8, places=5)
+        self.assertLessEqual(evenements[0][0], evenements[1][0])
+
+    def test_rejeu(self):
+        """Test replay into a game at full speed"""
+        enregistreur = Enregistreur(self.chemin)
+        enregistreur.pas(0.2, 1.2)
+        enregistreur.objets([])
+        enregistreur.pas(0.8, 0.5)
+        enregistreur.fermer()
+        jeu = Mock()
+        stats = Rejoueur(self.chemin, jeu, vitesse=0).rejouer()
+        self.assertEqual((stats["pas"], stats["objets"]), (2, 1))
+        self.assertEqual(jeu.traiter_pas.call_args.args, (0.8, 0.5))
+        self.assertIn('instant', jeu.traiter_pas.call_args.kwargs)
+        self.assertEqual(jeu.traiter_objets.call_args.args, ([],))
+
+    def test_rejeu_horodatages_non_decroissants(self):
+        """Test that replay instants never go backwards when the recorded clock jumps back"""
+        with patch('enregistrement.time.monotonic', side_effect=[100.0, 101.5, 5.0, 5.25]):
+            enregistreur = Enregistreur(self.chemin)
+            for x in (0.1, 0.2, 0.3, 0.4):
+                enregistreur.pas(x, 0.5)
+            enregistreur.fermer()
+        jeu = Mock()
+        Rejoueur(self.chemin, jeu, vitesse=0).rejouer()
+        instants = [appel.kwargs['instant'] for appel in jeu.traiter_pas.call_args_list]
+        self.assertEqual(instants, [100.0, 101.5, 101.5, 101.75])
+
+class TestGestionnaireMQTT(unittest.TestCase):
+    @patch('paho.mqtt.client.Client')
+    def test_connexion_unique_partagee(self, mock_mqtt):
+        """Test that users of one broker share a single client and network loop"""
+        gestionnaire = GestionnaireMQTT.obtenir("broker-test", 1883)
+        self.assertIs(GestionnaireMQTT.obtenir("broker-test", 1883), gestionnaire)
+        gestionnaire.demarrer()
+        gestionnaire.demarrer()
+        self.assertEqual(mock_mqtt.call_count, 1)
+        gestionnaire.client.loop_start.assert_called_once()
+        gestionnaire.liberer()
+        gestionnaire.client.disconnect.assert_not_called()
+        gestionnaire.liberer()
+        gestionnaire.client.disconnect.assert_called_once()
+        self.assertIsNot(GestionnaireMQTT.obtenir("broker-test", 1883), gestionnaire)
+
+    @patch('paho.mqtt.client.Client')
+    def test_distribution_par_filtre(self, mock_mqtt):
+        """Test dispatch to handlers registered on exact and wildcard filters"""
+        gestionnaire = GestionnaireMQTT("broker-test")
+        sequence, tout = Mock(), Mock()
+        gestionnaire.abonner("Tapis/sequence", sequence)
+        gestionnaire.abonner("Tapis/#", tout)
+        message = Mock(topic="Tapis/score", payload=b"{}")
+        gestionnaire._on_message(gestionnaire.client, None, message)
+        sequence.assert_not_called()
+        tout.assert_called_once()
+        self.assertEqual(tout.call_args.args[2].topic, "Tapis/score")
+        gestionnaire._on_connect(gestionnaire.client, None, {}, 0)
+        gestionnaire.client.subscribe.assert_called_with([("Tapis/sequence", 0), ("Tapis/#", 0)])
+
+class TestRouteurMQTT(unittest.TestCase):
+    def setUp(self):
+        """Initialize test environment before each test"""
+        self.routeur = RouteurMQTT()
+
+    def tearDown(self):
+        self.routeur.arreter()
+
+    def test_jokers(self):
+        """Test exact, '+' and '#' filters, including the '$' topic rule"""
+        for filtre in ("site/start", "site/+", "Tapis/#", "#", "+/+/stats"):
+            self.routeur.ajouter(filtre, filtre)
+        filtres = lambda topic: sorted(r.callback for r in self.routeur.correspondances(topic))
+        self.assertEqual(filtres("site/start"), ["#", "site/+", "site/start"])
+        self.assertEqual(filtres("Tapis"), ["#", "Tapis/#"])
+        self.assertEqual(filtres("Tapis/1/stats"), ["#", "+/+/stats", "Tapis/#"])
+        self.assertEqual(filtres("$SYS/broker"), [])
+        self.assertTrue(self.routeur.retirer("site/+", "site/+"))
+        self.assertEqual(filtres("site/start"), ["#", "site/start"])
+
+    def test_decodage_paresseux(self):
+        """Test that payloads are parsed only for matched handlers, once"""
+        recus = []
+        self.routeur.ajouter("Tapis/sequence", lambda c, u, m: recus.append(m.json))
+        self.routeur.ajouter("Tapis/sequence", lambda c, u, m: recus.append(m.json))
+        with patch('routage_mqtt.json.loads', wraps=json.loads) as loads:
+            self.routeur.distribuer(None, None, Mock(topic="autre", payload=b"invalide"))
+            self.routeur.distribuer(None, None, Mock(topic="Tapis/sequence", payload=b'{"couleur": [1]}'))
+        self.assertEqual(loads.call_count, 1)
+        self.assertIs(recus[0], recus[1])
+
+    def test_callback_lent_non_bloquant(self):
+        """Test that a stalled slow handler does not delay other topics"""
+        bloque, rapide = Event(), Event()
+        self.routeur.ajouter("bruit", lambda c, u, m: bloque.wait(2), lent=True)
+        self.routeur.ajouter("site/start", lambda c, u, m: rapide.set(), lent=True)
+        for _ in range(100):
+            self.routeur.distribuer(None, None, Mock(topic="bruit", payload=b""))
+        self.routeur.distribuer(None, None, Mock(topic="site/start", payload=b"true"))
+        self.assertTrue(rapide.wait(1))
+        bloque.set()
+
+class TestPublication(unittest.TestCase):
+    def test_charges_identiques_json(self):
+        """Test that prebuilt payloads match json.dumps byte for byte"""
+        for code in range(6):
+            self.assertEqual(CHARGES_COULEUR[code], json.dumps({"couleur": [code], "pas": False}).encode())
+        encodeur = EncodeurSequence()
+        for codes in ([2], [2, 0], [2, 0, 3, 1], [1], [], [10, 4]):
+            self.assertEqual(encodeur.encoder(codes), json.dumps({"couleur": codes, "pas": True}).encode())
+
+    def test_publieur_file_bornee(self):
+        """Test direct publication and in-order draining by the publisher thread"""
+        client = Mock()
+        publieur = PublieurMQTT(client, taille_max=2, demarrer_thread=False)
+        publieur.publier("Tapis/sequence", b"direct")
+        client.publish.assert_called_once_with("Tapis/sequence", b"direct")
+        client = Mock()
+        publieur = PublieurMQTT(client)
+        for i in range(5):
+            self.assertTrue(publieur.publier("Tapis/sequence", str(i).encode()))
+        publieur.arreter()
+        self.assertEqual([c.args[1] for c in client.publish.call_args_list], [b"0", b"1", b"2", b"3", b"4"])
+
+class TestMesures(unittest.TestCase):
+    def setUp(self):
+        """Initialize test environment before each test"""
+        self.mesures = Instrumentation()
+
+    def test_histogramme(self):
+        """Test bucketing and recent quantiles"""
+        for _ in range(99):
+            self.mesures.observer("classification", 0.0003)
+        self.mesures.observer("classification", 0.2)
+        histogramme = self.mesures.histogrammes["classification"]
+        self.assertEqual(histogramme.nombre, 100)
+        self.assertEqual(histogramme.quantile(0.5), 0.0005)
+        self.assertEqual(histogramme.quantile(1.0), 0.25)
+        self.assertEqual(self.mesures.resume()["classification"]["p50"], 0.5)
+
+    def test_export_prometheus_http(self):
+        """Test the Prometheus text exposition served on the local port"""
+        self.mesures.observer("publication", 0.002)
+        serveur = ServeurMetriques(self.mesures, port=0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{serveur.port}/metrics") as reponse:
+                texte = reponse.read().decode('utf-8')
+        finally:
+            serveur.arreter()
+        self.assertIn('simon_etape_duree_secondes_bucket{etape="publication",le="0.0025"} 1', texte)
+        self.assertIn('simon_etape_duree_secondes_bucket{etape="publication",le="0.001"} 0', texte)
+        self.assertIn('simon_etape_duree_secondes_count{etape="publication"} 1', texte)
 
 class TestJeuSimon(unittest.TestCase):
     @patch('pygame.mixer.init')
@@ -59,7 +348,13 @@ class TestJeuSimon(unittest.TestCase):
     def setUp(self, mock_mqtt, mock_set_channels, mock_sound, mock_mixer_init):
         """Initialize test environment before each test"""
         self.jeu = JeuSimon(mode_test=True)
-        self.jeu.mqtt_client = Mock()
+        self.jeu.mqtt_client = self.jeu.publieur.mqtt_client = Mock()
+
+    def test_son_sur_connexion_partagee(self):
+        """Test that the game and its sound manager share one MQTT connection"""
+        self.assertIs(self.jeu.sound_manager.gestionnaire_mqtt, self.jeu.mqtt)
+        routes = self.jeu.mqtt.routeur.correspondances(self.jeu.mqtt_topic)
+        self.assertIn(self.jeu.sound_manager.on_message_sequence, [r.callback for r in routes])
 
     def test_detecter_couleur(self):
         """Test color detection from coordinates"""
@@ -80,17 +375,170 @@ class TestJeuSimon(unittest.TestCase):
         """Test MQTT sequence publication"""
         sequence = ['vert', 'rouge']
         self.jeu.publier_sequence_mqtt(sequence, 2, 0)
+        self.jeu.publieur.vider()
         self.jeu.mqtt_client.publish.assert_called_with(
             self.jeu.mqtt_topic,
-            json.dumps({"couleur": [0, 1], "pas": True})
+            json.dumps({"couleur": [0, 1], "pas": True}).encode()
         )
 
         self.jeu.publier_sequence_mqtt(sequence, 3, 0)
+        self.jeu.publieur.vider()
         self.jeu.mqtt_client.publish.assert_called_with(
             self.jeu.mqtt_topic,
-            json.dumps({"couleur": [4], "pas": False})
+            json.dumps({"couleur": [4], "pas": False}).encode()
         )
 
+    def test_lire_sequence_tapis_evenementiel(self):
+        """Test that a queued step is validated without waiting for a poll"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.etat.sequence = ['vert', 'rouge']
+        self.jeu.etat.couleurs.put('vert')
+        self.jeu.etat.couleurs.put('rouge')
+        debut = time.monotonic()
+        self.assertEqual(self.jeu.lire_sequence_tapis(2, 5.0), ['vert', 'rouge'])
+        self.assertLess(time.monotonic() - debut, 0.05)
+
+    def test_handler_pas_restaure_apres_difficulte(self):
+        """Test that the step handler restored after the difficulty choice keeps the receive instant"""
+        socket = self.jeu._creer_socket()
+        self.jeu.sound_manager = Mock()
+
+        def marcher_sur_vert():
+            while socket.handlers['/']['step'] == self.jeu.on_pas:
+                time.sleep(0.005)
+            socket.handlers['/']['step'](0.2, 1.2)
+
+        marcheur = threading.Thread(target=marcher_sur_vert, daemon=True)
+        marcheur.start()
+        self.assertEqual(self.jeu.choisir_difficulte_avec_tapis(), "facile")
+        marcheur.join(1.0)
+        self.assertEqual(socket.handlers['/']['step'], self.jeu.on_pas)
+        with patch.object(self.jeu, 'traiter_pas') as traiter_pas:
+            socket.handlers['/']['step'](0.2, 1.2)
+        self.assertIn('recu', traiter_pas.call_args.kwargs)
+
+    def test_lire_sequence_tapis_timeout(self):
+        """Test that the sequence deadline comes from temps_total and the error signal is scheduled"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.publieur = Mock()
+        publie = Event()
+        self.jeu.publieur.publier.side_effect = lambda *args: publie.set()
+        self.jeu.delai_erreur = 0.01
+        self.jeu.etat.sequence = ['vert']
+        self.assertIsNone(self.jeu.lire_sequence_tapis(1, 0.05))
+        self.jeu.sound_manager.jouer_local.assert_called_with(CHARGES_COULEUR[4], [4], False)
+        self.assertTrue(publie.wait(1.0))
+        self.jeu.publieur.publier.assert_called_with(self.jeu.mqtt_topic, CHARGES_COULEUR[4])
+
+    def test_alerte_erreur_immediate(self):
+        """Test that the error sound is queued at once and only the MQTT publish is delayed"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.publieur = Mock()
+        with patch('simon.Minuterie.obtenir') as obtenir:
+            self.jeu.envoyer_erreur_mqtt("wrong_color")
+        self.jeu.sound_manager.jouer_local.assert_called_once_with(CHARGES_COULEUR[4], [4], False)
+        self.jeu.publieur.publier.assert_not_called()
+        obtenir.return_value.planifier.assert_called_once_with(self.jeu.delai_erreur, self.jeu._signaler_erreur)
+
+    def test_montrer_sequence_acquittement_led(self):
+        """Test that input opens on the LED end-of-display acknowledgement, not on a fixed sleep"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.sound_manager.delai_note.return_value = 2.0
+        self.jeu.etat.sequence = ['vert', 'rouge']
+        resultat = []
+        affichage = threading.Thread(target=lambda: resultat.append(self.jeu.montrer_sequence(0)))
+        debut = time.monotonic()
+        affichage.start()
+        time.sleep(0.02)
+        for statut in (b"false", b"true", b"false"):
+            self.jeu.on_message_led_status(None, None, MessageMQTT(Mock(topic="LED/status", payload=statut)))
+        affichage.join(2.0)
+        self.assertEqual(resultat, [True])
+        self.assertLess(time.monotonic() - debut, 1.0)
+
+    def test_montrer_sequence_sans_acquittement(self):
+        """Test that a missing LED acknowledgement falls back to the difficulty timing"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.sound_manager.delai_note.return_value = 0.01
+        self.jeu.marge_acquittement_led = 0.0
+        self.jeu.etat.sequence = ['vert']
+        debut = time.monotonic()
+        self.assertTrue(self.jeu.montrer_sequence(0))
+        self.assertGreaterEqual(time.monotonic() - debut, 0.03)
+        self.assertEqual(self.jeu.mesures.histogrammes["affichage_sequence"].nombre, 1)
+
+    def test_attente_difficulte_evenementielle(self):
+        """Test that the game starts as soon as the difficulty arrives, with timed reminders"""
+        self.jeu.mode_test = False
+        self.jeu.socket = Mock(connected=True)
+        self.jeu.intervalle_rappel_difficulte = 0.01
+        demarre = Event()
+        with patch.object(self.jeu, '_creer_socket', return_value=self.jeu.socket), \
+                patch.object(self.jeu, 'send_difficulty_reminder') as rappel, \
+                patch.object(self.jeu, 'demarrer_jeu', side_effect=lambda: demarre.set()):
+            partie = threading.Thread(target=self.jeu.demarrer)
+            partie.start()
+            time.sleep(0.05)
+            self.jeu.handle_difficulty_message('{"dif": 1}')
+            self.assertTrue(demarre.wait(0.5))
+            partie.join(1.0)
+            nombre_rappels = rappel.call_count
+            time.sleep(0.03)
+        self.assertGreaterEqual(nombre_rappels, 2)
+        self.assertEqual(rappel.call_count, nombre_rappels)
+        self.assertEqual(self.jeu.difficulte, "moyen")
+        self.assertEqual(self.jeu.mesures.histogrammes["demarrage_partie"].nombre, 1)
+        self.assertLess(self.jeu.mesures.histogrammes["demarrage_partie"].somme, 0.1)
+
+    def test_attente_annulee(self):
+        """Test that stopping the game wakes a pending game delay immediately"""
+        resultat = []
+        attente = threading.Thread(target=lambda: resultat.append(self.jeu._attendre(30.0)))
+        attente.start()
+        time.sleep(0.02)
+        debut = time.monotonic()
+        self.jeu.annuler_temporisations()
+        attente.join(1.0)
+        self.assertEqual(resultat, [False])
+        self.assertLess(time.monotonic() - debut, 0.5)
+        self.assertTrue(self.jeu._attendre(0.01))
+
+    def test_lire_sequence_test_clavier_partage(self):
+        """Test that test-mode input comes from the shared keyboard reader, ignoring other keys"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.etat.sequence = ['vert', 'bleu']
+        clavier = LecteurClavier()
+        clavier.deposer("0x2")
+        with patch.object(LecteurClavier, 'obtenir', return_value=clavier):
+            self.assertEqual(self.jeu.lire_sequence_test(2, 5.0), ['vert', 'bleu'])
+
+    def test_entree_zone_objects_update(self):
+        """Test that zone entries drive the game when the frame stream is the step source"""
+        self.jeu.source_pas = "objects"
+        self.jeu.etat.peut_jouer = True
+        self.jeu.anti_rebond.duree_entree = 0.0
+        self.jeu.suivi_occupation.ingerer([{'x': 0.8, 'y': 1.2}])
+        self.assertEqual(self.jeu.etat.couleurs.get_nowait(), 'jaune')
+
+    def test_traiter_pas_couleur_repetee(self):
+        """Test that the same color can be played twice once the zone is left"""
+        self.jeu.etat.peut_jouer = True
+        self.jeu.traiter_pas(0.2, 1.2, instant=1.0)
+        self.jeu.traiter_pas(0.2, 1.2, instant=1.05)
+        self.jeu.traiter_pas(0.2, 1.2, instant=1.3)
+        self.assertEqual(list(self.jeu.etat.couleurs.queue), ['vert', 'vert'])
+
+    def test_mesures_etapes_pas(self):
+        """Test that a step feeds the per-stage latency histograms"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.etat.peut_jouer = True
+        self.jeu.etat.sequence = ['vert']
+        self.jeu.traiter_pas(0.2, 1.2)
+        self.assertEqual(self.jeu.lire_sequence_tapis(1, 5.0), ['vert'])
+        self.jeu.publieur.vider()
+        for etape in ("classification", "mise_en_file", "attente_file", "publication", "pas_total"):
+            self.assertEqual(self.jeu.mesures.histogrammes[etape].nombre, 1)
+
     def test_difficulte(self):
         """Test difficulty settings"""
         self.jeu.changer_difficulte("facile")
@@ -107,6 +555,407 @@ class TestJeuSimon(unittest.TestCase):
         self.assertFalse(self.jeu.game_started)
         self.assertFalse(self.jeu.waiting_for_difficulty)
 
+class TestDemarrage(unittest.TestCase):
+    def test_module_differe(self):
+        """Test that a deferred module is imported and timed on first attribute access"""
+        module = ModuleDiffere("json")
+        self.assertIsNone(module._module)
+        self.assertIs(module.dumps, json.dumps)
+        self.assertIn("import json", [etape[0] for etape in CHRONOMETRE.etapes])
+        self.assertIn("import json", CHRONOMETRE.rapport())
+
+    @patch('pygame.mixer.init')
+    @patch('pygame.mixer.Sound')
+    @patch('pygame.mixer.set_num_channels')
+    @patch('paho.mqtt.client.Client')
+    def test_initialisations_differees(self, mock_mqtt, mock_set_channels, mock_sound, mock_mixer_init):
+        """Test that audio and Socket.IO are only set up on first use"""
+        jeu = JeuSimon(mode_test=True, mqtt_broker="broker-differe", demarrage_differe=True)
+        self.assertFalse(hasattr(jeu, 'socket'))
+        mock_mixer_init.assert_not_called()
+
+        jeu.sound_manager._play_sounds([])
+        jeu.sound_manager._play_sounds([])
+        mock_mixer_init.assert_called_once()
+        self.assertIs(jeu._creer_socket(), jeu._creer_socket())
+        with patch('pygame.mixer.quit'), patch('pygame.mixer.stop'):
+            jeu.stop()
+
+class TestClavier(unittest.TestCase):
+    def test_lecture_continue(self):
+        """Test that one reader thread decodes every key typed, without losing any"""
+        lecture, ecriture = os.pipe()
+        with os.fdopen(lecture, 'rb', buffering=0) as entree:
+            clavier = LecteurClavier(entree)
+            clavier.demarrer()
+            os.write(ecriture, "0Q\ré".encode())
+            self.assertEqual([clavier.lire(timeout=1.0) for _ in range(4)], ['0', 'q', '\n', 'é'])
+            os.close(ecriture)
+            clavier.arreter()
+            self.assertFalse(clavier.actif)
+            self.assertIsNone(clavier.lire())
+
+    def test_saisie_reservee(self):
+        """Test that command reads wait while the game reserves the keys"""
+        clavier = LecteurClavier()
+        clavier.deposer("1")
+        with clavier.saisie():
+            self.assertIsNone(clavier.lire(timeout=0.01, commande=True))
+            self.assertEqual(clavier.lire(timeout=0.01), '1')
+        clavier.deposer("q")
+        self.assertEqual(clavier.lire(timeout=0.01, commande=True), 'q')
+
+class TestMinuterie(unittest.TestCase):
+    def test_ordre_et_annulation(self):
+        """Test that actions run in deadline order on one thread and cancelled ones never run"""
+        minuterie = Minuterie()
+        executees = []
+        fin = Event()
+        minuterie.planifier(0.03, executees.append, 'c')
+        annulee = minuterie.planifier(0.01, executees.append, 'x')
+        minuterie.planifier(0.02, executees.append, 'b')
+        minuterie.planifier(0.0, executees.append, 'a')
+        minuterie.planifier(0.04, fin.set)
+        self.assertTrue(annulee.annuler())
+        self.assertTrue(fin.wait(1.0))
+        self.assertEqual(executees, ['a', 'b', 'c'])
+        self.assertEqual(minuterie.en_attente(), 0)
+        minuterie.arreter()
+
+class TestJournal(unittest.TestCase):
+    def test_journal_asynchrone(self):
+        """Test that disabled records are never formatted and enabled ones are written by the listener thread"""
+        class Collecteur(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.lignes, self.threads = [], []
+
+            def emit(self, record):
+                self.lignes.append(self.format(record))
+                self.threads.append(threading.current_thread())
+
+        class Charge(bytes):
+            decodages = 0
+
+            def decode(self, *args, **kwargs):
+                Charge.decodages += 1
+                return super().decode(*args, **kwargs)
+
+        racine = logging.getLogger()
+        niveau = racine.level
+        collecteur = Collecteur()
+        configurer_journal("INFO", sortie=collecteur)
+        try:
+            journal = logging.getLogger("simon")
+            journal.debug("MQTT >>> %s", TexteDiffere(Charge(b'{"pas": true}')))
+            self.assertEqual(Charge.decodages, 0)
+            journal.info("Score : %s", TexteDiffere(Charge(b'{"score": 3}')))
+        finally:
+            arreter_journal()
+            racine.setLevel(niveau)
+        self.assertEqual(len(collecteur.lignes), 1)
+        self.assertIn('Score : {"score": 3}', collecteur.lignes[0])
+        self.assertIsNot(collecteur.threads[0], threading.current_thread())
+
+class TestSessions(unittest.TestCase):
+    @patch('pygame.mixer.init')
+    @patch('pygame.mixer.Sound')
+    @patch('pygame.mixer.set_num_channels')
+    @patch('pygame.mixer.get_num_channels', return_value=16)
+    @patch('pygame.mixer.set_reserved')
+    @patch('pygame.mixer.Channel', side_effect=lambda indice: Mock(name=f"canal{indice}"))
+    @patch('paho.mqtt.client.Client')
+    def setUp(self, mock_mqtt, mock_channel, mock_reserved, mock_get_channels, mock_set_channels,
+              mock_sound, mock_mixer_init):
+        """Initialize test environment before each test"""
+        self.gestionnaire = GestionnaireSessions(
+            {"a": "http://127.0.0.1:1", "b": "http://127.0.0.1:2"}, mqtt_broker="broker-sessions"
+        )
+        self.a, self.b = self.gestionnaire.sessions["a"], self.gestionnaire.sessions["b"]
+
+    def tearDown(self):
+        with patch('pygame.mixer.quit'), patch('pygame.mixer.stop'):
+            self.gestionnaire.arreter()
+
+    def test_ressources_partagees(self):
+        """Test per-mat state and topics over one connection, publisher and sound set"""
+        self.assertEqual(self.a.mqtt_topic, "Tapis/a/sequence")
+        self.assertEqual(self.b.start_topic, "site/b/start")
+        self.assertIsNot(self.a.etat, self.b.etat)
+        self.assertIs(self.a.mqtt, self.b.mqtt)
+        self.assertIs(self.a.publieur, self.b.publieur)
+        self.assertIs(self.a.sound_manager.sounds, self.b.sound_manager.sounds)
+        self.assertIsNone(self.a.command_thread)
+
+    def test_demarrage_par_tapis(self):
+        """Test that a start message only starts the game of its own mat"""
+        with patch.object(SessionSimon, 'demarrer') as demarrer:
+            self.a.mqtt.routeur.distribuer(None, None, Mock(topic="site/b/start", payload=b"true"))
+            self.gestionnaire.executeur.shutdown(wait=True)
+        self.assertFalse(self.a.game_started)
+        self.assertTrue(self.b.game_started)
+        demarrer.assert_called_once()
+
+    @patch('pygame.mixer.stop')
+    def test_canaux_par_session(self, mock_stop):
+        """Test that each session plays and stops only its own mixer channel"""
+        son_a, son_b = self.a.sound_manager, self.b.sound_manager
+        self.assertIsNot(son_a.canal, son_b.canal)
+        son_a.sounds.clear()
+        son_a.sounds.update({0: Mock(), 1: Mock()})
+        for son in (son_a, son_b):
+            son.base_display_time = 0.001
+        son_a._play_sounds([0])
+        son_b._play_sounds([1])
+        son_a.canal.play.assert_called_once_with(son_a.sounds[0])
+        son_b.canal.play.assert_called_once_with(son_a.sounds[1])
+        son_a.canal.stop.assert_called_once()
+        mock_stop.assert_not_called()
+
+class TestSuperviseur(unittest.TestCase):
+    def test_affectation_stable(self):
+        """Test that every mat lands on the same worker whatever the order"""
+        mats = {f"tapis{i}": f"http://127.0.0.1:{i}" for i in range(12)}
+        repartition = repartir(mats, 4)
+        self.assertEqual(repartition, repartir(dict(reversed(list(mats.items()))), 4))
+        for mat in mats:
+            self.assertIn(mat, repartition[affecter_worker(mat, 4)])
+        self.assertEqual(sum(len(groupe) for groupe in repartition.values()), 12)
+
+    def test_relais_ipc(self):
+        """Test that a worker relays subscriptions and publishes, and dispatches relayed messages"""
+        sortie = Queue()
+        gestionnaire = GestionnaireMQTTIPC("broker-ipc", 1883, 3, sortie)
+        callback = Mock()
+        gestionnaire.abonner("site/a/start", callback)
+        gestionnaire.publish("Tapis/a/sequence", b"{}")
+        self.assertEqual(sortie.get_nowait(), ("abonner", 3, "site/a/start"))
+        self.assertEqual(sortie.get_nowait(), ("publier", 3, "Tapis/a/sequence", b"{}", 0, False))
+        gestionnaire.relayer("site/a/start", b"true")
+        self.assertEqual(callback.call_args[0][2].texte, "true")
+
+    @patch('paho.mqtt.client.Client')
+    def test_routage_et_redemarrage(self, mock_mqtt):
+        """Test routing to the owning worker and the restart policy"""
+        with patch.object(Superviseur, '_lancer') as lancer:
+            superviseur = Superviseur({"a": "http://127.0.0.1:1"}, nb_workers=2,
+                                      mqtt_broker="broker-superviseur", max_redemarrages=1,
+                                      periode_surveillance=3600)
+            worker = superviseur.workers[affecter_worker("a", 2)]
+            worker.entree, worker.sortie = Queue(), Queue()
+            worker.lancement = time.monotonic()
+            worker.processus = Mock(exitcode=1)
+            worker.processus.is_alive.return_value = False
+            superviseur.traiter(worker, ("abonner", worker.indice, "site/a/start"))
+            superviseur.mqtt.routeur.distribuer(None, None, Mock(topic="site/a/start", payload=b"true"))
+            self.assertEqual(worker.entree.get_nowait(), ("site/a/start", b"true"))
+
+            superviseur.surveiller()
+            self.assertEqual(lancer.call_count, 2)
+            self.assertEqual(worker.abonnements, {})
+            superviseur.surveiller()
+            self.assertEqual(lancer.call_count, 2)
+            self.assertTrue(worker.abandonne)
+        superviseur._arret.set()
+        superviseur.mqtt.liberer()
+
+class TestJeuSimonAsync(unittest.TestCase):
+    @patch('pygame.mixer.init')
+    @patch('pygame.mixer.Sound')
+    @patch('pygame.mixer.set_num_channels')
+    @patch('paho.mqtt.client.Client')
+    def setUp(self, mock_mqtt, mock_set_channels, mock_sound, mock_mixer_init):
+        """Initialize test environment before each test"""
+        self.jeu = JeuSimonAsync()
+        self.jeu.mqtt_client = self.jeu.publieur.mqtt_client = Mock()
+
+    def test_lire_sequence_tapis(self):
+        """Test that a step wakes the async sequence reader"""
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            self.jeu.etat.sequence = ['vert']
+            loop.call_later(0.01, self.jeu.traiter_pas, 0.2, 1.2)
+            return await self.jeu.lire_sequence_tapis(1, 5.0)
+
+        self.assertEqual(asyncio.run(scenario()), ['vert'])
+        self.jeu.mqtt_client.publish.assert_called_with(
+            self.jeu.mqtt_topic,
+            json.dumps({"couleur": [0], "pas": False}).encode()
+        )
+
+    def test_montrer_sequence_acquittement_led(self):
+        """Test that the async runtime opens input on the LED end-of-display acknowledgement"""
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            self.jeu.sound_manager.loop = loop
+            self.jeu.etat.sequence = ['vert', 'rouge']
+            for delai, statut in ((0.01, b"false"), (0.02, b"true"), (0.03, b"false")):
+                message = MessageMQTT(Mock(topic="LED/status", payload=statut))
+                loop.call_later(delai, self.jeu.routeur.distribuer, None, None, message)
+            debut = time.monotonic()
+            await self.jeu.montrer_sequence(0)
+            return time.monotonic() - debut
+
+        self.jeu.sound_manager.delai_note = Mock(return_value=2.0)
+        self.assertLess(asyncio.run(scenario()), 1.0)
+        client = Mock()
+        self.jeu.on_connect(client, None, None, 0)
+        client.subscribe.assert_called_with(self.jeu.led_status_topic)
+
+    @patch('pygame.mixer.stop')
+    def test_preemption_sons(self, mock_stop):
+        """Test that the async player interrupts a playing sequence and drops superseded ones"""
+        son = self.jeu.sound_manager
+        son.sounds = {numero: Mock() for numero in range(6)}
+        son.delai_note = Mock(return_value=0.05)
+
+        async def attendre_son(numero, timeout=1.0):
+            echeance = time.monotonic() + timeout
+            while not son.sounds[numero].play.called and time.monotonic() < echeance:
+                await asyncio.sleep(0.002)
+
+        async def scenario():
+            lecteur = asyncio.create_task(son.executer())
+            await asyncio.sleep(0)
+            son.play_sequence([0] * 20)
+            await asyncio.sleep(0.12)
+            depot = time.monotonic()
+            son.play_sequence([4], PRIORITE_ALERTE)
+            await attendre_son(4)
+            delai = time.monotonic() - depot
+            son.play_sequence([1] * 20)
+            son.play_sequence([2] * 3)
+            await asyncio.sleep(0.3)
+            lecteur.cancel()
+            return delai
+
+        self.assertLess(asyncio.run(scenario()), 0.1)
+        self.assertLess(son.sounds[0].play.call_count, 20)
+        son.sounds[1].play.assert_not_called()
+        self.assertEqual(son.sounds[2].play.call_count, 3)
+        self.assertEqual(son.remplacees, 1)
+
+    def test_erreur_planifiee_sur_la_boucle(self):
+        """Test that the async error plays at once and publishes after delai_erreur without blocking"""
+        self.jeu.sound_manager = Mock()
+        self.jeu.delai_erreur = 0.05
+
+        async def scenario():
+            self.jeu.loop = asyncio.get_running_loop()
+            self.jeu.envoyer_erreur_mqtt("timeout")
+            self.jeu.sound_manager.jouer_local.assert_called_once_with(CHARGES_COULEUR[4], [4], False)
+            self.jeu.mqtt_client.publish.assert_not_called()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(scenario())
+        self.jeu.mqtt_client.publish.assert_called_once_with(self.jeu.mqtt_topic, CHARGES_COULEUR[4])
+
+    def test_demarrer_attend_difficulte(self):
+        """Test that the async start sends reminders, waits for the difficulty and starts the game"""
+        async def scenario():
+            self.jeu.loop = asyncio.get_running_loop()
+            self.jeu.socket = Mock(connected=True)
+            self.jeu.demarrer_jeu = AsyncMock()
+            self.jeu.send_difficulty_reminder = Mock()
+            message = MessageMQTT(Mock(topic=self.jeu.difficulty_topic, payload=b'{"dif": 2}'))
+            self.jeu.intervalle_rappel_difficulte = 0.01
+            self.jeu.loop.call_later(0.05, self.jeu.on_message_difficulte, None, None, message)
+            await self.jeu.demarrer()
+
+        with patch.object(self.jeu, 'reset_game') as reset_game:
+            asyncio.run(scenario())
+        reset_game.assert_not_called()
+        self.assertGreater(self.jeu.send_difficulty_reminder.call_count, 1)
+        self.jeu.demarrer_jeu.assert_awaited_once()
+        self.assertEqual(self.jeu.difficulte, "difficile")
+
+class TestCacheSons(unittest.TestCase):
+    def setUp(self):
+        """Initialize a sound file and an empty cache directory"""
+        self.temporaire = tempfile.TemporaryDirectory()
+        self.dossier = self.temporaire.name
+        self.chemin = os.path.join(self.dossier, "son0.mp3")
+        with open(self.chemin, 'wb') as fichier:
+            fichier.write(b"mp3 v1")
+        self.cache = os.path.join(self.dossier, "cache")
+
+    def tearDown(self):
+        self.temporaire.cleanup()
+
+    @patch('pygame.mixer.get_init', return_value=(44100, -16, 2))
+    @patch('pygame.mixer.Sound')
+    def test_decodage_unique(self, mock_sound, mock_get_init):
+        """Test that a cached sound is loaded from its PCM buffer without decoding"""
+        mock_sound.return_value.get_raw.return_value = b"\x01\x02\x03\x04"
+        cache_sons.charger_son(self.chemin, self.cache)
+        mock_sound.assert_called_once_with(self.chemin)
+        mock_sound.reset_mock()
+
+        cache_sons.charger_son(self.chemin, self.cache)
+        self.assertNotIn(self.chemin, mock_sound.call_args.args)
+        self.assertIn('buffer', mock_sound.call_args.kwargs)
+
+    @patch('pygame.mixer.get_init', return_value=(44100, -16, 2))
+    @patch('pygame.mixer.Sound')
+    def test_reconstruction_apres_modification(self, mock_sound, mock_get_init):
+        """Test that a modified sound file is decoded again and its stale entry removed"""
+        mock_sound.return_value.get_raw.return_value = b"\x01\x02"
+        cache_sons.charger_son(self.chemin, self.cache)
+        with open(self.chemin, 'wb') as fichier:
+            fichier.write(b"mp3 v2")
+        mock_sound.reset_mock()
+
+        cache_sons.charger_son(self.chemin, self.cache)
+        mock_sound.assert_called_once_with(self.chemin)
+        self.assertEqual(os.listdir(self.cache), [os.path.basename(
+            cache_sons.chemin_cache(self.chemin, (44100, -16, 2), self.cache))])
+
+    @patch('pygame.mixer.Sound')
+    def test_configurations_mixer_conservees(self, mock_sound):
+        """Test that entries for other mixer configurations survive a new entry"""
+        mock_sound.return_value.get_raw.return_value = b"\x01\x02"
+        configurations = [(44100, -16, 2), (22050, -16, 1)]
+        for config in configurations:
+            with patch('pygame.mixer.get_init', return_value=config):
+                cache_sons.charger_son(self.chemin, self.cache)
+        attendues = sorted(os.path.basename(cache_sons.chemin_cache(self.chemin, config, self.cache))
+                           for config in configurations)
+        self.assertEqual(sorted(os.listdir(self.cache)), attendues)
+
+class TestRenduSons(unittest.TestCase):
+    @patch('pygame.mixer.get_init', return_value=(1000, -16, 1))
+    def setUp(self, mock_get_init):
+        """Initialize a renderer over two fake sounds at 1 kHz, 5 ms per note"""
+        import numpy as np
+        self.np = np
+        self.echantillons = {0: np.full(8, 1, dtype=np.int16), 1: np.full(3, 2, dtype=np.int16)}
+        from rendu_sons import RenduSequence
+        self.rendu = RenduSequence({0: "son0", 1: "son1"}, lambda idx: 0.005)
+        self.patch_array = patch('pygame.sndarray.array', side_effect=lambda son: self.echantillons[int(son[-1])])
+        self.patch_array.start()
+
+    def tearDown(self):
+        self.patch_array.stop()
+
+    def test_rendu_avec_silences(self):
+        """Test that each note is cut or padded with silence to its exact duration"""
+        buffer = self.rendu.rendre([0, 1, 7], (0, 2))
+        self.assertEqual(buffer.tolist(), [1] * 5 + [2] * 3 + [0] * 2)
+
+    def test_reutilisation_prefixe_et_lru(self):
+        """Test that the previous round is reused as a prefix and that the cache stays bounded"""
+        self.rendu.rendre([5, 0, 5], (0, 2))
+        buffer = self.rendu.rendre([5, 0, 1, 5], (0, 2))
+        self.assertEqual(self.rendu.prefixes_reutilises, 1)
+        self.assertEqual(buffer.tolist(), [1] * 5 + [2] * 3 + [0] * 2)
+        self.rendu.rendre([5, 0, 1, 0, 5], (0, 2))
+        self.assertEqual(self.rendu.prefixes_reutilises, 2)
+        self.rendu.rendre([5, 0, 1, 0, 5], (1, 2))  # Autre difficulté : autres délais
+        self.assertEqual(self.rendu.prefixes_reutilises, 2)
+        self.rendu.taille_max_octets = 40
+        self.rendu._ecrire_cache(("autre",), self.np.zeros(20, dtype=self.np.int16))
+        self.assertLessEqual(self.rendu.taille_octets, 40)
+
 class TestSon(unittest.TestCase):
     @patch('pygame.mixer.init')
     @patch('pygame.mixer.Sound')
@@ -114,7 +963,7 @@ class TestSon(unittest.TestCase):
     @patch('paho.mqtt.client.Client')
     def setUp(self, mock_mqtt, mock_set_channels, mock_sound, mock_mixer_init):
         """Initialize test environment before each test"""
-        self.son = Son(mqtt_client=Mock())
+        self.son = Son(mqtt_client=Mock(), demarrer_worker=False)
 
     def test_init(self):
         """Test Son class initialization"""
@@ -128,8 +977,94 @@ class TestSon(unittest.TestCase):
         """Test sequence playing"""
         sequence = [0, 1, 2]
         self.son.play_sequence(sequence)
-        self.assertFalse(self.son.sound_queue.empty())
-        self.assertEqual(self.son.sound_queue.get(), sequence)
+        self.assertFalse(self.son.sound_queue.vide())
+        self.assertEqual(self.son.sound_queue.prendre(), (PRIORITE_SEQUENCE, sequence))
+
+    def test_file_sons_priorites(self):
+        """Test that alerts and feedback jump ahead and that a new sequence supersedes pending ones"""
+        file = FileSons()
+        file.deposer([5, 0, 5])
+        file.deposer([5, 0, 1, 5])
+        file.deposer([2], PRIORITE_RETOUR)
+        file.deposer([4], PRIORITE_ALERTE)
+        self.assertEqual(file.prendre(), (PRIORITE_ALERTE, [4]))
+        self.assertEqual(file.prendre(), (PRIORITE_RETOUR, [2]))
+        self.assertEqual(file.prendre(), (PRIORITE_SEQUENCE, [5, 0, 1, 5]))
+        self.assertEqual(file.remplacees, 1)
+        file.fermer()
+        self.assertIsNone(file.prendre())
+
+    @patch('pygame.mixer.stop')
+    def test_preemption_par_alerte(self, mock_stop):
+        """Test that an error sound interrupts a long sequence instead of waiting behind it"""
+        joue = Event()
+        self.son.sounds = {0: Mock(), 4: Mock()}
+        self.son.sounds[4].play.side_effect = lambda: joue.set()
+        self.son.base_display_time = 5
+        worker = threading.Thread(target=self.son._sound_worker, daemon=True)
+        worker.start()
+        self.son.play_sequence([0, 0, 0])
+        time.sleep(0.05)
+        debut = time.monotonic()
+        self.son.play_sequence([4], PRIORITE_ALERTE)
+        self.assertTrue(joue.wait(1.0))
+        self.assertLess(time.monotonic() - debut, 0.5)
+        self.son.stop()
+        worker.join(1.0)
+        self.assertFalse(worker.is_alive())
+
+    def test_jouer_local_ignore_echo(self):
+        """Test that a locally delivered publish plays once and its broker echo is dropped"""
+        charge = json.dumps({"couleur": [0, 1], "pas": True}).encode()
+        self.son.jouer_local(charge, [0, 1], True)
+        self.assertEqual(self.son.sound_queue.prendre(), (PRIORITE_SEQUENCE, [5, 0, 1, 5]))
+        echo = MessageMQTT(Mock(topic="Tapis/sequence", payload=charge))
+        self.son.on_message_sequence(None, None, echo)
+        self.assertTrue(self.son.sound_queue.vide())
+        # Une seconde réception de la même charge n'est plus un écho
+        self.son.on_message_sequence(None, None, MessageMQTT(Mock(topic="Tapis/sequence", payload=charge)))
+        self.assertEqual(self.son.sound_queue.prendre(), (PRIORITE_SEQUENCE, [5, 0, 1, 5]))
+        self.son.on_message_sequence(None, None, MessageMQTT(Mock(topic="Tapis/sequence", payload=CHARGES_COULEUR[4])))
+        self.assertEqual(self.son.sound_queue.prendre(), (PRIORITE_ALERTE, [4]))
+
+    def test_echeances_notes(self):
+        """Test that note deadlines are absolute and follow the difficulty curve"""
+        self.son.sounds = {0: Mock(), 1: Mock()}
+        self.son.difficulty_level = 2
+        echeances = self.son.echeances_notes([0, 5, 1], 100.0)
+        self.assertEqual(echeances[:3], [100.0, 102.0, 102.0])
+        self.assertAlmostEqual(echeances[3], 102.0 + 2 / 1.2)
+
+    @patch('pygame.mixer.stop')
+    def test_gigue_play_sounds(self, mock_stop):
+        """Test that notes fire on their deadlines and report their jitter (simulated clock)"""
+        horloge = [100.0]
+
+        def dormir(duree):
+            horloge[0] += max(duree, 0.0001)  # time.sleep(0) de l'attente active : un tour d'horloge
+
+        def attendre(duree):
+            dormir(duree)
+            return False
+
+        declenchements = []
+        self.son.sounds = {numero: Mock() for numero in (0, 1)}
+        for son in self.son.sounds.values():
+            son.play.side_effect = lambda: declenchements.append(horloge[0])
+        self.son.sound_queue.interruption = Mock(wait=Mock(side_effect=attendre))
+        self.son.base_display_time = 0.01
+        self.son.mesures = Instrumentation()
+        with patch('simon.time.monotonic', side_effect=lambda: horloge[0]), \
+                patch('simon.time.sleep', side_effect=dormir):
+            gigues = self.son._play_sounds([0, 1, 0])
+        echeances = [100.0, 100.01, 100.02]
+        self.assertEqual(len(gigues), 3)
+        for declenchement, echeance, gigue in zip(declenchements, echeances, gigues):
+            self.assertGreaterEqual(declenchement, echeance)
+            self.assertAlmostEqual(gigue, declenchement - echeance)
+            self.assertLess(gigue, 0.001)
+        self.assertGreaterEqual(horloge[0], 100.03)
+        self.assertEqual(self.son.mesures.histogrammes["gigue_note"].nombre, 3)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Carte des zones du tapis SensFloor.
+
+Ce module charge une liste de zones nommées (rectangles ou polygones en
+coordonnées du tapis) depuis un fichier JSON, puis les compile en une grille
+de correspondance quantifiée. La classification d'un point (x, y) se résume
+alors à un seul accès indexé, quels que soient le nombre et la forme des zones :
+les plateaux 3x3 ou 4x4 coûtent autant qu'un plateau 2x2.
+
+Les cellules traversées par une frontière de zone (bords compris) sont
+marquées ZONE_MIXTE et classées exactement, zone par zone : le résultat est
+toujours celui de Zone.contient, y compris sur les frontières. La carte par
+défaut reproduit donc exactement les comparaisons historiques de
+JeuSimon.detecter_couleur (x = 0.5 à gauche, y = 1.0 et y = 1.5 au centre).
+
+Format du fichier de configuration :
+
+    {
+        "largeur": 1.0,
+        "hauteur": 2.0,
+        "resolution": 0.01,
+        "zones": [
+            {"nom": "haut_gauche", "couleur": "vert", "rectangles": [[0, 1, 0.5, 1.5]]},
+            {"nom": "centre", "couleur": "bleu", "polygone": [[0.2, 0.2], [0.8, 0.2], [0.5, 0.9]]}
+        ]
+    }
+
+Un rectangle est donné par [x_min, y_min, x_max, y_max]. Plusieurs zones
+peuvent porter la même couleur. En cas de recouvrement, la première zone
+déclarée l'emporte.
+"""
+
+import json
+import math
+import os
+
+try:
+    import numpy as np
+except ImportError:  # numpy n'est requis que pour la classification par lots
+    np = None
+
+# Valeur de la grille pour les cellules hors de toute zone
+AUCUNE_ZONE = 255
+# Valeur de la grille pour les cellules à cheval sur une frontière (classement exact)
+ZONE_MIXTE = 254
+
+# Disposition historique du tapis 2x2 (voir JeuSimon.detecter_couleur)
+CONFIG_PAR_DEFAUT = {
+    "largeur": 1.0,
+    "hauteur": 2.0,
+    "resolution": 0.01,
+    "zones": [
+        {"nom": "gauche_centre", "couleur": "vert", "rectangles": [[0.0, 1.0, 0.5, 1.5]]},
+        {"nom": "gauche_bords", "couleur": "rouge", "rectangles": [[0.0, 0.0, 0.5, 1.0], [0.0, 1.5, 0.5, 2.0]]},
+        {"nom": "droite_centre", "couleur": "jaune", "rectangles": [[0.5, 1.0, 1.0, 1.5]]},
+        {"nom": "droite_bords", "couleur": "bleu", "rectangles": [[0.5, 0.0, 1.0, 1.0], [0.5, 1.5, 1.0, 2.0]]}
+    ]
+}
+
+
+def point_dans_polygone(x, y, sommets):
+    """
+    Teste l'appartenance d'un point à un polygone (méthode du lancer de rayon).
+
+    Args:
+        x (float): Coordonnée X du point
+        y (float): Coordonnée Y du point
+        sommets (list): Liste de sommets [x, y] du polygone
+
+    Returns:
+        bool: True si le point est à l'intérieur du polygone
+    """
+    dedans = False
+    n = len(sommets)
+    for i in range(n):
+        x1, y1 = sommets[i]
+        x2, y2 = sommets[(i + 1) % n]
+        if (y1 > y) != (y2 > y):
+            x_intersection = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            if x < x_intersection:
+                dedans = not dedans
+    return dedans
+
+
+class Zone:
+    """
+    Zone nommée du tapis, composée de rectangles et/ou d'un polygone.
+    """
+
+    def __init__(self, nom, couleur, rectangles=None, polygone=None):
+        """
+        Initialise une zone.
+
+        Args:
+            nom (str): Identifiant unique de la zone
+            couleur (str): Couleur de jeu associée ('vert', 'rouge', 'bleu', 'jaune')
+            rectangles (list): Rectangles [x_min, y_min, x_max, y_max]. Défaut: None
+            polygone (list): Sommets [x, y] d'un polygone. Défaut: None
+        """
+        if not rectangles and not polygone:
+            raise ValueError(f"La zone '{nom}' n'a ni rectangle ni polygone")
+        self.nom = nom
+        self.couleur = couleur
+        self.rectangles = [tuple(r) for r in (rectangles or [])]
+        self.polygone = [tuple(p) for p in (polygone or [])]
+
+    def contient(self, x, y):
+        """
+        Teste si un point appartient à la zone.
+
+        Args:
+            x (float): Coordonnée X du point
+            y (float): Coordonnée Y du point
+
+        Returns:
+            bool: True si le point est dans l'un des rectangles ou dans le polygone
+        """
+        for x_min, y_min, x_max, y_max in self.rectangles:
+            if x_min <= x <= x_max and y_min <= y <= y_max:
+                return True
+        return bool(self.polygone) and point_dans_polygone(x, y, self.polygone)
+
+
+class CarteZones:
+    """
+    Carte des zones compilée en grille de correspondance.
+
+    La grille couvre le tapis [0, largeur] x [0, hauteur] avec des cellules
+    carrées de côté `resolution`. Chaque cellule contient l'indice de la zone
+    qui couvre son centre et ses quatre coins, AUCUNE_ZONE si aucune zone ne
+    les couvre, ou ZONE_MIXTE s'ils ne sont pas tous dans la même zone.
+    """
+
+    def __init__(self, zones, largeur, hauteur, resolution=0.01):
+        """
+        Compile une liste de zones en grille de correspondance.
+
+        Args:
+            zones (list): Liste d'objets Zone, par ordre de priorité
+            largeur (float): Largeur du tapis (axe X)
+            hauteur (float): Hauteur du tapis (axe Y)
+            resolution (float): Côté d'une cellule de la grille. Défaut: 0.01
+        """
+        if len(zones) >= ZONE_MIXTE:
+            raise ValueError(f"Au plus {ZONE_MIXTE - 1} zones sont supportées")
+        if resolution <= 0 or largeur <= 0 or hauteur <= 0:
+            raise ValueError("Dimensions et résolution doivent être strictement positives")
+        self.zones = list(zones)
+        self.largeur = float(largeur)
+        self.hauteur = float(hauteur)
+        self.resolution = float(resolution)
+        self.nb_colonnes = max(1, int(math.ceil(self.largeur / self.resolution - 1e-9)))
+        self.nb_lignes = max(1, int(math.ceil(self.hauteur / self.resolution - 1e-9)))
+        self.inverse_resolution = 1.0 / self.resolution
+        # Couleur par indice de zone, avec 'inconnu' pour AUCUNE_ZONE
+        self.couleurs = [zone.couleur for zone in self.zones]
+        self._couleur_par_code = self.couleurs + ['inconnu'] * (256 - len(self.couleurs))
+        self.grille = self._compiler()
+        self._grille_np = None
+
+    def _indice_exact(self, x, y):
+        """
+        Retourne l'indice de la première zone contenant un point, sans la grille.
+
+        Args:
+            x (float): Coordonnée X du point
+            y (float): Coordonnée Y du point
+
+        Returns:
+            int: Indice de la zone dans self.zones, ou AUCUNE_ZONE
+        """
+        for indice, zone in enumerate(self.zones):
+            if zone.contient(x, y):
+                return indice
+        return AUCUNE_ZONE
+
+    def _compiler(self):
+        """
+        Construit la grille en évaluant le centre et les coins de chaque cellule.
+
+        Returns:
+            bytearray: Grille aplatie ligne par ligne (indice = ligne * nb_colonnes + colonne)
+        """
+        # Coins partagés entre cellules voisines : évalués une seule fois
+        coins = [
+            [self._indice_exact(colonne * self.resolution, ligne * self.resolution)
+             for colonne in range(self.nb_colonnes + 1)]
+            for ligne in range(self.nb_lignes + 1)
+        ]
+        grille = bytearray([AUCUNE_ZONE]) * (self.nb_colonnes * self.nb_lignes)
+        for ligne in range(self.nb_lignes):
+            y = (ligne + 0.5) * self.resolution
+            bas, haut = coins[ligne], coins[ligne + 1]
+            for colonne in range(self.nb_colonnes):
+                indice = self._indice_exact((colonne + 0.5) * self.resolution, y)
+                if not (indice == bas[colonne] == bas[colonne + 1] == haut[colonne] == haut[colonne + 1]):
+                    indice = ZONE_MIXTE
+                grille[ligne * self.nb_colonnes + colonne] = indice
+        return grille
+
+    def indice_zone(self, x, y):
+        """
+        Retourne l'indice de la zone contenant un point.
+
+        Args:
+            x (float): Coordonnée X du point
+            y (float): Coordonnée Y du point
+
+        Returns:
+            int: Indice de la zone dans self.zones, ou AUCUNE_ZONE hors des zones et du tapis
+        """
+        if not (0.0 <= x <= self.largeur and 0.0 <= y <= self.hauteur):
+            return AUCUNE_ZONE
+        colonne = min(int(x * self.inverse_resolution), self.nb_colonnes - 1)
+        ligne = min(int(y * self.inverse_resolution), self.nb_lignes - 1)
+        indice = self.grille[ligne * self.nb_colonnes + colonne]
+        return self._indice_exact(x, y) if indice == ZONE_MIXTE else indice
+
+    def classer(self, x, y):
+        """
+        Retourne la couleur de la zone contenant un point.
+
+        Args:
+            x (float): Coordonnée X du point
+            y (float): Coordonnée Y du point
+
+        Returns:
+            str: Couleur de la zone, ou 'inconnu' hors des zones
+        """
+        return self._couleur_par_code[self.indice_zone(x, y)]
+
+    def indices_zones(self, xs, ys):
+        """
+        Classe un lot de points en un seul appel vectorisé (numpy).
+
+        Args:
+            xs (array-like): Coordonnées X des points
+            ys (array-like): Coordonnées Y des points
+
+        Returns:
+            numpy.ndarray: Indices de zone (uint8), AUCUNE_ZONE hors des zones et du tapis
+        """
+        if np is None:
+            raise RuntimeError("numpy est requis pour la classification par lots")
+        if self._grille_np is None:
+            self._grille_np = np.frombuffer(bytes(self.grille), dtype=np.uint8)
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        dans_tapis = (xs >= 0.0) & (xs <= self.largeur) & (ys >= 0.0) & (ys <= self.hauteur)
+        xs = np.where(dans_tapis, xs, 0.0)
+        ys = np.where(dans_tapis, ys, 0.0)
+        colonnes = np.minimum((xs * self.inverse_resolution).astype(np.intp), self.nb_colonnes - 1)
+        lignes = np.minimum((ys * self.inverse_resolution).astype(np.intp), self.nb_lignes - 1)
+        indices = np.where(dans_tapis, self._grille_np[lignes * self.nb_colonnes + colonnes], np.uint8(AUCUNE_ZONE))
+        for position in np.flatnonzero(indices == ZONE_MIXTE):
+            indices[position] = self._indice_exact(xs[position], ys[position])
+        return indices
+
+    @classmethod
+    def depuis_dict(cls, config):
+        """
+        Construit une carte à partir d'un dictionnaire de configuration.
+
+        Args:
+            config (dict): Configuration au format décrit dans le module
+
+        Returns:
+            CarteZones: Carte compilée
+        """
+        zones = []
+        for i, zone in enumerate(config["zones"]):
+            zones.append(Zone(
+                nom=zone.get("nom", f"zone{i}"),
+                couleur=zone["couleur"],
+                rectangles=zone.get("rectangles"),
+                polygone=zone.get("polygone")
+            ))
+        return cls(
+            zones,
+            largeur=config.get("largeur", 1.0),
+            hauteur=config.get("hauteur", 2.0),
+            resolution=config.get("resolution", 0.01)
+        )
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        Charge une carte depuis un fichier JSON.
+
+        Args:
+            chemin (str): Chemin du fichier de configuration
+
+        Returns:
+            CarteZones: Carte compilée
+        """
+        with open(chemin, encoding="utf-8") as fichier:
+            return cls.depuis_dict(json.load(fichier))
+
+    @classmethod
+    def par_defaut(cls, chemin=None):
+        """
+        Charge la carte configurée, ou la disposition 2x2 historique à défaut.
+
+        Args:
+            chemin (str): Chemin du fichier de configuration. Défaut: zones.json
+                          à côté de ce module
+
+        Returns:
+            CarteZones: Carte compilée
+        """
+        if chemin is None:
+            chemin = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones.json")
+        if os.path.exists(chemin):
+            return cls.charger(chemin)
+        return cls.depuis_dict(CONFIG_PAR_DEFAUT)